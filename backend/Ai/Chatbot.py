@@ -3,30 +3,29 @@
 # 설명        : Groq API 기반의 한국어 대화형 AI 챗봇 메인 스크립트
 # 주요 기능   :
 #   1) .env 파일에서 사용자 및 AI 정보(Username, Assistantname, API 키) 로드
-#   2) 기존 채팅 로그를 JSON 파일(Data/ChatLog.json)에서 읽고 관리
+#   2) 호출 측이 넘긴 대화 이력(세션·요청 단위 ConversationHistory)만 사용 (최근 N개만 유지)
+#      직접 실행할 때만 Data/ChatLog.json 파일 이력 사용
 #   3) 현재 시각 및 요일 등 실시간 정보를 한글 포맷으로 제공
 #   4) 사용자 질문을 Groq LLM에 전달해 스트리밍 응답 수신
 #   5) AI 응답 후 불필요 문자를 정제하고 채팅 로그에 저장
-#   6) 예외 발생 시 로그 초기화 후 재시도
-# 요구 모듈   : groq, python-dotenv, datetime, json, re
+#   6) 예외 발생 시 로그 초기화 후 한 번만 재시도
+# 요구 모듈   : python-dotenv, datetime, re, Clients, Conversation
 # -----------------------------------------------------------------------------------
 
-from groq import Groq
-from json import load, dump
 import datetime
 import re
 from dotenv import dotenv_values
+from Ai.Clients import get_groq
+from Ai.Conversation import ConversationHistory, DEFAULT_LOG_PATH
 
 # ────────────────────────────────────────────────────────────────────────────────────
 # 1) 환경 변수 로드
-#    - .env 파일에서 Username, Assistantname, GroqAPIKey 읽어오기
-#    - Groq 클라이언트 초기화
+#    - .env 파일에서 Username, Assistantname 읽어오기
+#    - Groq 클라이언트는 Clients 레지스트리에서 첫 호출 시 생성
 # ────────────────────────────────────────────────────────────────────────────────────
 env_vars = dotenv_values(".env")
 Username = env_vars.get("Username")
 Assistantname = env_vars.get("Assistantname")
-GroqAPIKey = env_vars.get("GroqAPIKey")
-client = Groq(api_key=GroqAPIKey)
 
 # ────────────────────────────────────────────────────────────────────────────────────
 # 2) 시스템 메시지 초기화
@@ -43,17 +42,10 @@ SystemChatBot = [
 ]
 
 # ────────────────────────────────────────────────────────────────────────────────────
-# 3) 채팅 로그 파일 초기화
-#    - Data/ChatLog.json 파일이 없으면 새로 생성, 있으면 기존 내용을 로드
+# 3) 채팅 로그
+#    - 프로세스 공용 이력은 없으며, 호출마다 history 인자로 세션·요청 단위 이력을 전달합니다.
+#      (서로 다른 사용자의 대화가 한 프롬프트에 섞이지 않도록)
 # ────────────────────────────────────────────────────────────────────────────────────
-messages = []
-
-try:
-    with open("Data/ChatLog.json", "r", encoding="utf-8") as f:
-        messages = load(f)
-except FileNotFoundError:
-    with open("Data/ChatLog.json", "w", encoding="utf-8") as f:
-        dump([], f)
 
 # ────────────────────────────────────────────────────────────────────────────────────
 # 4) RealtimeInformation 함수
@@ -87,14 +79,13 @@ def AnswerModifier(Answer):
 # 6) Chatbot 함수
 #    - 사용자 질문을 받아 Groq LLM에 전송하고 스트리밍으로 응답 수신
 #    - 메시지를 채팅 로그에 저장하고 후처리 후 반환
-#    - 예외 발생 시 로그 초기화 후 재귀 호출로 재시도
+#    - 예외 발생 시 로그 초기화 후 retries 횟수만큼만 재시도
 # ────────────────────────────────────────────────────────────────────────────────────
-def Chatbot(Query):
+def Chatbot(Query, history, retries=1):
     try:
-        with open("Data/ChatLog.json", "r", encoding="utf-8") as f:
-            messages = load(f)
+        messages = history.snapshot()
         messages.append({"role": "user", "content": Query})
-        completion = client.chat.completions.create(
+        completion = get_groq().chat.completions.create(
             model="llama3-70b-8192",
             messages=SystemChatBot + [{"role": "system", "content": RealtimeInformation()}] + messages,
             max_tokens=1024,
@@ -108,20 +99,20 @@ def Chatbot(Query):
             if chunk.choices[0].delta.content:
                 Answer += chunk.choices[0].delta.content
         Answer = Answer.replace("</s>", "")
-        messages.append({"role": "assistant", "content": Answer})
-        with open("Data/ChatLog.json", "w", encoding="utf-8") as f:
-            dump(messages, f, indent=4)
+        history.extend({"role": "user", "content": Query}, {"role": "assistant", "content": Answer})
         return AnswerModifier(Answer=Answer)
     except Exception as e:
         print(f"에러 발생: {e}")
-        with open("Data/ChatLog.json", "w", encoding="utf-8") as f:
-            dump([], f, indent=4)
-        return Chatbot(Query)
+        if retries <= 0:
+            return "죄송합니다, 지금은 답변을 생성하지 못했어요."
+        history.clear()
+        return Chatbot(Query, history=history, retries=retries - 1)
 
 # ────────────────────────────────────────────────────────────────────────────────────
 # 7) 스크립트 직접 실행 시 반복 입력 루프
 # ────────────────────────────────────────────────────────────────────────────────────
 if __name__ == "__main__":
+    history = ConversationHistory(path=DEFAULT_LOG_PATH)
     while True:
         user_input = input("질문을 입력하세요: ")
-        print(Chatbot(user_input))
+        print(Chatbot(user_input, history))
@@ -0,0 +1,70 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : Clients.py
+# 설명        : 외부 AI API 클라이언트(OpenAI, Groq, Cohere)를 처음 사용할 때 생성하는 지연 초기화 레지스트리
+# 주요 기능   :
+#   1) get_client(name): 이름에 해당하는 클라이언트를 최초 호출 시 한 번만 생성하여 반환
+#   2) get_openai / get_groq / get_cohere: 자주 쓰는 클라이언트 단축 함수
+#   3) set_client(name, client): 테스트·벤치마크용 클라이언트 교체
+#   - 라이브러리 import 자체도 생성 시점까지 미뤄 서버 기동 시간을 줄임
+# 요구 모듈   : python-dotenv, os, threading (openai, groq, cohere는 사용 시 import)
+# -----------------------------------------------------------------------------------
+
+import os
+import threading
+from dotenv import load_dotenv, dotenv_values
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 1) 클라이언트 생성 함수
+#    - 각 함수는 해당 라이브러리를 import하고 .env의 키로 클라이언트를 생성
+# ────────────────────────────────────────────────────────────────────────────────────
+def _create_openai():
+    from openai import OpenAI
+    load_dotenv()
+    return OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+def _create_groq():
+    from groq import Groq
+    return Groq(api_key=dotenv_values(".env").get("GroqAPIKey"))
+
+def _create_cohere():
+    import cohere
+    return cohere.Client(api_key=dotenv_values(".env").get("CohereAPIKey"))
+
+_factories = {
+    "openai": _create_openai,
+    "groq": _create_groq,
+    "cohere": _create_cohere,
+}
+
+_clients = {}
+_lock = threading.Lock()
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 2) 레지스트리 함수
+# ────────────────────────────────────────────────────────────────────────────────────
+def get_client(name):
+    client = _clients.get(name)
+    if client is None:
+        with _lock:
+            client = _clients.get(name)
+            if client is None:
+                client = _factories[name]()
+                _clients[name] = client
+    return client
+
+def set_client(name, client):
+    """클라이언트를 직접 지정합니다. (None이면 다음 호출 때 다시 생성)"""
+    with _lock:
+        if client is None:
+            _clients.pop(name, None)
+        else:
+            _clients[name] = client
+
+def get_openai():
+    return get_client("openai")
+
+def get_groq():
+    return get_client("groq")
+
+def get_cohere():
+    return get_client("cohere")
@@ -0,0 +1,76 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : Conversation.py
+# 설명        : Chatbot / RealtimeSearchEngine에 요청마다 넘기는 대화 이력을 크기 제한과 함께 관리하는 모듈
+# 주요 기능   :
+#   1) 최근 N개의 메시지만 유지하는 ConversationHistory (deque 기반, 스레드 안전)
+#   2) from_logs: 세션의 채팅 로그로 요청 하나에서 쓸 이력 생성 (프로세스 공용 이력은 두지 않음)
+#   3) 스크립트 직접 실행 시에만 Data/ChatLog.json 파일과 동기화(최초 사용 시 로드, 저장 시 잘라서 기록)
+# 요구 모듈   : collections, json, os, threading
+# -----------------------------------------------------------------------------------
+
+from collections import deque
+from json import load, dump
+import os
+import threading
+
+DEFAULT_LOG_PATH = "Data/ChatLog.json"
+DEFAULT_MAX_MESSAGES = int(os.getenv("CHAT_HISTORY_LIMIT", "20"))
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 1) ConversationHistory 클래스
+#    - max_messages: 보관할 최대 메시지 수 (초과분은 오래된 것부터 버림)
+#    - path        : 이력을 저장할 JSON 파일 경로 (None이면 메모리에만 유지)
+# ────────────────────────────────────────────────────────────────────────────────────
+class ConversationHistory:
+    def __init__(self, max_messages=DEFAULT_MAX_MESSAGES, path=None):
+        self.path = path
+        self._messages = deque(maxlen=max_messages)
+        self._lock = threading.Lock()
+        self._loaded = path is None
+
+    @classmethod
+    def from_logs(cls, logs, max_messages=DEFAULT_MAX_MESSAGES):
+        """세션의 채팅 로그(role·message가 있는 행, 오래된 순)로 파일 저장 없는 이력을 만듭니다."""
+        history = cls(max_messages=max_messages)
+        history._messages.extend(
+            {"role": "assistant" if log.role == "assistant" else "user", "content": log.message} for log in logs or []
+        )
+        return history
+
+    def _load(self):
+        # 호출 측에서 lock을 잡은 상태로 호출합니다.
+        if self._loaded:
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._messages.extend(load(f))
+        except (FileNotFoundError, ValueError):
+            pass
+        self._loaded = True
+
+    def snapshot(self):
+        """현재 이력의 복사본을 반환합니다. (요청마다 독립된 리스트 사용)"""
+        with self._lock:
+            self._load()
+            return list(self._messages)
+
+    def extend(self, *messages):
+        """질문/응답 메시지를 추가하고, 파일 경로가 있으면 잘린 이력을 저장합니다."""
+        with self._lock:
+            self._load()
+            self._messages.extend(messages)
+            if self.path:
+                with open(self.path, "w", encoding="utf-8") as f:
+                    dump(list(self._messages), f, indent=4)
+
+    def clear(self):
+        with self._lock:
+            self._messages.clear()
+            self._loaded = True
+            if self.path:
+                with open(self.path, "w", encoding="utf-8") as f:
+                    dump([], f, indent=4)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._messages)
@@ -0,0 +1,254 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : IntentClassifier.py
+# 설명        : 문자 n-gram 특징과 선형(소프트맥스) 모델을 이용한 로컬 의도 분류 모듈
+#               - Cohere DMM(FirstLayerDMM)을 호출하기 전에 로컬에서 먼저 태스크를 분류
+# 주요 기능   :
+#   1) 라벨링된 예시 문장(TRAINING_EXAMPLES)으로 모델을 한 번만 학습
+#   2) 문자 n-gram을 해싱하여 희소 특징(인덱스 목록)으로 변환
+#   3) 질의를 절 단위로 나누어 '<func> <args>' 형식의 태스크 리스트 생성
+#      (앱 이름은 절 안의 첫 동사 앞부분만 사용 - "유튜브 열어서 ..." → "유튜브")
+#   4) 신뢰도가 낮거나, 로컬 모델이 만들 수 없는 태스크(play, reminder 등)면 None을 반환하여 원격 모델로 위임
+# 요구 모듈   : numpy, re, threading, zlib
+# -----------------------------------------------------------------------------------
+
+import re
+import threading
+import zlib
+
+import numpy as np
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 1) 학습 데이터
+#    - FirstLayerDMM의 ChatHistory와 같은 출력 규칙을 따르는 라벨링된 예시
+#    - 라벨: general / realtime / open / close / remote
+#      remote는 Model.funcs 중 로컬에서 처리하지 않는 태스크(play, reminder, generate image, system,
+#      content, google search, youtube search, exit)로, 이 라벨이 나오면 원격 모델에 맡김
+# ────────────────────────────────────────────────────────────────────────────────────
+TRAINING_EXAMPLES = [
+    ("안녕하세요?", "general"),
+    ("피자 좋아하세요?", "general"),
+    ("세종대왕에 대해 알려주세요", "general"),
+    ("대화 좀 해줘", "general"),
+    ("오늘 날짜가 뭐야", "general"),
+    ("지금 몇 시야", "general"),
+    ("너는 누구야", "general"),
+    ("파이썬이 뭐야", "general"),
+    ("재미있는 이야기 해줘", "general"),
+    ("이순신 장군은 어떤 사람이야", "general"),
+    ("김치찌개 만드는 법 알려줘", "general"),
+    ("영어 공부 방법 추천해줘", "general"),
+    ("사랑이란 뭘까", "general"),
+    ("수학 문제 좀 풀어줘", "general"),
+    ("고양이에 대해 설명해줘", "general"),
+    ("심심한데 얘기하자", "general"),
+    ("경복궁의 역사 알려줘", "general"),
+    ("이 단어 뜻 알려줘", "general"),
+    ("조선 시대에 대해 알려줘", "general"),
+    ("좋은 공부 습관 알려줘", "general"),
+    ("오늘 뉴스 알려줘", "realtime"),
+    ("최신 뉴스 알려줘", "realtime"),
+    ("오늘 날씨 어때", "realtime"),
+    ("내일 서울 날씨 알려줘", "realtime"),
+    ("지금 비트코인 가격 얼마야", "realtime"),
+    ("요즘 인기 있는 노래 알려줘", "realtime"),
+    ("최근 개봉한 영화 뭐 있어", "realtime"),
+    ("오늘 주식 시장 어때", "realtime"),
+    ("현재 환율 알려줘", "realtime"),
+    ("어제 야구 경기 결과 알려줘", "realtime"),
+    ("이번 주 주요 소식 알려줘", "realtime"),
+    ("최신 아이폰 출시일 언제야", "realtime"),
+    ("요즘 유행하는 음식 뭐야", "realtime"),
+    ("실시간 검색어 알려줘", "realtime"),
+    ("지금 비트코인 시세 어때", "realtime"),
+    ("오늘 코스피 지수 알려줘", "realtime"),
+    ("크롬 열어줘", "open"),
+    ("크롬 실행해줘", "open"),
+    ("파이어폭스 열어줘", "open"),
+    ("메모장 켜줘", "open"),
+    ("계산기 열어", "open"),
+    ("유튜브 열어줘", "open"),
+    ("카카오톡 실행해", "open"),
+    ("스포티파이 켜줘", "open"),
+    ("엑셀 열어줘", "open"),
+    ("크롬과 파이어폭스 열어줘", "open"),
+    ("크롬 열고", "open"),
+    ("메모장 켜고", "open"),
+    ("노트북 앱 켜줘", "open"),
+    ("워드 실행", "open"),
+    ("유튜브 열어서", "open"),
+    ("크롬 켜서", "open"),
+    ("카카오톡 켜고", "open"),
+    ("메모장 실행하고", "open"),
+    ("크롬 닫아줘", "close"),
+    ("크롬 종료해줘", "close"),
+    ("파이어폭스 닫아줘", "close"),
+    ("메모장 꺼줘", "close"),
+    ("계산기 닫아", "close"),
+    ("유튜브 꺼줘", "close"),
+    ("카카오톡 종료해", "close"),
+    ("스포티파이 꺼줘", "close"),
+    ("엑셀 닫아줘", "close"),
+    ("크롬과 파이어폭스 닫아줘", "close"),
+    ("크롬 닫고", "close"),
+    ("메모장 끄고", "close"),
+    ("워드 종료", "close"),
+    ("유튜브 닫아서", "close"),
+    ("크롬 꺼서", "close"),
+    ("카카오톡 종료하고", "close"),
+    ("노래 틀어줘", "remote"),
+    ("아이유 노래 재생해줘", "remote"),
+    ("신나는 음악 틀어줘", "remote"),
+    ("이 곡 다시 재생해", "remote"),
+    ("내일 오전 9시에 회의 알림 설정해줘", "remote"),
+    ("8월 5일 오후 11시 댄스 공연 리마인더 추가해줘", "remote"),
+    ("30분 뒤에 알려줘", "remote"),
+    ("아침 7시에 알람 맞춰줘", "remote"),
+    ("고양이 그림 그려줘", "remote"),
+    ("바다 이미지 생성해줘", "remote"),
+    ("볼륨 올려줘", "remote"),
+    ("음소거 해줘", "remote"),
+    ("화면 밝기 낮춰줘", "remote"),
+    ("자기소개서 써줘", "remote"),
+    ("휴가 신청 이메일 작성해줘", "remote"),
+    ("구글에서 파이썬 검색해줘", "remote"),
+    ("구글에 맛집 검색", "remote"),
+    ("유튜브에서 고양이 영상 검색해줘", "remote"),
+    ("유튜브에서 요리 영상 찾아줘", "remote"),
+    ("프로그램 종료할게", "remote"),
+    ("이제 그만 끝내자", "remote"),
+]
+
+LABELS = ["general", "realtime", "open", "close", "remote"]
+LOCAL_LABELS = {"general", "realtime", "open", "close"}  # 로컬에서 태스크로 만드는 라벨
+
+# 앱 열기·닫기 동사 (연결형 "열고", "열어서"도 포함)
+APP_VERBS = (r"열어\s*줘|열어\s*주세요|열어서|열어|열고|실행해\s*줘|실행해\s*주세요|실행해서|실행하고|실행해|실행"
+             r"|켜\s*줘|켜\s*주세요|켜서|켜고|켜|닫아\s*줘|닫아\s*주세요|닫아서|닫아|닫고"
+             r"|종료해\s*줘|종료해\s*주세요|종료해서|종료하고|종료해|종료|꺼\s*줘|꺼\s*주세요|꺼서|끄고|꺼")
+# 여러 작업이 한 문장에 섞인 경우 절을 나누는 기준
+# ("크롬 열고 세종대왕에 대해 알려주세요", "유튜브 열어서 노래 틀어줘")
+CLAUSE_SPLIT = re.compile(r"\s*(?:,|그리고)\s*|(?<=열고|켜고|닫고|끄고|켜서|꺼서)\s+|(?<=열어서|닫아서)\s+|(?<=실행하고|실행해서|종료하고|종료해서)\s+")
+# 앱 이름 + 첫 동사 ("크롬을 열어줘" → "크롬"). 동사 뒤에 다른 내용이 남으면 앱 이름으로 쓰지 않음
+APP_COMMAND = re.compile(rf"^(?P<names>.+?)\s*(?:을|를)?\s*(?:{APP_VERBS})(?P<rest>.*)$")
+APP_REST = re.compile(r"[\s.!?~]*")
+# 여러 앱 이름 연결 ("크롬과 파이어폭스")
+APP_JOIN = re.compile(r"(?<=\S)(?:과|와|이랑|랑)\s+|\s*,\s*")
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 2) IntentClassifier 클래스
+#    - n_features: 해싱할 특징 공간 크기
+#    - ngram_range: 사용할 문자 n-gram 길이 범위
+# ────────────────────────────────────────────────────────────────────────────────────
+class IntentClassifier:
+    def __init__(self, labels=LABELS, n_features=2 ** 12, ngram_range=(1, 3)):
+        self.labels = list(labels)
+        self.n_features = n_features
+        self.ngram_range = ngram_range
+        self.weights = np.zeros((n_features, len(self.labels)), dtype=np.float32)
+        self.bias = np.zeros(len(self.labels), dtype=np.float32)
+
+    def features(self, text):
+        """문자 n-gram을 해싱한 특징 인덱스 배열을 반환합니다. (공백은 단어 경계로 사용)"""
+        text = f" {' '.join(text.lower().split())} "
+        indices = set()
+        for n in range(self.ngram_range[0], self.ngram_range[1] + 1):
+            for i in range(len(text) - n + 1):
+                gram = text[i:i + n]
+                if gram.strip():
+                    indices.add(zlib.crc32(gram.encode("utf-8")) % self.n_features)
+        return np.fromiter(indices, dtype=np.int64, count=len(indices))
+
+    def fit(self, examples, epochs=300, lr=0.5, l2=1e-4):
+        """라벨링된 예시로 소프트맥스 회귀 모델을 학습합니다."""
+        X = np.zeros((len(examples), self.n_features), dtype=np.float32)
+        y = np.zeros((len(examples), len(self.labels)), dtype=np.float32)
+        for row, (text, label) in enumerate(examples):
+            idx = self.features(text)
+            X[row, idx] = 1.0 / np.sqrt(max(len(idx), 1))
+            y[row, self.labels.index(label)] = 1.0
+
+        for _ in range(epochs):
+            probs = self._softmax(X @ self.weights + self.bias)
+            grad = probs - y
+            self.weights -= lr * (X.T @ grad / len(examples) + l2 * self.weights)
+            self.bias -= lr * grad.mean(axis=0)
+        return self
+
+    def predict(self, text):
+        """(라벨, 신뢰도)를 반환합니다. 희소 인덱스의 가중치 행만 더하므로 매우 빠릅니다."""
+        idx = self.features(text)
+        if len(idx) == 0:
+            return "general", 0.0
+        logits = self.weights[idx].sum(axis=0) / np.sqrt(len(idx)) + self.bias
+        probs = self._softmax(logits)
+        best = int(probs.argmax())
+        return self.labels[best], float(probs[best])
+
+    @staticmethod
+    def _softmax(z):
+        z = z - z.max(axis=-1, keepdims=True)
+        e = np.exp(z)
+        return e / e.sum(axis=-1, keepdims=True)
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 3) 모델 로딩 함수
+#    - 함수명: get_classifier
+#    - 역할  : 프로세스당 한 번만 학습한 분류기를 반환
+# ────────────────────────────────────────────────────────────────────────────────────
+_classifier = None
+_classifier_lock = threading.Lock()
+
+def get_classifier():
+    global _classifier
+    if _classifier is None:
+        with _classifier_lock:
+            if _classifier is None:
+                _classifier = IntentClassifier().fit(TRAINING_EXAMPLES)
+    return _classifier
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 4) LocalDMM 함수
+#    - 역할   : FirstLayerDMM과 같은 형식('<func> <args>')의 태스크 리스트 반환
+#    - Args   :
+#        prompt (str): 분류할 사용자 입력 문자열
+#        threshold (float): 절마다 요구되는 최소 신뢰도
+#    - Returns:
+#        List[str] | None: 하나의 절이라도 신뢰도가 낮거나 remote 라벨이거나 앱 이름을 확실히
+#                          뽑을 수 없으면 None (원격 모델로 위임)
+# ────────────────────────────────────────────────────────────────────────────────────
+def LocalDMM(prompt, threshold=0.6):
+    classifier = get_classifier()
+    tasks = []
+    for clause in CLAUSE_SPLIT.split(prompt.strip()):
+        clause = clause.strip()
+        if not clause:
+            continue
+        label, confidence = classifier.predict(clause)
+        if confidence < threshold or label not in LOCAL_LABELS:
+            return None
+
+        if label in ("open", "close"):
+            command = APP_COMMAND.match(clause)
+            if not command or not APP_REST.fullmatch(command["rest"]):
+                return None
+            names = [name.strip() for name in APP_JOIN.split(command["names"]) if name.strip()]
+            if not names:
+                return None
+            tasks.extend(f"{label} {name}" for name in names)
+        else:
+            tasks.append(f"{label} {clause}")
+    return tasks or None
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 5) 스크립트 직접 실행용 엔트리포인트
+#    - 사용자 입력을 받아 분류 결과와 소요 시간을 출력
+# ────────────────────────────────────────────────────────────────────────────────────
+if __name__ == "__main__":
+    import time
+
+    get_classifier()
+    while True:
+        query = input(">>> ")
+        start = time.perf_counter()
+        result = LocalDMM(query)
+        print(result, f"({(time.perf_counter() - start) * 1000:.3f} ms)")
@@ -0,0 +1,251 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : LocationResolver.py
+# 설명        : 자유 입력 위치 문자열("서울 강남", "강남구", "부산 서면 근처")을 표준 이름과 좌표로 변환하는 모듈
+# 주요 기능   :
+#   1) 내장 행정구역 목록(Data/gazetteer_kr.json)으로 오프라인 조회 (표기 변형도 같은 지역으로 정규화)
+#      입력의 모든 단어가 목록의 지역 이름으로만 이루어진 경우에만 사용 ("서울 망원동", "서울역"처럼
+#      목록에 없는 동·역 이름이 섞이면 도시 전체로 뭉개지 않고 지오코더에 맡김)
+#   2) 목록에 없는 위치는 Google Geocoding API로 조회하고, 결과를 SQLite 파일에 영구 캐시
+#      (API 키 없음·네트워크 오류·할당량 초과 같은 일시적 실패는 캐시하지 않고 다음 요청에서 다시 조회)
+#   3) resolve_location 결과를 식당 검색의 캐시 키·좌표 기반 검색에 사용
+# 요구 모듈   : requests, python-dotenv, sqlite3, dataclasses, collections, json, os, re, threading, time
+# -----------------------------------------------------------------------------------
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from json import load
+import os
+import re
+import sqlite3
+import threading
+import time
+from dotenv import load_dotenv
+
+load_dotenv()
+GOOGLE_MAPS_API_KEY = os.getenv("GOOGLE_MAPS_API_KEY")
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GAZETTEER_PATH = os.path.join(BACKEND_DIR, "Data", "gazetteer_kr.json")
+# 상대 경로는 작업 디렉터리가 아니라 backend 디렉터리 기준
+GEOCODE_CACHE_PATH = os.path.join(BACKEND_DIR, os.getenv("GEOCODE_CACHE_PATH", "Data/geocode_cache.sqlite3"))
+GEOCODE_NEGATIVE_TTL = 24 * 60 * 60  # 찾지 못한 위치를 다시 조회하기까지의 시간(초)
+RESOLVED_MEMO_SIZE = 4096  # 프로세스 내에 기억할 조회 성공 결과 수
+
+# 위치 뒤에 붙는 불필요한 표현 ("강남역 근처" → "강남역")
+FILLER_WORDS = re.compile(r"(근처|주변|부근|인근|쪽|에서|에)$")
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 1) ResolvedLocation 레코드
+#    - name  : 표준 이름 (예: "서울특별시 강남구") → 캐시 키로 사용
+#    - radius: 주변 검색 반경(m)
+#    - source: "gazetteer" | "geocoder"
+# ────────────────────────────────────────────────────────────────────────────────────
+@dataclass(frozen=True, slots=True)
+class ResolvedLocation:
+    name: str
+    lat: float
+    lng: float
+    radius: int
+    source: str
+
+def _strip_filler(text):
+    previous = None
+    while previous != text:
+        previous, text = text, FILLER_WORDS.sub("", text)
+    return text
+
+def normalize_location(text):
+    return _strip_filler(re.sub(r"[^\w]", "", (text or "").lower()))
+
+def location_tokens(text):
+    """공백·문장부호로 나눈 단어 목록 (단어마다 불필요한 표현을 떼고, 표현만 있는 단어는 버림)"""
+    return [token for token in (_strip_filler(word) for word in re.findall(r"\w+", (text or "").lower())) if token]
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 2) 행정구역 조회 인덱스
+#    - 이름, 접미사(시/군/구)를 뗀 짧은 이름, 별칭을 모두 키로 등록
+#    - 같은 키(예: "중구")가 여러 지역에 있으면 입력에 함께 적힌 상위 지역으로 구분
+#    - 단어마다 키 여러 개로 빈틈없이 나뉘어야 매칭 ("서울강남구" → 서울 + 강남구)
+#      한 단어라도 키로 나눌 수 없으면(예: "망원동", "서울역", "동구릉") None
+# ────────────────────────────────────────────────────────────────────────────────────
+class Gazetteer:
+    def __init__(self, rows):
+        self.entries = rows
+        self.index = {}  # key -> [entry, ...]
+        for entry in rows:
+            keys = {entry["name"], *entry.get("aliases", [])}
+            if entry["parent"] and entry["name"][-1] in "시군구" and len(entry["name"]) > 2:
+                keys.add(entry["name"][:-1])
+            for key in keys:
+                self.index.setdefault(normalize_location(key), []).append(entry)
+
+    @classmethod
+    def load(cls, path=GAZETTEER_PATH):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(load(f))
+
+    def _segment(self, token):
+        """token을 가장 적은 수의 키로 빈틈없이 나눈 목록 (나눌 수 없으면 None)"""
+        best = {0: []}
+        for end in range(1, len(token) + 1):
+            for start in range(end):
+                if start in best and token[start:end] in self.index:
+                    candidate = best[start] + [token[start:end]]
+                    if end not in best or len(candidate) < len(best[end]):
+                        best[end] = candidate
+        return best.get(len(token))
+
+    def lookup(self, tokens):
+        keys = []
+        for token in tokens:
+            pieces = self._segment(token)
+            if pieces is None:
+                return None
+            keys.extend(pieces)
+        matches = [(key, entry) for key in dict.fromkeys(keys) for entry in self.index[key]]  # (key, entry)
+        if not matches:
+            return None
+
+        matched_names = {entry["name"] for _, entry in matches}
+        def rank(match):
+            key, entry = match
+            level = 0 if entry["parent"] is None else (1 if entry["name"][-1] in "시군구" else 2)
+            parent_ok = entry["parent"] is None or entry["parent"] in matched_names
+            return (parent_ok, level, len(key))
+        # max()는 동점이면 먼저 나온 항목(목록 순서상 광역 단위가 앞)을 고름
+        _, entry = max(matches, key=rank)
+
+        name = f"{entry['parent']} {entry['name']}" if entry["parent"] else entry["name"]
+        return ResolvedLocation(name, entry["lat"], entry["lng"], entry["radius"], "gazetteer")
+
+_gazetteer = None
+_gazetteer_lock = threading.Lock()
+
+def get_gazetteer():
+    global _gazetteer
+    if _gazetteer is None:
+        with _gazetteer_lock:
+            if _gazetteer is None:
+                _gazetteer = Gazetteer.load()
+    return _gazetteer
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 3) 원격 지오코더 + 영구 캐시
+#    - 같은 위치 문자열은 서버 재시작 후에도 다시 조회하지 않음
+# ────────────────────────────────────────────────────────────────────────────────────
+class GeocodeCache:
+    def __init__(self, path=GEOCODE_CACHE_PATH):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS geocode ("
+            "query TEXT PRIMARY KEY, name TEXT, lat REAL, lng REAL, radius INTEGER, created_at REAL)"
+        )
+        self._lock = threading.Lock()
+
+    def get(self, query):
+        """(찾음 여부, ResolvedLocation | None). 캐시에 없으면 (False, None)."""
+        with self._lock:
+            row = self._conn.execute("SELECT name, lat, lng, radius, created_at FROM geocode WHERE query = ?", (query,)).fetchone()
+        if row is None:
+            return False, None
+        name, lat, lng, radius, created_at = row
+        if name is None:
+            return (True, None) if created_at + GEOCODE_NEGATIVE_TTL > time.time() else (False, None)
+        return True, ResolvedLocation(name, lat, lng, radius, "geocoder")
+
+    def put(self, query, location):
+        values = (query, location.name, location.lat, location.lng, location.radius) if location else (query, None, None, None, None)
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO geocode VALUES (?, ?, ?, ?, ?, ?)", (*values, time.time()))
+
+def geocode(text):
+    """Google Geocoding API로 위치를 조회합니다. (결과가 없으면 None, 할당량 초과 등 일시적 오류는 예외)"""
+    import requests
+
+    res = requests.get(
+        "https://maps.googleapis.com/maps/api/geocode/json",
+        params={"address": text, "key": GOOGLE_MAPS_API_KEY, "language": "ko", "region": "kr"},
+        timeout=10,
+    )
+    body = res.json()
+    status = body.get("status", "OK")
+    if status not in ("OK", "ZERO_RESULTS"):
+        raise RuntimeError(f"Geocoding API {status}")
+    results = body.get("results", [])
+    if not results:
+        return None
+
+    result = results[0]
+    location = result["geometry"]["location"]
+    viewport = result["geometry"].get("viewport")
+    radius = 3000
+    if viewport:
+        from Ai.SearchContent import haversine_km
+        ne, sw = viewport["northeast"], viewport["southwest"]
+        radius = int(haversine_km(ne["lat"], ne["lng"], sw["lat"], sw["lng"]) * 1000 / 2)
+    return ResolvedLocation(result.get("formatted_address", text), location["lat"], location["lng"], min(max(radius, 1000), 20000), "geocoder")
+
+_geocode_cache = None
+
+def get_geocode_cache():
+    global _geocode_cache
+    if _geocode_cache is None:
+        with _gazetteer_lock:
+            if _geocode_cache is None:
+                _geocode_cache = GeocodeCache()
+    return _geocode_cache
+
+def _geocode_cached(normalized, original):
+    """SQLite 캐시 → 지오코더 순으로 조회합니다. (캐시 파일을 열 수 없으면 캐시 없이 조회)"""
+    try:
+        cache = get_geocode_cache()
+        found, resolved = cache.get(normalized)
+        if found:
+            return resolved
+    except Exception as e:
+        print(f"위치 캐시 조회 실패 ({original}): {e}")
+        cache = None
+
+    if not GOOGLE_MAPS_API_KEY:
+        return None  # 키가 설정되면 바로 조회되도록 '찾지 못함'으로 캐시하지 않음
+    try:
+        resolved = geocode(original)
+    except Exception as e:
+        print(f"위치 조회 실패 ({original}): {e}")
+        return None
+
+    if cache is not None:
+        try:
+            cache.put(normalized, resolved)
+        except Exception as e:
+            print(f"위치 캐시 저장 실패 ({original}): {e}")
+    return resolved
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 4) resolve_location 함수
+#    - 역할   : 위치 문자열 → ResolvedLocation
+#      조회에 성공한 결과만 정규화된 문자열 단위로 프로세스 내에 기억 (표기만 다른 입력도 같은 항목 사용)
+#      실패(None)는 기억하지 않으므로 '찾지 못함'은 SQLite 캐시의 GEOCODE_NEGATIVE_TTL을 따름
+#    - Returns:
+#        ResolvedLocation | None: 내장 목록·지오코더 모두 실패하면 None
+# ────────────────────────────────────────────────────────────────────────────────────
+_resolved = OrderedDict()  # normalized -> ResolvedLocation (최근 사용 순)
+_resolved_lock = threading.Lock()
+
+def resolve_location(text):
+    normalized = normalize_location(text)
+    if not normalized:
+        return None
+    with _resolved_lock:
+        resolved = _resolved.get(normalized)
+        if resolved is not None:
+            _resolved.move_to_end(normalized)
+            return resolved
+
+    resolved = get_gazetteer().lookup(location_tokens(text)) or _geocode_cached(normalized, text)
+    if resolved is not None:
+        with _resolved_lock:
+            _resolved[normalized] = resolved
+            while len(_resolved) > RESOLVED_MEMO_SIZE:
+                _resolved.popitem(last=False)
+    return resolved
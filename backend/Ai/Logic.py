@@ -6,29 +6,42 @@
 #   2) GPT 기반 감정 분석 및 한국 음식 추천  
 #   3) 감정 관련 메시지 판별  
 #   4) 인사/작별 메시지 판별  
-# 요구 모듈   : Model, Chatbot, RealtimeSearchEngine, AppControl, openai, dotenv, datetime, os
+#   5) 재추천 / 다른 식당 요청 판별
+# 요구 모듈   : Clients, ResponseCache, dotenv, datetime, os
+#               (Model, Chatbot, RealtimeSearchEngine, AppControl, Conversation은 IntegratedAI 호출 시 import)
 # -----------------------------------------------------------------------------------
 
-from Ai.Model import FirstLayerDMM
-from Ai.Chatbot import Chatbot
-from Ai.RealtimeSearchEngine import RealtimeSearchEngine
-from Ai.AppControl import open_app, close_app
-from openai import OpenAI
+from Ai.Clients import get_openai
+from Ai.ResponseCache import ResponseCache, make_key
 import os
+import re
 from dotenv import load_dotenv
 from datetime import datetime
 
-# 환경변수 로드 및 GPT 클라이언트 초기화
+# 환경변수 로드 (GPT 클라이언트는 Clients 레지스트리에서 첫 호출 시 생성)
 load_dotenv()
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+# 비슷한 감정 메시지에 대한 GPT 추천 결과를 재사용하기 위한 응답 캐시
+response_cache = ResponseCache(ttl=int(os.getenv("EMOTION_CACHE_TTL", "3600")))
 
 # ────────────────────────────────────────────────────────────────────────────────────
 # 1) 일반 태스크 기반 처리 함수
 #    - 함수명: IntegratedAI
 #    - 역할: DMM으로 분류된 태스크를 순회하며 일반 대화, 실시간 검색, 앱 제어 등을 실행
+#    - 무거운 모듈(Cohere/Groq/구글 검색)은 이 함수가 처음 호출될 때 import
+#    - 태스크들은 TaskExecutor로 동시에 실행하고, 결과는 원래 순서대로 합침
+#    - chat_history: 이 세션의 최근 채팅 로그 (요청마다 별도 이력을 만들어 다른 사용자와 섞이지 않음)
 # ────────────────────────────────────────────────────────────────────────────────────
 
-def IntegratedAI(query):
+def IntegratedAI(query, chat_history=None):
+    from Ai.Model import FirstLayerDMM
+    from Ai.Chatbot import Chatbot
+    from Ai.RealtimeSearchEngine import RealtimeSearchEngine
+    from Ai.AppControl import open_app, close_app
+    from Ai.TaskExecutor import run_tasks
+    from Ai.Conversation import ConversationHistory
+
+    history = ConversationHistory.from_logs(chat_history)
 
     greeting_responses = ["안녕하세요", "안녕", "하이", "안녕!"]
     farewell_responses = ["안녕히 가세요", "잘가", "바이"]
@@ -44,48 +57,46 @@ def IntegratedAI(query):
 
     # 실시간 뉴스/음악 검색 우선 처리
     if any(keyword in query for keyword in ["뉴스", "주요 소식"]):
-        return RealtimeSearchEngine("오늘 뉴스")
+        return RealtimeSearchEngine("오늘 뉴스", history)
 
     if any(keyword in query for keyword in ["노래", "음악", "곡", "뮤직", "추천해줘"]):
-        return RealtimeSearchEngine(query + " site:youtube.com")
+        return RealtimeSearchEngine(query + " site:youtube.com", history)
 
     # 나머지 일반 태스크 분기
-    tasks = FirstLayerDMM(query)
-    response = ""
-
-    for task in tasks:
-        task = task.strip()
+    tasks = [task.strip() for task in FirstLayerDMM(query)]
 
+    def run_task(task):
         if task.startswith("general"):
             general_query = task.replace("general", "").strip()
-            response += Chatbot(general_query) + "\n"
+            return Chatbot(general_query, history)
 
         elif task.startswith("realtime"):
             realtime_query = task.replace("realtime", "").strip()
-            response += RealtimeSearchEngine(realtime_query) + "\n"
+            return RealtimeSearchEngine(realtime_query, history)
 
         elif task.startswith("open"):
             app_name = task.replace("open", "").strip()
             open_app(app_name)
-            response += f"{app_name}을(를) 열었습니다.\n"
+            return f"{app_name}을(를) 열었습니다."
 
         elif task.startswith("close"):
             app_name = task.replace("close", "").strip()
             close_app(app_name)
-            response += f"{app_name}을(를) 닫았습니다.\n"
+            return f"{app_name}을(를) 닫았습니다."
 
         else:
-            response += "해당 명령을 이해하지 못했습니다.\n"
+            return "해당 명령을 이해하지 못했습니다."
 
-    return response.strip()
+    return "\n".join(run_tasks(tasks, run_task)).strip()
 
 # ────────────────────────────────────────────────────────────────────────────────────
 # 2) 감정 기반 추천 함수
 #    - 함수명: classify_emotion_and_reply_with_gpt
 #    - 역할: 텍스트 감정 분석 후 적절한 한국 음식 추천 프롬프트 생성 및 결과 파싱
+#    - 같은 감정 키워드 + 시간대의 요청은 응답 캐시에서 후보 음식을 번갈아 제공
 # ────────────────────────────────────────────────────────────────────────────────────
 
-def classify_emotion_and_reply_with_gpt(text, recent_foods=None, chat_history=None): 
+def classify_emotion_and_reply_with_gpt(text, recent_foods=None, chat_history=None, use_cache=True): 
     if recent_foods is None: recent_foods = []
     if chat_history is None: chat_history = []
 
@@ -100,6 +111,14 @@ def classify_emotion_and_reply_with_gpt(text, recent_foods=None, chat_history=No
     else:
         time_slot = "저녁"
 
+    # 이전 대화가 있으면 GPT 답이 대화 내용에 따라 달라지므로 캐시를 쓰지 않음 (다른 대화의 답을 재사용하지 않게)
+    # (chat_history 끝에 방금 저장한 이 메시지가 있으면 이전 대화로 보지 않음)
+    earlier = chat_history[:-1] if chat_history and chat_history[-1].message == text else chat_history
+    cache_key = make_key(match_emotion_keywords(text), time_slot) if use_cache and not earlier else None
+    cached = response_cache.get(cache_key, exclude=recent_foods)
+    if cached:
+        return cached
+
     recent_foods_str = ", ".join(recent_foods)
 
     prompt = f"""
@@ -122,7 +141,7 @@ def classify_emotion_and_reply_with_gpt(text, recent_foods=None, chat_history=No
 추천 이유: (이유)
 """
 
-    response = client.chat.completions.create(
+    response = get_openai().chat.completions.create(
         model="gpt-4o",
         messages=[{"role": "user", "content": prompt}],
         max_tokens=300,
@@ -140,60 +159,67 @@ def classify_emotion_and_reply_with_gpt(text, recent_foods=None, chat_history=No
         elif line.startswith("추천 이유:"):
             reason = line.replace("추천 이유:", "").strip()
 
+    if food:
+        response_cache.put(cache_key, (emotion, food, reason))
+
     return emotion, food, reason
 
 # ────────────────────────────────────────────────────────────────────────────────────
 # 3) 감정 관련 키워드 감지 함수
-#    - 함수명: is_emotion_related
-#    - 역할: 텍스트에 감정 관련 키워드가 포함되었는지 여부 판별
+#    - 함수명: is_emotion_related, match_emotion_keywords
+#    - 역할: 텍스트에 감정 관련 키워드가 포함되었는지 여부 판별 / 포함된 키워드 집합 반환
 # ────────────────────────────────────────────────────────────────────────────────────
 
-def is_emotion_related(text):
+EMOTION_KEYWORDS = [
+    "갈등", "갈등 있어", "감사하", "감사하다", "감사한", "감사함", "고맙", "고마워", "고맙다", "고마운", "고마움",
+    "고민되", "고민돼", "고민되다", "고민된", "고민됨", "공허하", "공허하다", "공허한", "공허함",
+    "귀찮", "귀찮다", "귀찮아", "귀찮은", "귀찮음", "기대되", "기대돼", "기대되다", "기대한", "기대됨",
+    "기뻐", "기쁘", "기쁘다", "기쁜", "기쁨", "기분 좋아", "기분이 좋아", "나른하", "나른하다", "나른한", "나른함",
+    "당당하", "당당하다", "당당해", "당당한", "당당함", "당황하", "당황하다", "당황했어", "당황한", "당황함",
+    "다정하", "다정하다", "다정해", "다정한", "다정함", "든든하", "든든하다", "든든해", "든든한", "든든함",
+    "무덤덤하", "무덤덤하다", "무덤덤해", "무덤덤한", "무덤덤함", "무기력하", "무기력하다", "무기력해", "무기력한", "무기력함",
+    "무섭", "무섭다", "무서워", "무서운", "무서움", "미안하", "미안하다", "미안해", "미안한", "미안함",
+    "분하", "분하다", "분해", "분한", "분함", "부끄럽", "부끄럽다", "부끄러워", "부끄러운", "부끄러움",
+    "불안하", "불안하다", "불안해", "불안한", "불안함", "뿌듯하", "뿌듯하다", "뿌듯해", "뿌듯한", "뿌듯함",
+    "비참하", "비참하다", "비참한", "비참함", "사랑하", "사랑하다", "사랑해", "사랑한", "사랑함",
+    "상실되", "상실되다", "상실감", "상실된", "상실됨", "설레", "설레다", "설레여", "설렌다",
+    "슬프", "슬프다", "슬퍼", "슬펐어", "슬픈", "슬픔", "스트레스", "스트레스 받아", "스트레스 받다", "스트레스를 받은",
+    "스트레스 받음", "싫", "싫다", "싫어", "싫은", "싫음", "심란하", "심란하다", "심란해", "심란한", "심란함",
+    "신나", "신난다", "신났어", "신나는", "신남", "아무 느낌 없어", "애틋하", "애틋하다", "애틋해", "애틋한", "애틋함",
+    "얼떨떨하", "얼떨떨하다", "얼떨떨해", "얼떨떨한", "얼떨떨함", "억울하", "억울하다", "억울해", "억울한", "억울함",
+    "여유롭", "여유롭다", "여유로워", "여유로운", "여유로움", "연민", "우울하", "우울하다", "우울해", "우울한", "우울함",
+    "웃기", "웃긴", "웃김", "위로 받고 싶다", "위로 받고 싶어", "위로가 필요해", "유쾌하", "유쾌하다", "유쾌해", "유쾌한", "유쾌함",
+    "의기소침하", "의기소침하다", "의기소침한", "의기소침함", "이해받고 싶어", "자랑스럽", "자랑스럽다", "자랑스러워", "자랑스러운", "자랑스러움",
+    "자신 있", "자신 있다", "자신있어", "자신감", "재미없", "재미없다", "재미없어", "재미없는", "재미없음",
+    "적적하", "적적하다", "적적한", "적적함", "조마조마하", "조마조마하다", "조마조마해", "조마조마한", "조마조마함",
+    "죄책감", "죄책감 들어", "즐겁", "즐겁다", "즐거워", "즐거운", "즐거웠", "즐거움", "지루하", "지루하다", "지루해", "지루한", "지루함",
+    "지치", "지쳤", "지치다", "지쳤어", "지친", "지침", "진절머리", "차분하", "차분하다", "차분해", "차분한", "차분함",
+    "창피하", "창피하다", "창피해", "창피한", "창피함", "초조하", "초조하다", "초조해", "초조한", "초조함",
+    "칭찬받고 싶어", "편안하", "편안하다", "편안해", "편안한", "편안함", "평온하", "평온하다", "평온해", "평온한", "평온함",
+    "피곤하", "피곤하다", "피곤해", "피곤한", "피곤함", "혼란스럽", "혼란스럽다", "혼란스러워", "혼란스러운", "혼란스러움",
+    "화나", "화나다", "화났어", "화난", "화남", "흥미롭", "흥미롭다", "흥미로워", "흥미로운", "흥미로움", "기분이 나빠", 
+    "나빠", "나쁘다", "나쁜", "나쁨", "기분이 이상해", "이상해", "이상하다", "이상한", "이상함", "기분이 구려", "구려", "구리다", "구린", "구림",
+    "기분이 안 좋아", "기분 별로야", "찝찝해", "속상해", "짜증나 죽겠어", "현타 와", "멘붕이야",
+    "기운이 없어", "불편해", "허탈해", "피곤해서 아무것도 하기 싫어", "우울한 하루", "답답해",
+    "억울해 죽겠어", "열받아", "터질 거 같아", "현실도피하고 싶어", "도망가고 싶어",
+    "기분 좋다", "날아갈 것 같아", "행복해 죽겠어", "상쾌해", "기대돼서 잠이 안 와", "기분 최고",
+    "뭔가 설레", "괜히 웃음 나와", "힐링되는 기분", "뭔가 잘 풀리는 느낌이야",
+    "마음이 복잡해", "감정이 뒤죽박죽이야", "묘한 감정이야", "기분이 뭔가 이상해",
+    "불안한데 기대돼", "슬픈데 편안해", "좋은데 무서워",
+    "기분좋아", "기분이좋아", "기분좋다", "기분최고", "기분이최고", "기분나빠", "기분이나빠",
+    "기분별로야", "기분이별로야", "기분이이상해", "기분이구려", "기분이뭔가이상해",
+    "행복해죽겠어", "짜증나죽겠어", "억울해죽겠어", "현실도피하고싶어", "도망가고싶어",
+    "피곤해서아무것도하기싫어"
+]
+
+def match_emotion_keywords(text):
+    """텍스트에 포함된 감정 키워드 집합을 반환합니다. (응답 캐시의 정규화 키로도 사용)"""
     lowered = text.lower()
+    return frozenset(kw for kw in EMOTION_KEYWORDS if kw in lowered)
 
-    emotion_keywords = [
-        "갈등", "갈등 있어", "감사하", "감사하다", "감사한", "감사함", "고맙", "고마워", "고맙다", "고마운", "고마움",
-        "고민되", "고민돼", "고민되다", "고민된", "고민됨", "공허하", "공허하다", "공허한", "공허함",
-        "귀찮", "귀찮다", "귀찮아", "귀찮은", "귀찮음", "기대되", "기대돼", "기대되다", "기대한", "기대됨",
-        "기뻐", "기쁘", "기쁘다", "기쁜", "기쁨", "기분 좋아", "기분이 좋아", "나른하", "나른하다", "나른한", "나른함",
-        "당당하", "당당하다", "당당해", "당당한", "당당함", "당황하", "당황하다", "당황했어", "당황한", "당황함",
-        "다정하", "다정하다", "다정해", "다정한", "다정함", "든든하", "든든하다", "든든해", "든든한", "든든함",
-        "무덤덤하", "무덤덤하다", "무덤덤해", "무덤덤한", "무덤덤함", "무기력하", "무기력하다", "무기력해", "무기력한", "무기력함",
-        "무섭", "무섭다", "무서워", "무서운", "무서움", "미안하", "미안하다", "미안해", "미안한", "미안함",
-        "분하", "분하다", "분해", "분한", "분함", "부끄럽", "부끄럽다", "부끄러워", "부끄러운", "부끄러움",
-        "불안하", "불안하다", "불안해", "불안한", "불안함", "뿌듯하", "뿌듯하다", "뿌듯해", "뿌듯한", "뿌듯함",
-        "비참하", "비참하다", "비참한", "비참함", "사랑하", "사랑하다", "사랑해", "사랑한", "사랑함",
-        "상실되", "상실되다", "상실감", "상실된", "상실됨", "설레", "설레다", "설레여", "설렌다",
-        "슬프", "슬프다", "슬퍼", "슬펐어", "슬픈", "슬픔", "스트레스", "스트레스 받아", "스트레스 받다", "스트레스를 받은",
-        "스트레스 받음", "싫", "싫다", "싫어", "싫은", "싫음", "심란하", "심란하다", "심란해", "심란한", "심란함",
-        "신나", "신난다", "신났어", "신나는", "신남", "아무 느낌 없어", "애틋하", "애틋하다", "애틋해", "애틋한", "애틋함",
-        "얼떨떨하", "얼떨떨하다", "얼떨떨해", "얼떨떨한", "얼떨떨함", "억울하", "억울하다", "억울해", "억울한", "억울함",
-        "여유롭", "여유롭다", "여유로워", "여유로운", "여유로움", "연민", "우울하", "우울하다", "우울해", "우울한", "우울함",
-        "웃기", "웃긴", "웃김", "위로 받고 싶다", "위로 받고 싶어", "위로가 필요해", "유쾌하", "유쾌하다", "유쾌해", "유쾌한", "유쾌함",
-        "의기소침하", "의기소침하다", "의기소침한", "의기소침함", "이해받고 싶어", "자랑스럽", "자랑스럽다", "자랑스러워", "자랑스러운", "자랑스러움",
-        "자신 있", "자신 있다", "자신있어", "자신감", "재미없", "재미없다", "재미없어", "재미없는", "재미없음",
-        "적적하", "적적하다", "적적한", "적적함", "조마조마하", "조마조마하다", "조마조마해", "조마조마한", "조마조마함",
-        "죄책감", "죄책감 들어", "즐겁", "즐겁다", "즐거워", "즐거운", "즐거웠", "즐거움", "지루하", "지루하다", "지루해", "지루한", "지루함",
-        "지치", "지쳤", "지치다", "지쳤어", "지친", "지침", "진절머리", "차분하", "차분하다", "차분해", "차분한", "차분함",
-        "창피하", "창피하다", "창피해", "창피한", "창피함", "초조하", "초조하다", "초조해", "초조한", "초조함",
-        "칭찬받고 싶어", "편안하", "편안하다", "편안해", "편안한", "편안함", "평온하", "평온하다", "평온해", "평온한", "평온함",
-        "피곤하", "피곤하다", "피곤해", "피곤한", "피곤함", "혼란스럽", "혼란스럽다", "혼란스러워", "혼란스러운", "혼란스러움",
-        "화나", "화나다", "화났어", "화난", "화남", "흥미롭", "흥미롭다", "흥미로워", "흥미로운", "흥미로움", "기분이 나빠", 
-        "나빠", "나쁘다", "나쁜", "나쁨", "기분이 이상해", "이상해", "이상하다", "이상한", "이상함", "기분이 구려", "구려", "구리다", "구린", "구림",
-        "기분이 안 좋아", "기분 별로야", "찝찝해", "속상해", "짜증나 죽겠어", "현타 와", "멘붕이야",
-        "기운이 없어", "불편해", "허탈해", "피곤해서 아무것도 하기 싫어", "우울한 하루", "답답해",
-        "억울해 죽겠어", "열받아", "터질 거 같아", "현실도피하고 싶어", "도망가고 싶어",
-        "기분 좋다", "날아갈 것 같아", "행복해 죽겠어", "상쾌해", "기대돼서 잠이 안 와", "기분 최고",
-        "뭔가 설레", "괜히 웃음 나와", "힐링되는 기분", "뭔가 잘 풀리는 느낌이야",
-        "마음이 복잡해", "감정이 뒤죽박죽이야", "묘한 감정이야", "기분이 뭔가 이상해",
-        "불안한데 기대돼", "슬픈데 편안해", "좋은데 무서워",
-        "기분좋아", "기분이좋아", "기분좋다", "기분최고", "기분이최고", "기분나빠", "기분이나빠",
-        "기분별로야", "기분이별로야", "기분이이상해", "기분이구려", "기분이뭔가이상해",
-        "행복해죽겠어", "짜증나죽겠어", "억울해죽겠어", "현실도피하고싶어", "도망가고싶어",
-        "피곤해서아무것도하기싫어"
-    ]
-
-    return any(kw in lowered for kw in emotion_keywords)
+def is_emotion_related(text):
+    lowered = text.lower()
+    return any(kw in lowered for kw in EMOTION_KEYWORDS)
 
 
 
@@ -218,7 +244,17 @@ def is_thanks(text: str) -> bool:
     t = text.strip().lower()
     return any(keyword in t for keyword in THANK_KEYWORDS)
 
+# 재추천 요청 시 GPT 없이 고를 후보 음식 (prefetch 후보로도 사용)
+RECOMMEND_FOODS = ["김밥", "떡볶이", "비빔밥", "갈비탕", "파스타", "치킨"]
+
 def is_recommend(text: str) -> bool:
     RECOMMEND_KEYWORDS = ["다른거 추천", "다른 추천", "다시 추천", "재추천"]
     t = text.strip().lower()
-    return any(k in t for k in RECOMMEND_KEYWORDS)
\ No newline at end of file
+    return any(k in t for k in RECOMMEND_KEYWORDS)
+
+# "다른데"(기분이 좀 다른데…)처럼 감정 표현에도 쓰이는 말은 제외하고, 장소를 가리키는 말만 인정
+# ("다른 데"는 띄어 쓴 채 단어가 끝날 때만: "다른 데 없어?", "다른 데는?")
+PLACE_PATTERN = re.compile(r"다른\s*(식당|가게|곳|맛집)|다른\s+데(는|도)?(?=[\s?!.~]|$)")
+
+def is_another_place(text: str) -> bool:
+    return PLACE_PATTERN.search(text.strip().lower()) is not None
\ No newline at end of file
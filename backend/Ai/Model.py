@@ -2,25 +2,27 @@
 # 파일 이름   : Model.py
 # 설명        : Cohere 기반 DMM(Dispatch Mapping Model) 모듈 – 입력 쿼리를 태스크별 명령어로 분류
 # 주요 기능   :
-#   1) .env 파일에서 Cohere API 키 로드 및 클라이언트 초기화
+#   1) Cohere 클라이언트는 Clients 레지스트리에서 원격 분류가 필요할 때만 생성
 #   2) 태스크 키워드 목록 정의 및 대화 이력(preamble, ChatHistory) 설정
 #   3) FirstLayerDMM 함수로 입력 쿼리 분류 및 태스크 리스트 반환
+#      - 로컬 분류기(IntentClassifier)로 먼저 분류하고, 신뢰도가 낮거나 로컬에서 만들 수 없는
+#        태스크(play, reminder 등)일 때만 Cohere 호출
 #   4) 스크립트 직접 실행 시 반복 입력으로 분류 결과 테스트
-# 요구 모듈   : cohere, rich, python-dotenv, os, datetime
+# 요구 모듈   : python-dotenv, Clients, IntentClassifier (rich는 직접 실행 시에만 사용)
 # -----------------------------------------------------------------------------------
 
-import cohere 
-from rich import print 
 from dotenv import dotenv_values 
+from Ai.Clients import get_cohere
+from Ai.IntentClassifier import LocalDMM
 
 env_vars = dotenv_values(".env")
-CohereAPIKey = env_vars.get("CohereAPIKey")
-co = cohere.Client(api_key=CohereAPIKey)
+
+# 로컬 분류 결과를 그대로 사용할 최소 신뢰도 (이보다 낮으면 Cohere로 위임)
+LocalThreshold = float(env_vars.get("DMMLocalThreshold") or 0.6)
 
 # ────────────────────────────────────────────────────────────────────────────────────
 # 1) 태스크 키워드 및 대화 이력 설정
 #    - funcs: 지원하는 태스크 키워드 목록
-#    - messages: 사용자 입력 이력 저장용 리스트
 #    - preamble: DMM 분류용 시스템 프롬프트
 #    - ChatHistory: 샘플 대화 히스토리
 # ────────────────────────────────────────────────────────────────────────────────────
@@ -30,8 +32,6 @@ funcs = [
   "youtube search", "reminder"
 ]
 
-messages = []
-
 preamble = """
 당신은 매우 정확한 결정 모델입니다. 주어진 쿼리가 어떤 종류의 작업인지 판단해주세요.
 예를 들어,
@@ -59,15 +59,30 @@ ChatHistory = [
 # ────────────────────────────────────────────────────────────────────────────────────
 # 2) FirstLayerDMM 함수 정의
 #    - 함수명: FirstLayerDMM
-#    - 역할   : Cohere DMM 모델에 프롬프트 전송 후 태스크별로 분류된 리스트 반환
+#    - 역할   : 로컬 분류기로 태스크를 분류하고, 신뢰도가 낮으면 RemoteDMM으로 위임
 #    - Args   :
 #        prompt (str): 분류할 사용자 입력 문자열
 #    - Returns:
 #        List[str]: '키워드 (파라미터)' 형식으로 분류된 태스크 문자열 리스트
 # ────────────────────────────────────────────────────────────────────────────────────
 def FirstLayerDMM(prompt: str = "test"):
-    messages.append({"role": "user", "content": prompt})
-    stream = co.chat_stream (
+    tasks = LocalDMM(prompt, threshold=LocalThreshold)
+    if tasks:
+        return tasks
+    return RemoteDMM(prompt)
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 3) RemoteDMM 함수 정의
+#    - 함수명: RemoteDMM
+#    - 역할   : Cohere DMM 모델에 프롬프트 전송 후 태스크별로 분류된 리스트 반환
+#    - Args   :
+#        prompt (str): 분류할 사용자 입력 문자열
+#        retries (int): 응답이 '(query)' 자리표시자일 때 재시도할 횟수
+#    - Returns:
+#        List[str]: '키워드 (파라미터)' 형식으로 분류된 태스크 문자열 리스트
+# ────────────────────────────────────────────────────────────────────────────────────
+def RemoteDMM(prompt: str = "test", retries: int = 2):
+    stream = get_cohere().chat_stream (
         model='command-r-plus', 
         message=prompt,
         temperature=0.7,
@@ -89,16 +104,17 @@ def FirstLayerDMM(prompt: str = "test"):
             if task.startswith(func):
                 temp.append(task)
     response = temp
-    if "(query)" in response:
-        newresponse = FirstLayerDMM(prompt=prompt)
-        return newresponse
+    if "(query)" in response and retries > 0:
+        return RemoteDMM(prompt=prompt, retries=retries - 1)
     else:
         return response
   
 # ────────────────────────────────────────────────────────────────────────────────────
-# 3) 스크립트 직접 실행용 엔트리포인트
+# 4) 스크립트 직접 실행용 엔트리포인트
 #    - 사용자 입력을 받아 FirstLayerDMM 결과를 반복 출력
 # ────────────────────────────────────────────────────────────────────────────────────
 if __name__ == "__main__":
+    from rich import print
+
     while True:
         print(FirstLayerDMM(input(">>> ")))
\ No newline at end of file
@@ -2,29 +2,31 @@
 # 파일 이름   : realtime_search_service.py
 # 설명        : Groq LLM과 구글 검색 연동을 통해 최신 정보를 실시간으로 제공하는 모듈
 # 주요 기능   :
-#   1) .env 파일에서 환경 변수(Username, Assistantname, GroqAPIKey) 로드
-#   2) 구글 검색(GoogleSearch) 함수로 상위 5개 결과 수집
+#   1) .env 파일에서 환경 변수(Username, Assistantname) 로드
+#   2) 구글 검색(GoogleSearch) 함수로 상위 5개 결과 수집 (WebSearch 캐시 사용, 토큰 예산 내로 요약)
 #   3) LLM 응답 후후 처리를 위한 AnswerModifier 함수
 #   4) 실시간 정보(날짜·시간·요일) 제공 함수 Information
-#   5) RealtimeSearchEngine 엔드포인트 로직 구현
+#   5) RealtimeSearchEngine 엔드포인트 로직 구현 (호출 측이 넘긴 이력과 요청마다 독립된 메시지 목록 사용)
 #   6) __main__ 블록에서 반복 입력 테스트 지원
-# 요구 모듈   : googlesearch, groq, json, datetime, python-dotenv, os
+# 요구 모듈   : datetime, python-dotenv, os, Clients, Conversation, WebSearch
 # -----------------------------------------------------------------------------------
 
-from googlesearch import search
-from groq import Groq
-from json import load, dump
 import datetime
+import os
 from dotenv import dotenv_values
+from Ai.Clients import get_groq
+from Ai.Conversation import ConversationHistory, DEFAULT_LOG_PATH
+from Ai import WebSearch
 
 # .env 파일에서 환경변수 로드
 env_vars = dotenv_values(".env")
 Username = env_vars.get("Username")
 Assistantname = env_vars.get("Assistantname")
-GroqAPIKey = env_vars.get("GroqAPIKey")
 
-# Groq 클라이언트 초기화
-client = Groq(api_key=GroqAPIKey)
+# Groq 클라이언트는 Clients 레지스트리에서 첫 호출 시 생성합니다.
+
+# 프롬프트에 넣을 검색 결과의 최대 토큰 수 (대략치)
+SearchTokenBudget = int(os.getenv("SEARCH_TOKEN_BUDGET", "400"))
 
 # 시스템 메시지를 한국어로 작성
 System = f"""안녕하세요, 저는 {Username}입니다. 당신은 {Assistantname}이라는 이름의 고급 AI 챗봇이며, 최신 정보를 실시간으로 제공합니다.
@@ -32,29 +34,20 @@ System = f"""안녕하세요, 저는 {Username}입니다. 당신은 {Assistantna
 *** 제공된 데이터를 바탕으로 질문에 정확하게 답변해주세요. ***
 """
 
-# ChatLog 파일 읽기/쓰기 (Data/ChatLog.json)
-try:
-    with open("Data/ChatLog.json", "r", encoding="utf-8") as f:
-        messages = load(f)
-except:
-    with open("Data/ChatLog.json", "w", encoding="utf-8") as f:
-        dump([], f)
+# 대화 이력은 호출마다 history 인자로 받습니다. (ChatLog.json은 직접 실행할 때만 사용)
 
 # ────────────────────────────────────────────────────────────────────────────────────
 # 1) GoogleSearch 함수
 #    - 역할: 주어진 쿼리에 대해 구글 검색 결과 상위 5건을 제목·설명과 함께 반환
+#            (같은 질의는 WebSearch 캐시에서 재사용, 결과는 SearchTokenBudget 이내로 자름)
 #    - Args:
 #        query (str): 검색할 키워드
 #    - Returns:
 #        str: 포맷팅된 검색 결과 문자열
 # ────────────────────────────────────────────────────────────────────────────────────
 def GoogleSearch(query):
-    results = list(search(query, advanced=True, num_results=5))
-    Answer = f"'{query}'에 대한 구글 검색 결과:\n[start]\n"
-    for i in results:
-        Answer += f"제목: {i.title}\n설명: {i.description}\n\n"
-    Answer += "[end]"
-    return Answer
+    results = WebSearch.search(query, num_results=5)
+    return WebSearch.format_results(query, results, token_budget=SearchTokenBudget)
 
 # ────────────────────────────────────────────────────────────────────────────────────
 # 2) AnswerModifier 함수
@@ -70,7 +63,7 @@ def AnswerModifier(Answer):
     modified_answer = '\n'.join(non_empty_lines)
     return modified_answer
 
-# 초기 시스템 대화 (한국어)
+# 초기 시스템 대화 (한국어) - 읽기 전용으로 사용하며, 요청마다 복사본에 검색 결과를 붙입니다.
 SystemChatBot = [
     {"role": "system", "content": System},
     {"role": "user", "content": "안녕"},
@@ -99,21 +92,20 @@ def Information():
 #            Groq LLM에 스트리밍 요청하고 응답 저장/반환
 #    - Args:
 #        prompt (str): 사용자 입력 프롬프트
+#        history (ConversationHistory): 이 요청(세션)의 대화 이력
 #    - Returns:
 #        str: 정제된 LLM 응답 문자열
 # ────────────────────────────────────────────────────────────────────────────────────
-def RealtimeSearchEngine(prompt):
-    global SystemChatBot, messages
-    with open("Data/ChatLog.json", "r", encoding="utf-8") as f:
-        messages = load(f)
+def RealtimeSearchEngine(prompt, history):
+    messages = history.snapshot()
     messages.append({"role": "user", "content": prompt})
     
-    # 구글 검색 결과 추가
-    SystemChatBot.append({"role": "assistant", "content": GoogleSearch(prompt)})
+    # 구글 검색 결과 추가 (전역 SystemChatBot은 변경하지 않음)
+    system_messages = SystemChatBot + [{"role": "assistant", "content": GoogleSearch(prompt)}]
     
-    completion = client.chat.completions.create(
+    completion = get_groq().chat.completions.create(
         model="llama3-70b-8192",
-        messages=SystemChatBot + [{"role": "system", "content": Information()}] + messages,
+        messages=system_messages + [{"role": "system", "content": Information()}] + messages,
         temperature=0.7,
         max_tokens=2048,
         top_p=1,
@@ -125,10 +117,7 @@ def RealtimeSearchEngine(prompt):
         if chunk.choices[0].delta.content:
             Answer += chunk.choices[0].delta.content
     Answer = Answer.strip().replace("</s>", "")
-    messages.append({"role": "assistant", "content": Answer})
-    with open("Data/ChatLog.json", "w", encoding="utf-8") as f:
-        dump(messages, f, indent=4)
-    SystemChatBot.pop()  # 추가된 시스템 메시지 제거
+    history.extend({"role": "user", "content": prompt}, {"role": "assistant", "content": Answer})
     return AnswerModifier(Answer=Answer)
 
 # ────────────────────────────────────────────────────────────────────────────────────
@@ -136,6 +125,7 @@ def RealtimeSearchEngine(prompt):
 #    - 반복 입력을 받아 RealtimeSearchEngine 결과 출력
 # ────────────────────────────────────────────────────────────────────────────────────
 if __name__ == "__main__":
+    history = ConversationHistory(path=DEFAULT_LOG_PATH)
     while True:
         prompt = input("질문을 입력하세요: ")
-        print(RealtimeSearchEngine(prompt))
\ No newline at end of file
+        print(RealtimeSearchEngine(prompt, history))
\ No newline at end of file
@@ -0,0 +1,167 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : RecommendBuffer.py
+# 설명        : "다른거 추천/재추천" 요청에 바로 응답하기 위한 세션별 추천 선계산(prefetch) 버퍼
+# 주요 기능   :
+#   1) 세션마다 이미 추천한 음식 기록 (같은 세션에서 중복 추천 방지)
+#   2) 추천 응답 후 다음 후보 음식 2~3개와 식당을 미리 찾아 버퍼에 저장 (prefetch)
+#   3) 재추천 요청 시 버퍼에서 바로 꺼내 응답
+#   4) 최대 세션 수(LRU)·세션당 개수·TTL로 메모리 사용량 제한, 적중률 통계 제공
+#   5) 세션에서 이미 보여 준 식당(place_id) 기록 ("다른 식당" 요청 처리용)
+#   6) 세션·사용자 삭제 시 상태 제거 (app.py의 세션 삭제·회원 탈퇴 API에서 호출)
+# 요구 모듈   : collections, concurrent.futures, os, random, threading, time
+# -----------------------------------------------------------------------------------
+
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+import os
+import random
+import threading
+import time
+
+_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="recommend-prefetch")
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 1) 세션 상태 클래스
+#    - suggested: 이 세션에서 이미 추천한 음식 (최근 max_suggested개)
+#    - ready    : 미리 찾아 둔 (음식, 식당, 위치, 만료 시각) 목록
+#    - shown    : 이 세션에서 이미 보여 준 식당 place_id (최근 max_suggested개)
+# ────────────────────────────────────────────────────────────────────────────────────
+class _SessionState:
+    __slots__ = ("suggested", "ready", "prefetching", "shown")
+
+    def __init__(self, max_suggested):
+        self.suggested = deque(maxlen=max_suggested)
+        self.ready = deque()
+        self.prefetching = False
+        self.shown = deque(maxlen=max_suggested)
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 2) RecommendBuffer 클래스
+#    - ttl          : 미리 찾아 둔 추천의 유효 시간(초)
+#    - depth        : 세션당 미리 찾아 둘 추천 개수
+#    - max_sessions : 상태를 유지할 최대 세션 수 (초과 시 가장 오래 사용되지 않은 세션 제거)
+# ────────────────────────────────────────────────────────────────────────────────────
+class RecommendBuffer:
+    def __init__(self, ttl=600, depth=3, max_sessions=1000, max_suggested=30):
+        self.ttl = ttl
+        self.depth = depth
+        self.max_sessions = max_sessions
+        self.max_suggested = max_suggested
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.prefetched = 0
+        self.expired = 0
+
+    def _state(self, session_id):
+        # 호출 측에서 lock을 잡은 상태로 호출합니다.
+        state = self._sessions.get(session_id)
+        if state is None:
+            state = self._sessions[session_id] = _SessionState(self.max_suggested)
+            while len(self._sessions) > self.max_sessions:
+                _, evicted = self._sessions.popitem(last=False)
+                self.expired += len(evicted.ready)
+        self._sessions.move_to_end(session_id)
+        return state
+
+    def mark_suggested(self, session_id, food):
+        with self._lock:
+            self._state(session_id).suggested.append(food)
+
+    def suggested(self, session_id):
+        with self._lock:
+            return set(self._state(session_id).suggested)
+
+    def last_suggested(self, session_id):
+        with self._lock:
+            suggested = self._state(session_id).suggested
+            return suggested[-1] if suggested else None
+
+    def mark_shown(self, session_id, place_id):
+        with self._lock:
+            self._state(session_id).shown.append(place_id)
+
+    def shown(self, session_id):
+        with self._lock:
+            return set(self._state(session_id).shown)
+
+    def pop(self, session_id, location):
+        """같은 위치로 미리 찾아 둔 (음식, 식당)을 꺼냅니다. 없으면 None."""
+        with self._lock:
+            state = self._state(session_id)
+            now = time.monotonic()
+            while state.ready:
+                food, restaurant, loc, expires = state.ready.popleft()
+                if expires < now or loc != location or food in state.suggested:
+                    self.expired += 1
+                    continue
+                self.hits += 1
+                return food, restaurant
+            self.misses += 1
+            return None
+
+    def discard(self, *session_ids):
+        """세션이 삭제되었을 때 상태를 제거합니다."""
+        with self._lock:
+            for session_id in session_ids:
+                state = self._sessions.pop(session_id, None)
+                if state:
+                    self.expired += len(state.ready)
+
+    # ────────────────────────────────────────────────────────────────────────────────
+    # prefetch 함수
+    #    - candidates 중 이 세션에서 추천하지 않았고 버퍼에도 없는 음식을 골라
+    #      find(food, location)으로 식당을 동시에 찾아 버퍼에 넣음
+    #    - 같은 세션의 prefetch가 이미 진행 중이면 아무것도 하지 않음
+    #    - 검색은 음식마다 따로 실행하여, 일부가 실패해도 성공한 음식은 버퍼에 넣음
+    # ────────────────────────────────────────────────────────────────────────────────
+    def prefetch(self, session_id, location, candidates, find):
+        with self._lock:
+            state = self._state(session_id)
+            if state.prefetching:
+                return
+            excluded = set(state.suggested) | {item[0] for item in state.ready}
+            pool = [food for food in candidates if food not in excluded]
+            count = self.depth - len(state.ready)
+            if count <= 0 or not pool:
+                return
+            state.prefetching = True
+        foods = random.sample(pool, min(count, len(pool)))
+
+        found = []
+        try:
+            futures = [(food, _pool.submit(find, food, location)) for food in foods]
+            for food, future in futures:
+                try:
+                    restaurant = future.result()
+                except Exception as e:
+                    print(f"추천 미리 찾기 실패 ({food}): {e}")
+                    continue
+                if restaurant:
+                    found.append((food, restaurant))
+        finally:
+            with self._lock:
+                state.prefetching = False
+                expires = time.monotonic() + self.ttl
+                for food, restaurant in found:
+                    state.ready.append((food, restaurant, location, expires))
+                    self.prefetched += 1
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "sessions": len(self._sessions),
+                "hits": self.hits,
+                "misses": self.misses,
+                "prefetched": self.prefetched,
+                "expired": self.expired,
+                "hit_rate": (self.hits / total) if total else 0.0,
+            }
+
+# 재추천 요청에 바로 응답하기 위해 세션별로 다음 추천을 미리 찾아 두는 버퍼 (앱 전체에서 하나를 공유)
+recommend_buffer = RecommendBuffer(
+    ttl=int(os.getenv("RECOMMEND_PREFETCH_TTL", "600")),
+    depth=int(os.getenv("RECOMMEND_PREFETCH_DEPTH", "3")),
+)
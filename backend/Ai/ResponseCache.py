@@ -0,0 +1,111 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : ResponseCache.py
+# 설명        : 감정 기반 음식 추천(GPT) 응답을 재사용하기 위한 의미 기반 응답 캐시 모듈
+# 주요 기능   :
+#   1) 메시지의 정규화 키(감지된 감정 키워드 집합 + 시간대) 생성
+#   2) 공유 캐시(cache.Cache)에 저장하여 여러 워커가 같은 후보를 사용, TTL 기반 만료
+#   3) 같은 키에 여러 추천 음식을 모아 두고 번갈아 제공(다양성 정책)
+#   4) 적중률 측정을 위한 hits / misses 통계 제공
+# 요구 모듈   : cache, threading, time
+# -----------------------------------------------------------------------------------
+
+import threading
+import time
+from cache import Cache
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 1) 캐시 키 생성 함수
+#    - 함수명: make_key
+#    - 역할  : 감지된 감정 키워드 집합과 시간대로 정규화된 캐시 키 생성
+#              ("너무 피곤해", "피곤해 죽겠어" → 같은 키)
+#    - Returns:
+#        tuple | None: 키워드가 하나도 없으면 캐시하지 않도록 None 반환
+# ────────────────────────────────────────────────────────────────────────────────────
+def make_key(keywords, time_slot):
+    if not keywords:
+        return None
+    return (tuple(sorted(keywords)), time_slot)
+
+def _decode_entry(entry):
+    # JSON에는 튜플이 없으므로 (emotion, food, reason) 후보를 튜플로 되돌림
+    entry["variants"] = [tuple(v) for v in entry["variants"]]
+    return entry
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 2) ResponseCache 클래스
+#    - ttl          : 항목 유지 시간(초), 새 음식이 추가될 때마다 다시 시작
+#    - min_variants : 캐시에서 응답하기 전 모아야 할 GPT 응답 수 (같은 음식이 반복된 응답도 셈)
+#                     (처음 몇 번은 GPT를 호출해 후보를 쌓고, 이후부터 모인 음식을 번갈아 제공
+#                      GPT가 계속 같은 음식만 답하면 그 음식 하나로 응답)
+#    - max_variants : 키 하나당 보관할 최대 음식 수
+#    - backend      : 캐시 백엔드 (없으면 cache.py의 기본 백엔드)
+#    - 항목({"expires", "variants", "cursor", "replies"})은 통째로 읽고 써서 워커 간에 공유
+#      (동시에 고쳐 쓰면 한쪽 변경이 사라질 수 있으나, 후보가 한 번 덜 쌓이거나 순서가 겹치는 정도임)
+# ────────────────────────────────────────────────────────────────────────────────────
+class ResponseCache:
+    def __init__(self, ttl=60 * 60, min_variants=3, max_variants=5, namespace="emotion_responses", backend=None):
+        self.ttl = ttl
+        self.min_variants = min_variants
+        self.max_variants = max_variants
+        self._cache = Cache(namespace, ttl=ttl, backend=backend, decode=_decode_entry)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, exclude=()):
+        """키에 해당하는 (emotion, food, reason) 중 하나를 순서대로 반환합니다.
+        exclude에 포함된 음식은 건너뛰며, 제공할 항목이 없으면 None을 반환합니다."""
+        if key is None:
+            return None
+        entry = self._cache.get(key)
+        if entry is not None and entry.get("replies", len(entry["variants"])) >= self.min_variants:
+            variants = entry["variants"]
+            for offset in range(len(variants)):
+                index = (entry["cursor"] + offset) % len(variants)
+                if variants[index][1] not in exclude:
+                    # 다음 요청이 다음 음식을 받도록 커서를 저장 (남은 유효 시간 유지)
+                    entry["cursor"] = index + 1
+                    remaining = entry["expires"] - time.time()
+                    if remaining > 0:
+                        self._cache.set(key, entry, ttl=remaining)
+                    self._count(hits=1)
+                    return variants[index]
+
+        self._count(misses=1)
+        return None
+
+    def put(self, key, value):
+        """GPT 응답(emotion, food, reason)을 키의 후보 목록에 추가합니다."""
+        if key is None or not value or not value[1]:
+            return
+        entry = self._cache.get(key) or {"variants": [], "cursor": 0}
+        entry["expires"] = time.time() + self.ttl
+        entry["replies"] = entry.get("replies", len(entry["variants"])) + 1
+
+        variants = entry["variants"]
+        if all(v[1] != value[1] for v in variants):
+            variants.append(tuple(value))
+            if len(variants) > self.max_variants:
+                variants.pop(0)
+        self._cache.set(key, entry, ttl=self.ttl)
+
+    def _count(self, hits=0, misses=0):
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    def clear(self):
+        self._cache.clear()
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """캐시 적중률 통계를 반환합니다."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / total) if total else 0.0,
+            }
@@ -3,43 +3,248 @@
 # 설명        : Google Maps Places API를 사용하여 지정된 음식과 위치 기준으로 근처 음식점을 검색하는 유틸 모듈
 # 주요 기능   :
 #   1) .env 파일에서 GOOGLE_MAPS_API_KEY 로드
-#   2) find_restaurant_nearby 함수로 음식 및 위치 기준 첫 번째 검색 결과 반환
-# 요구 모듈   : requests, python-dotenv, os
+#   2) find_restaurants_nearby 함수로 검색 결과 전체를 평점·리뷰 수·거리 기준으로 정렬한 상위 N개 반환
+#      (위치는 LocationResolver로 좌표 변환 후 반경 검색, 음식 + 표준 위치 이름 단위로 캐시하여
+#       "다른 식당" 요청이나 표기만 다른 위치("강남", "강남구 근처")에서 API를 다시 호출하지 않음)
+#   3) fetch_details 함수로 상위 N개의 영업시간·전화번호를 한 번에 동시 조회 (place_id 단위로 캐시)
+#   4) find_restaurant_nearby 함수로 1순위 결과를 기존 dict 형식으로 반환
+#   5) find_restaurants_many 함수로 여러 (음식, 위치) 검색을 한 번에 처리
+#      (같은 검색은 한 번만, 캐시는 한 번에 조회, 캐시에 없는 검색만 동시에 API 호출)
+#   (검색 결과·상세 정보 캐시는 공유 캐시(cache.Cache)를 사용하므로 여러 워커가 함께 재사용)
+# 요구 모듈   : requests, python-dotenv, cache, os, dataclasses, concurrent.futures, math
 # -----------------------------------------------------------------------------------
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+import math
 import requests
 import os
 from dotenv import load_dotenv
+from cache import Cache
+from Ai.LocationResolver import resolve_location
 
 load_dotenv()
 GOOGLE_MAPS_API_KEY = os.getenv("GOOGLE_MAPS_API_KEY")
 
-def find_restaurant_nearby(food, location="서울, 경기"):
-    endpoint = "https://maps.googleapis.com/maps/api/place/textsearch/json"
-    params = {
-        "query": f"{location} 근처 {food} 맛집",
-        "key": GOOGLE_MAPS_API_KEY,
-        "language": "ko"
-    }
-    
-    print("🔍 검색 쿼리:", params["query"])
-
-    res = requests.get(endpoint, params=params)
-    results = res.json()
+RESTAURANT_CACHE_TTL = int(os.getenv("RESTAURANT_CACHE_TTL", "3600"))
+PLACE_DETAILS_TTL = int(os.getenv("PLACE_DETAILS_TTL", "86400"))
+
+_pool = ThreadPoolExecutor(max_workers=5, thread_name_prefix="place-details")
+_search_pool = ThreadPoolExecutor(max_workers=int(os.getenv("PLACE_SEARCH_WORKERS", "5")), thread_name_prefix="place-search")
+_http = requests.Session()
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 1) Restaurant 레코드
+#    - 검색 결과 한 건을 담는 가벼운 레코드 (__slots__)
+# ────────────────────────────────────────────────────────────────────────────────────
+@dataclass(slots=True)
+class Restaurant:
+    name: str
+    address: str
+    latitude: float
+    longitude: float
+    rating: float = None
+    reviews: int = None
+    place_id: str = None
+    distance_km: float = None
+    hours: list = None
+    phone: str = None
+
+    def to_dict(self):
+        return asdict(self)
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 2) 정렬 기준
+#    - 평점은 리뷰 수로 보정(베이지안 평균)하여 리뷰가 적은 만점 가게가 과대평가되지 않게 함
+#    - 기준 좌표(origin)가 있으면 1km당 DISTANCE_PENALTY만큼 감점
+# ────────────────────────────────────────────────────────────────────────────────────
+PRIOR_RATING = 3.5
+PRIOR_REVIEWS = 50
+DISTANCE_PENALTY = 0.1
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 6371 * 2 * math.asin(math.sqrt(a))
 
-    if results.get("status") == "OK" and results["results"]:
-        place = results["results"][0]
-        
-        print("📍 검색된 장소:", place.get("name"))
-        print("🗺️  좌표:", place["geometry"]["location"]["lat"], place["geometry"]["location"]["lng"])
-        
-        return {
-            "name": place.get("name"),
-            "address": place.get("formatted_address"),
-            "latitude": place["geometry"]["location"]["lat"],
-            "longitude": place["geometry"]["location"]["lng"],
-            "rating": place.get("rating"),
-            "reviews": place.get("user_ratings_total"),
-            "place_id":place.get("place_id")
+def score(restaurant):
+    reviews = restaurant.reviews or 0
+    rating = restaurant.rating or PRIOR_RATING
+    weighted = (reviews * rating + PRIOR_REVIEWS * PRIOR_RATING) / (reviews + PRIOR_REVIEWS)
+    if restaurant.distance_km is not None:
+        weighted -= DISTANCE_PENALTY * restaurant.distance_km
+    return weighted
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 3) 검색 결과·상세 정보 캐시
+#    - 검색 결과에는 상세 정보를 넣지 않고, 상세 정보는 place_id 단위로 따로 저장
+#      (다른 음식 검색에 같은 식당이 나와도 다시 조회하지 않음)
+# ────────────────────────────────────────────────────────────────────────────────────
+_search_cache = Cache("places", ttl=RESTAURANT_CACHE_TTL,  # (food, location, origin) -> List[Restaurant]
+                      encode=lambda restaurants: [r.to_dict() for r in restaurants],
+                      decode=lambda rows: [Restaurant(**row) for row in rows])
+_details_cache = Cache("place_details", ttl=PLACE_DETAILS_TTL, decode=tuple)  # place_id -> (phone, hours)
+
+def _apply_cached_details(restaurants):
+    # 여러 검색 결과를 합쳐 넘기면 같은 식당이 여러 번 들어 있을 수 있음
+    pending = {}
+    for r in restaurants:
+        if r.place_id and r.phone is None and r.hours is None:
+            pending.setdefault(r.place_id, []).append(r)
+    for place_id, (phone, hours) in _details_cache.get_many(pending).items():
+        for r in pending[place_id]:
+            r.phone, r.hours = phone, hours
+    return restaurants
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 4) find_restaurants_nearby 함수
+#    - Args   :
+#        food (str): 음식 이름
+#        location (str): 검색 위치 (자유 입력)
+#        limit (int): 반환할 최대 식당 수
+#        origin (tuple): 거리 계산 기준 좌표 (lat, lng), 없으면 변환된 위치의 좌표 사용
+#    - 위치를 좌표로 변환하지 못하면 기존처럼 위치 문자열로 텍스트 검색
+#    - Returns:
+#        List[Restaurant]: 점수 순으로 정렬된 식당 목록 (이미 조회한 상세 정보는 채워져 있음)
+# ────────────────────────────────────────────────────────────────────────────────────
+def _search_key(food, location, resolved, origin):
+    return (food.strip(), resolved.name if resolved else " ".join(location.split()), origin)
+
+def find_restaurants_nearby(food, location="서울, 경기", limit=5, origin=None):
+    resolved = resolve_location(location)
+    if origin is None and resolved:
+        origin = (resolved.lat, resolved.lng)
+
+    key = _search_key(food, location, resolved, origin)
+    cached = _search_cache.get(key)
+    if cached is not None:
+        return _apply_cached_details(cached[:limit])
+    return _apply_cached_details(_search_places(food, location, resolved, origin, key)[:limit])
+
+def _search_places(food, location, resolved, origin, key):
+    """Places API로 검색해 점수 순 전체 목록을 캐시에 저장하고 반환합니다."""
+    if resolved:
+        endpoint = "https://maps.googleapis.com/maps/api/place/nearbysearch/json"
+        params = {
+            "location": f"{resolved.lat},{resolved.lng}",
+            "radius": resolved.radius,
+            "keyword": food,
+            "type": "restaurant",
+            "key": GOOGLE_MAPS_API_KEY,
+            "language": "ko"
+        }
+        print("🔍 반경 검색:", resolved.name, food)
+    else:
+        endpoint = "https://maps.googleapis.com/maps/api/place/textsearch/json"
+        params = {
+            "query": f"{location} 근처 {food} 맛집",
+            "key": GOOGLE_MAPS_API_KEY,
+            "language": "ko"
         }
+        print("🔍 검색 쿼리:", params["query"])
+
+    res = _http.get(endpoint, params=params, timeout=10)
+    results = res.json()
+
+    restaurants = []
+    if results.get("status") == "OK":
+        for place in results.get("results", []):
+            lat = place["geometry"]["location"]["lat"]
+            lng = place["geometry"]["location"]["lng"]
+            restaurants.append(Restaurant(
+                name=place.get("name"),
+                address=place.get("formatted_address") or place.get("vicinity"),
+                latitude=lat,
+                longitude=lng,
+                rating=place.get("rating"),
+                reviews=place.get("user_ratings_total"),
+                place_id=place.get("place_id"),
+                distance_km=round(haversine_km(origin[0], origin[1], lat, lng), 2) if origin else None,
+            ))
+        restaurants.sort(key=score, reverse=True)
+
+    # "ZERO_RESULTS"도 캐시하여 같은 검색을 반복하지 않음 (오류 응답은 캐시하지 않음)
+    if results.get("status") in ("OK", "ZERO_RESULTS"):
+        _search_cache.set(key, restaurants)
+    return restaurants
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 5) fetch_details 함수
+#    - 역할: 아직 상세 정보가 없는 식당들의 영업시간·전화번호를 Place Details API로 동시에 조회
+#            (결과는 place_id 단위로 캐시되어 이후 요청의 find_restaurants_nearby가 채워 줌)
+# ────────────────────────────────────────────────────────────────────────────────────
+def fetch_details(restaurants):
+    _apply_cached_details(restaurants)
+    pending = [r for r in restaurants if r.place_id and r.phone is None and r.hours is None]
+    if not pending:
+        return restaurants
+
+    def fetch(restaurant):
+        res = _http.get(
+            "https://maps.googleapis.com/maps/api/place/details/json",
+            params={
+                "place_id": restaurant.place_id,
+                "fields": "formatted_phone_number,opening_hours",
+                "key": GOOGLE_MAPS_API_KEY,
+                "language": "ko",
+            },
+            timeout=10,
+        )
+        return res.json().get("result", {})
+
+    for restaurant, future in [(r, _pool.submit(fetch, r)) for r in pending]:
+        try:
+            detail = future.result()
+        except Exception as e:
+            print(f"상세 정보 조회 실패 ({restaurant.name}): {e}")
+            continue
+        restaurant.phone = detail.get("formatted_phone_number", "")
+        restaurant.hours = detail.get("opening_hours", {}).get("weekday_text", [])
+        _details_cache.set(restaurant.place_id, (restaurant.phone, restaurant.hours))
+    return restaurants
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 6) find_restaurant_nearby 함수
+#    - 역할: 1순위 식당을 기존과 같은 dict 형식으로 반환 (없으면 None)
+# ────────────────────────────────────────────────────────────────────────────────────
+def find_restaurant_nearby(food, location="서울, 경기"):
+    restaurants = find_restaurants_nearby(food, location, limit=1)
+    if not restaurants:
+        return None
+
+    place = restaurants[0]
+    print("📍 검색된 장소:", place.name)
+    print("🗺️  좌표:", place.latitude, place.longitude)
+    return place.to_dict()
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 7) find_restaurants_many 함수
+#    - Args   :
+#        queries (List[Tuple[str, str]]): (음식, 위치) 목록 (중복 가능)
+#        limit (int): 검색마다 반환할 최대 식당 수
+#    - 위치는 서로 다른 위치마다 한 번만 변환하고, 캐시 키가 같은 검색(표기만 다른 위치 포함)은 한 번만 실행
+#    - 캐시는 get_many로 한 번에 조회하고, 캐시에 없는 검색만 스레드 풀에서 동시에 API 호출
+#    - Returns:
+#        Dict[Tuple[str, str], List[Restaurant] | None]: 입력 (음식, 위치)별 결과 (검색 실패 시 None)
+# ────────────────────────────────────────────────────────────────────────────────────
+def find_restaurants_many(queries, limit=5):
+    queries = list(dict.fromkeys(queries))
+    locations = {location: resolve_location(location) for location in dict.fromkeys(location for _, location in queries)}
+
+    searches, key_of = {}, {}
+    for food, location in queries:
+        resolved = locations[location]
+        origin = (resolved.lat, resolved.lng) if resolved else None
+        key = key_of[(food, location)] = _search_key(food, location, resolved, origin)
+        searches.setdefault(key, (food, location, resolved, origin))
+
+    found = _search_cache.get_many(searches)
+    futures = {key: _search_pool.submit(_search_places, *args, key) for key, args in searches.items() if key not in found}
+    for key, future in futures.items():
+        try:
+            found[key] = future.result()
+        except Exception as e:
+            print(f"식당 검색 실패 ({key[0]}, {key[1]}): {e}")
 
-    return None
\ No newline at end of file
+    results = {query: found[key][:limit] if key in found else None for query, key in key_of.items()}
+    _apply_cached_details([r for restaurants in results.values() if restaurants for r in restaurants])
+    return results
@@ -0,0 +1,66 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : TaskExecutor.py
+# 설명        : DMM이 분류한 여러 태스크를 동시에 실행하고 원래 순서대로 결과를 모으는 모듈
+# 주요 기능   :
+#   1) 공용 스레드 풀에서 태스크를 동시에 실행 (전체 지연 = 태스크 지연의 합 → 최댓값)
+#   2) 태스크별 마감 시간(timeout) 적용 - 태스크가 실제로 실행을 시작한 시각부터 계산
+#      (풀이 바빠 대기 중인 태스크는 대기 시간도 timeout까지만 허용)
+#   3) 마감 시간을 넘긴 태스크는 취소(future.cancel)하고 안내 문구로 대체하여 부분 결과 반환
+# 요구 모듈   : concurrent.futures, os, time
+# -----------------------------------------------------------------------------------
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import os
+import time
+
+TaskTimeout = float(os.getenv("TASK_TIMEOUT", "20"))
+
+_pool = ThreadPoolExecutor(max_workers=int(os.getenv("TASK_WORKERS", "8")), thread_name_prefix="dmm-task")
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 1) run_tasks 함수
+#    - Args   :
+#        tasks (List[str]): 실행할 태스크 목록 ('<func> <args>')
+#        handler (Callable[[str], str]): 태스크 하나를 실행하고 응답 문자열을 반환하는 함수
+#        timeout (float): 태스크마다 허용할 최대 실행 시간(초)
+#                         (실행을 시작하기 전 대기 시간도 따로 timeout까지 허용)
+#    - Returns:
+#        List[str]: 입력 순서와 같은 순서의 응답 목록 (시간 초과·오류는 안내 문구)
+# ────────────────────────────────────────────────────────────────────────────────────
+def run_tasks(tasks, handler, timeout=None):
+    if timeout is None:
+        timeout = TaskTimeout
+    submitted = time.monotonic()
+    started = {}  # 태스크 번호 -> 실행 시작 시각
+
+    def run(index, task):
+        started[index] = time.monotonic()
+        return _run_one(handler, task)
+
+    futures = {_pool.submit(run, index, task): index for index, task in enumerate(tasks)}
+    results = [None] * len(tasks)
+
+    def deadline(future):
+        return started.get(futures[future], submitted) + timeout
+
+    pending = set(futures)
+    while pending:
+        now = time.monotonic()
+        for future in [f for f in pending if not f.done() and deadline(f) <= now]:
+            # 대기 중이면 실행하지 않도록 취소하고, 이미 실행 중인 스레드는 중단할 수 없으므로 결과를 버립니다.
+            future.cancel()
+            pending.discard(future)
+            results[futures[future]] = f"'{tasks[futures[future]]}' 작업이 제한 시간 안에 끝나지 않았습니다."
+        if not pending:
+            break
+        done, pending = wait(pending, timeout=max(min(map(deadline, pending)) - now, 0), return_when=FIRST_COMPLETED)
+        for future in done:
+            results[futures[future]] = future.result()
+    return results
+
+def _run_one(handler, task):
+    try:
+        return handler(task)
+    except Exception as e:
+        print(f"태스크 실행 오류 ({task}): {e}")
+        return f"'{task}' 작업을 처리하지 못했습니다."
@@ -0,0 +1,145 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : WebSearch.py
+# 설명        : 실시간 검색(RealtimeSearchEngine)에서 사용하는 검색 서브시스템
+# 주요 기능   :
+#   1) 교체 가능한 검색 제공자 (구글 검색 / 로컬 fixture)
+#   2) 정규화된 질의 + 결과 개수 기준 결과 캐시 (공유 캐시 사용, 뉴스는 짧은 TTL, 음악은 긴 TTL)
+#      크기 제한은 캐시 백엔드가 담당 (memory: 바이트 예산 LRU, sqlite: 최대 항목 수, redis: 서버 설정)
+#   3) 이 프로세스에 동시에 들어온 같은 질의는 한 번만 요청 (검색 중인 질의만 보관하고 끝나면 바로 제거)
+#      여러 realtime 태스크의 검색은 IntegratedAI가 TaskExecutor로 동시에 실행 (search는 스레드 안전)
+#   4) 프롬프트에 넣을 검색 결과를 토큰 예산에 맞게 잘라 포맷팅
+# 요구 모듈   : googlesearch(구글 제공자 사용 시), cache, collections, concurrent.futures, json, os, re, threading
+# -----------------------------------------------------------------------------------
+
+from collections import namedtuple
+from concurrent.futures import Future
+from json import load
+import os
+import re
+import threading
+from cache import Cache
+
+SearchResult = namedtuple("SearchResult", ["title", "description", "url"])
+
+NEWS_KEYWORDS = ["뉴스", "소식", "속보", "오늘", "날씨", "실시간", "주가", "시세", "환율"]
+MUSIC_KEYWORDS = ["노래", "음악", "곡", "뮤직", "youtube", "앨범"]
+
+NEWS_TTL = int(os.getenv("SEARCH_NEWS_TTL", "300"))
+MUSIC_TTL = int(os.getenv("SEARCH_MUSIC_TTL", "86400"))
+DEFAULT_TTL = int(os.getenv("SEARCH_DEFAULT_TTL", "3600"))
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 1) 검색 제공자
+#    - search(query, num_results) -> List[SearchResult] 형태를 따르면 어떤 객체든 사용 가능
+# ────────────────────────────────────────────────────────────────────────────────────
+class GoogleSearchProvider:
+    def search(self, query, num_results=5):
+        from googlesearch import search
+
+        return [
+            SearchResult(r.title, r.description, r.url)
+            for r in search(query, advanced=True, num_results=num_results)
+        ]
+
+class FixtureSearchProvider:
+    """정규화된 질의 → 결과 목록 사전(또는 JSON 파일)으로 동작하는 로컬 제공자. (테스트·오프라인용)"""
+    def __init__(self, fixtures=None, path=None):
+        if path:
+            with open(path, "r", encoding="utf-8") as f:
+                fixtures = load(f)
+        self.fixtures = {normalize_query(k): v for k, v in (fixtures or {}).items()}
+        self.calls = 0
+
+    def search(self, query, num_results=5):
+        self.calls += 1
+        items = self.fixtures.get(normalize_query(query), [])
+        return [SearchResult(i.get("title", ""), i.get("description", ""), i.get("url", "")) for i in items[:num_results]]
+
+_provider = FixtureSearchProvider(path=os.getenv("SEARCH_FIXTURES")) if os.getenv("SEARCH_FIXTURES") else GoogleSearchProvider()
+
+def set_provider(provider):
+    """검색 제공자를 교체하고 캐시를 비웁니다."""
+    global _provider
+    _provider = provider
+    clear_cache()
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 2) 질의 정규화 및 TTL 정책
+# ────────────────────────────────────────────────────────────────────────────────────
+def normalize_query(query):
+    query = re.sub(r"[^\w\s:.]", " ", query.lower())
+    return " ".join(query.split())
+
+def ttl_for(query):
+    if any(k in query for k in NEWS_KEYWORDS):
+        return NEWS_TTL
+    if any(k in query for k in MUSIC_KEYWORDS):
+        return MUSIC_TTL
+    return DEFAULT_TTL
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 3) 결과 캐시 및 검색 함수
+#    - search: 캐시를 먼저 확인하고, 없으면 제공자에게 요청 (이 프로세스에 동시에 들어온 같은 질의는 한 번만 요청)
+#      결과 개수(num_results)가 다르면 다른 항목 (적게 요청해 캐시된 목록을 더 많이 요청한 쪽에 주지 않음)
+#    - _inflight: 지금 검색 중인 질의만 담김 (검색이 끝나면 성공·실패와 관계없이 제거되므로 동시 요청 수 이상 커지지 않음)
+# ────────────────────────────────────────────────────────────────────────────────────
+_cache = Cache("web_search", ttl=DEFAULT_TTL,  # (normalized query, num_results) -> List[SearchResult]
+               encode=lambda results: [list(r) for r in results],
+               decode=lambda rows: [SearchResult(*row) for row in rows])
+_inflight = {}  # (normalized query, num_results) -> Future
+_inflight_lock = threading.Lock()
+
+def clear_cache():
+    _cache.clear()
+
+def search(query, num_results=5):
+    normalized = normalize_query(query)
+    key = (normalized, num_results)
+    cached = _cache.get(key)
+    if cached is not None:
+        return cached
+    with _inflight_lock:
+        # 같은 질의가 이미 검색 중이면 그 결과를 기다림 (중복 요청 방지)
+        pending = _inflight.get(key)
+        if pending is None:
+            _inflight[key] = future = Future()
+
+    if pending is not None:
+        return pending.result()
+
+    try:
+        results = _provider.search(query, num_results=num_results)
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(results)
+        _cache.set(key, results, ttl=ttl_for(normalized))
+        return results
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 4) 결과 포맷팅 함수
+#    - 역할: 검색 결과를 프롬프트용 문자열로 만들되, 대략적인 토큰 수가 예산을 넘지 않도록 자름
+#    - 토큰 수는 글자 수 / 2 로 근사 (한국어·영어 혼합 기준)
+# ────────────────────────────────────────────────────────────────────────────────────
+CHARS_PER_TOKEN = 2
+
+def format_results(query, results, token_budget=400):
+    header = f"'{query}'에 대한 구글 검색 결과:\n[start]\n"
+    budget = token_budget * CHARS_PER_TOKEN - len(header) - len("[end]")
+    per_result = max(budget // max(len(results), 1), 0)
+
+    Answer = header
+    for r in results:
+        entry = f"제목: {r.title}\n설명: {r.description}\n\n"
+        if len(entry) > per_result:
+            entry = entry[:max(per_result - 3, 0)].rstrip() + "…\n\n"
+        if len(entry) > budget:
+            break
+        Answer += entry
+        budget -= len(entry)
+    Answer += "[end]"
+    return Answer
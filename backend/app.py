@@ -9,32 +9,42 @@
 # -----------------------------------------------------------------------------------
 
 import os
+import asyncio
+import json
+import math
+import zlib
 import uuid
 import datetime
 import re
 from typing import Optional, List
+from contextlib import asynccontextmanager
 import random
 from urllib.parse import unquote
 
-from fastapi import FastAPI, Request, Response, Depends, Cookie, Form, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, Request, Response, Depends, Cookie, Form, HTTPException, BackgroundTasks
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 import jwt
-import bcrypt
+import orjson
 from pydantic import BaseModel, Field, ConfigDict
 from sqlalchemy.orm import Session
 
 # 새로 만든 모듈들을 import 합니다.
-import crud, models
-from database import engine, get_db
+import crud, models, search_index, passwords, cache, rate_limit
+from idempotency import IdempotencyStore, KeyReusedError
+from session_cache import session_log_cache
+from database import engine, get_db, SessionLocal
 
 # AI 관련 모듈 import
 from Ai.Logic import (
     classify_emotion_and_reply_with_gpt, is_emotion_related, 
-    is_greeting, is_thanks, is_recommend
+    is_greeting, is_thanks, is_recommend, is_another_place, match_emotion_keywords, response_cache, RECOMMEND_FOODS
 )
-from Ai.SearchContent import find_restaurant_nearby
+from Ai.SearchContent import find_restaurant_nearby, find_restaurants_nearby, find_restaurants_many, fetch_details
+from Ai.RecommendBuffer import recommend_buffer
 
 # ────────────────────────────────────────────────
 # 1) 환경 변수 & DB 테이블 생성
@@ -43,14 +53,80 @@ load_dotenv()
 ENV = os.getenv("APP_ENV", "development")
 SECRET_KEY = os.getenv("SECRET_KEY", "capstone-secret")
 
+# 감정 분석 시 GPT에 넘길 최근 대화 수 (Ai/Conversation.py의 대화 이력 길이와 같은 설정)
+CHAT_HISTORY_LIMIT = int(os.getenv("CHAT_HISTORY_LIMIT", "20"))
+
+# 재시도된 /get_response 요청이 LLM 호출·로그 저장을 반복하지 않도록 Idempotency-Key별 응답을 잠시 보관
+idempotency_store = IdempotencyStore(ttl=int(os.getenv("IDEMPOTENCY_TTL", "300")))
+
+# /get_response 요청 수 제한(사용자·IP별, GPT·Places 요청과 가벼운 요청 따로)과
+# GPT·Places를 쓰는 요청의 동시 실행 수 제한 (기다리는 요청은 사용자별로 번갈아 처리)
+inbound_limiter = rate_limit.InboundLimiter()
+upstream_scheduler = rate_limit.FairScheduler(
+    capacity=int(os.getenv("UPSTREAM_CONCURRENCY", "8")),
+    max_queued=int(os.getenv("UPSTREAM_QUEUE_PER_USER", "2")),
+)
+
+# /api/recommendations 한 번에 받을 최대 검색 수와 GPT로 음식을 정할 최대 감정 수
+# (감정 하나와 서로 다른 Places 검색 하나가 각각 GPT·Places 요청 하나만큼 예산을 쓰므로,
+#  합이 요청 수 제한 예산(RATE_USER_LLM·RATE_IP_LLM)을 넘는 요청은 422로 거절)
+RECOMMEND_BATCH_MAX = int(os.getenv("RECOMMEND_BATCH_MAX", "20"))
+RECOMMEND_MAX_EMOTIONS = int(os.getenv("RECOMMEND_MAX_EMOTIONS", "5"))
+
+# 오래 사용되지 않은 세션의 로그를 압축 보관하는 작업 주기(초, 0이면 실행하지 않음)
+ARCHIVE_INTERVAL = int(os.getenv("ARCHIVE_INTERVAL", "3600"))
+
+# /api/metrics를 볼 수 있는 관리자 이메일 (쉼표로 구분, 비어 있으면 아무도 볼 수 없음)
+ADMIN_EMAILS = {email.strip().lower() for email in os.getenv("ADMIN_EMAILS", "").split(",") if email.strip()}
+
 # SQLAlchemy 모델을 기반으로 DB에 모든 테이블을 생성합니다.
 # 서버가 시작될 때 한 번만 실행됩니다.
 models.Base.metadata.create_all(bind=engine)
+# create_all은 이미 있는 테이블에 새로 정의된 인덱스를 추가하지 않으므로 따로 만듭니다.
+for table in models.Base.metadata.sorted_tables:
+    for index in table.indexes:
+        index.create(bind=engine, checkfirst=True)
+# 외래 키의 ON DELETE CASCADE도 마찬가지로, 기존 DB(PostgreSQL 등)의 제약이 모델과 다르면 다시 만듭니다.
+if models.sync_foreign_keys(engine):
+    print("🔧 외래 키 ON DELETE 동작을 모델에 맞게 변경")
+search_index.init_search_index(engine)
+with SessionLocal() as _db:
+    if crud.index_archived_sessions(_db):
+        print("🔧 보관된 세션의 검색용 본문 생성")
 
 # ────────────────────────────────────────────────
-# 2) FastAPI 앱 생성 & CORS
+# 2) 백그라운드 보관 작업 & FastAPI 앱 생성 & CORS
 # ────────────────────────────────────────────────
-app = FastAPI()
+def archive_idle_sessions():
+    db = SessionLocal()
+    try:
+        archived = crud.archive_idle_sessions(db)
+    finally:
+        db.close()
+    if archived:
+        print(f"🗄️ 오래된 세션 {archived}개 보관")
+    return archived
+
+async def archive_loop():
+    # 워커가 여러 개면 같은 시각에 실행되지 않도록 첫 실행 시각을 흩뜨림
+    await asyncio.sleep(random.uniform(0, min(ARCHIVE_INTERVAL, 300)))
+    while True:
+        try:
+            # 한 번에 ARCHIVE_BATCH_SIZE개씩, 밀린 세션이 없어질 때까지 보관
+            while await run_in_threadpool(archive_idle_sessions) >= crud.ARCHIVE_BATCH_SIZE:
+                pass
+        except Exception as e:
+            print(f"세션 보관 작업 실패: {e}")
+        await asyncio.sleep(ARCHIVE_INTERVAL)
+
+@asynccontextmanager
+async def lifespan(app):
+    task = asyncio.create_task(archive_loop()) if ARCHIVE_INTERVAL > 0 else None
+    yield
+    if task:
+        task.cancel()
+
+app = FastAPI(lifespan=lifespan)
 
 origins = [
     "http://localhost:5173",
@@ -65,6 +141,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 로그가 많은 세션 등 큰 응답은 압축해서 보냅니다.
+app.add_middleware(GZipMiddleware, minimum_size=int(os.getenv("GZIP_MIN_SIZE", "1024")))
+
+# 비밀번호 작업 대기열이 가득 차면 로그인·회원가입만 503으로 거절합니다. (채팅 요청에는 영향 없음)
+@app.exception_handler(passwords.PasswordBusyError)
+async def password_busy_handler(request: Request, exc: passwords.PasswordBusyError):
+    return JSONResponse(status_code=503, content={"detail": "요청이 많아 잠시 후 다시 시도해 주세요."}, headers={"Retry-After": "1"})
+
+# 요청 수 제한을 넘으면 처리하지 않고 바로 429로 거절합니다.
+@app.exception_handler(rate_limit.RateLimited)
+async def rate_limited_handler(request: Request, exc: rate_limit.RateLimited):
+    return JSONResponse(status_code=429, content={"detail": "요청이 너무 많아요. 잠시 후 다시 시도해 주세요."},
+                        headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))})
+
 # ────────────────────────────────────────────────
 # 3) 헬퍼 및 인증 의존성 함수
 # ────────────────────────────────────────────────
@@ -86,6 +176,57 @@ def current_user_from_token(token: Optional[str] = Cookie(None), db: Session = D
     if not user: raise HTTPException(status_code=401, detail="User not found")
     return user
 
+def admin_user(user: models.User = Depends(current_user_from_token)):
+    """로그인한 사용자가 ADMIN_EMAILS에 있는 관리자인지 확인하는 의존성 함수."""
+    if user.email.lower() not in ADMIN_EMAILS: raise HTTPException(status_code=403, detail="Admin only")
+    return user
+
+def _isoformat(value):
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__}은(는) JSON으로 바꿀 수 없습니다.")
+
+def rows_response(rows, **extra):
+    """컬럼 Row(또는 같은 필드의 namedtuple) 목록을 jsonable_encoder·Pydantic 검증 없이 orjson으로 바로 직렬화합니다.
+    시각은 orjson의 RFC 3339 형식 대신 jsonable_encoder와 같은 isoformat() 문자열로 내보냅니다. (응답 형식 유지)"""
+    body = orjson.dumps([{**row._asdict(), **extra} for row in rows], default=_isoformat, option=orjson.OPT_PASSTHROUGH_DATETIME)
+    return Response(body, media_type="application/json")
+
+def conditional_response(request: Request, etag: str, build):
+    """If-None-Match가 현재 ETag와 같으면 데이터를 조회하지 않고 304를 반환하고, 아니면 build()의 응답에 ETag를 붙입니다."""
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    candidates = [tag.strip().removeprefix("W/") for tag in request.headers.get("if-none-match", "").split(",")]
+    if etag.removeprefix("W/") in candidates or "*" in candidates:
+        return Response(status_code=304, headers=headers)
+    response = build()
+    response.headers.update(headers)
+    return response
+
+def bookmark_out(bookmark):
+    return {"id": bookmark.id, "user_id": bookmark.user_id, "name": bookmark.name, "url": bookmark.url, "created_at": bookmark.created_at}
+
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+def ndjson_chunks(records, compress=False, chunk_bytes=EXPORT_CHUNK_BYTES):
+    """레코드를 NDJSON 줄로 바꿔 약 chunk_bytes 단위로 내보냅니다. (compress=True면 gzip 스트림)"""
+    gzip = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+    buffer, size = [], 0
+    for record in records:
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        buffer.append(line)
+        size += len(line)
+        if size >= chunk_bytes:
+            data = b"".join(buffer)
+            buffer, size = [], 0
+            data = gzip.compress(data) if gzip else data
+            if data:
+                yield data
+    data = b"".join(buffer)
+    if gzip:
+        data = gzip.compress(data) + gzip.flush()
+    if data:
+        yield data
+
 # ────────────────────────────────────────────────
 # 4) Pydantic 모델 정의 (API 입출력 데이터 형식)
 # ────────────────────────────────────────────────
@@ -104,6 +245,17 @@ class BookmarkCreate(BaseModel): name: str; url: str
 class BookmarkUpdate(BaseModel): id: int; name: str; url: str
 class BookmarkDelete(BaseModel): bookmark_id: int
 
+class RecommendQuery(BaseModel):
+    food: Optional[str] = None      # 음식 이름, 없으면 emotion으로 음식을 정함
+    emotion: Optional[str] = None   # 예: "우울해", "스트레스"
+    location: Optional[str] = None  # 없으면 RecommendBatch.location
+
+class RecommendBatch(BaseModel):
+    items: List[RecommendQuery] = []
+    location: Optional[str] = None  # 위치 하나 + 후보 음식(foods) 형식, items의 기본 위치로도 사용
+    foods: List[str] = []
+    limit: int = Field(5, ge=1, le=20)  # 검색마다 반환할 최대 식당 수
+
 # ────────────────────────────────────────────────
 # 5) 인증 API
 # ────────────────────────────────────────────────
@@ -113,7 +265,10 @@ async def api_signup(data: UserCreate, db: Session = Depends(get_db)):
     db_user = crud.get_user_by_email(db, email=data.email)
     if db_user: raise HTTPException(status_code=409, detail="이미 등록된 이메일입니다.")
     
-    hashed_password = bcrypt.hashpw(data.password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    # bcrypt는 CPU를 오래 쓰므로 이벤트 루프 밖의 전용 프로세스 풀에서 실행합니다.
+    # 해시를 기다리는 동안 DB 연결을 잡고 있지 않도록 먼저 연결 풀에 돌려줍니다.
+    db.close()
+    hashed_password = await passwords.hash_password(data.password)
     user = crud.create_user(db=db, name=data.name, email=data.email, hashed_password=hashed_password)
     
     token = jwt.encode({"email": user.email, "exp": datetime.datetime.utcnow() + datetime.timedelta(hours=3)}, SECRET_KEY, algorithm="HS256")
@@ -122,11 +277,26 @@ async def api_signup(data: UserCreate, db: Session = Depends(get_db)):
     resp.set_cookie("token", token, httponly=True, path="/", secure=secure, samesite="none" if secure else "lax")
     return resp
 
+async def rehash_password(user_id: int, password: str):
+    """작업 비용(BCRYPT_ROUNDS)이 바뀐 경우 로그인 응답 후 새 비용으로 다시 해시하여 저장합니다."""
+    try:
+        hashed_password = await passwords.hash_password(password)
+    except passwords.PasswordBusyError:
+        return  # 대기열이 가득 차면 다음 로그인 때 다시 시도
+    db = SessionLocal()
+    try:
+        crud.update_password(db, user_id=user_id, hashed_password=hashed_password)
+    finally:
+        db.close()
+
 @app.post("/api/login")
-async def api_login(data: UserLogin, db: Session = Depends(get_db)):
+async def api_login(data: UserLogin, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
     user = crud.get_user_by_email(db, email=data.email)
-    if not user or not bcrypt.checkpw(data.password.encode('utf-8'), user.hashed_password.encode('utf-8')):
+    db.close()  # 비밀번호 확인을 기다리는 동안 DB 연결을 잡고 있지 않도록 반환 (로그인 폭주 시 연결 풀 고갈 방지)
+    if not user or not await passwords.verify_password(data.password, user.hashed_password):
         raise HTTPException(401, "이메일 또는 비밀번호가 틀렸습니다.")
+    if passwords.needs_rehash(user.hashed_password):
+        background_tasks.add_task(rehash_password, user.id, data.password)
     
     token = jwt.encode({"email": user.email, "exp": datetime.datetime.utcnow() + datetime.timedelta(hours=3)}, SECRET_KEY, algorithm="HS256")
     resp = JSONResponse({"success": True, "message": "로그인 성공", "data": {"id": user.id, "name": user.name, "email": user.email}})
@@ -162,8 +332,11 @@ async def api_delete_account(
 ):
     """현재 인증된 사용자의 계정을 삭제합니다."""
     
-    # 1. crud 모듈의 사용자 삭제 함수를 호출합니다.
-    crud.delete_user(db=db, user_id=user.id)
+    # 1. crud 모듈의 사용자 삭제 함수를 호출하고, 세션별 추천 버퍼도 비웁니다.
+    #    (데이터가 많은 사용자는 오래 걸릴 수 있으므로 이벤트 루프를 막지 않도록 스레드 풀에서 실행)
+    session_ids = crud.get_session_ids(db=db, user_id=user.id)
+    await run_in_threadpool(crud.delete_user, db=db, user_id=user.id)
+    recommend_buffer.discard(*session_ids)
     
     # 2. 탈퇴 성공 시, 로그아웃과 동일하게 클라이언트의 인증 쿠키를 삭제합니다.
     secure = os.getenv("APP_ENV") == "production"
@@ -184,13 +357,53 @@ async def api_delete_account(
 @app.post("/get_response")
 async def get_response(
     request: Request,
+    background_tasks: BackgroundTasks,
     message: str = Form(...),
     session_id: Optional[str] = Form(None),
     location: str = Form("서울"), 
     user: models.User = Depends(current_user_from_token), # SQLAlchemy 모델로 타입 변경
     db: Session = Depends(get_db) # 새로운 DB 세션 의존성으로 변경
 ):
+    # 인사·감사는 서버에서 바로 답하는 가벼운 요청, 나머지는 GPT·Places를 쓰는 요청으로 보고 예산을 따로 적용
+    kind = "cheap" if is_greeting(message.strip()) or is_thanks(message.strip()) else "llm"
+    ip = request.client.host if request.client else None
+
+    # Idempotency-Key 헤더가 있으면 같은 키의 재시도는 저장된 응답을 돌려주고,
+    # 첫 요청이 처리 중이면 그 결과를 기다립니다. (메시지 저장·LLM·식당 검색이 한 번만 실행됨)
+    key = request.headers.get("Idempotency-Key")
+    if not key:
+        return await run_answer(kind, ip, background_tasks, message, session_id, location, user, db)
+
+    key = (user.id, key)
+    try:
+        future, owner = idempotency_store.claim(key, (message, session_id, location))
+    except KeyReusedError:
+        raise HTTPException(status_code=422, detail="다른 요청에 이미 사용된 Idempotency-Key입니다.")
+    if not owner:
+        return await asyncio.wrap_future(future)
+
+    try:
+        result = await run_answer(kind, ip, background_tasks, message, session_id, location, user, db)
+    except BaseException as e:
+        idempotency_store.fail(key, e)
+        raise
+    idempotency_store.complete(key, result)
+    return result
+
+async def run_answer(kind, ip, background_tasks, message, session_id, location, user, db):
+    """요청 수 제한을 확인하고 응답을 스레드에서 만듭니다. (GPT·Places 호출이 이벤트 루프를 막지 않음)"""
     user_id = user.id
+    await inbound_limiter.check_async(user_id, ip, kind)
+    if kind == "cheap":
+        return await run_in_threadpool(answer_message, background_tasks, message, session_id, location, user_id, db)
+
+    # 차례를 기다리는 동안 DB 연결을 잡고 있지 않도록 먼저 반환합니다. (세션은 다음 조회 때 다시 연결)
+    db.close()
+    async with upstream_scheduler.slot(user_id):
+        return await run_in_threadpool(answer_message, background_tasks, message, session_id, location, user_id, db)
+
+def answer_message(background_tasks, message, session_id, location, user_id, db):
+    """사용자 메시지를 저장하고 인사·추천·감정 분석 등 알맞은 응답을 만들어 저장·반환합니다."""
     if not session_id:
         # crud 모듈을 통해 함수 호출
         db_session = crud.create_session(db=db, user_id=user_id, title=(message[:30] or None))
@@ -212,13 +425,46 @@ async def get_response(
         crud.save_chat(db=db, session_id=session_id, user_id=user_id, message=reply, url=None, name=None, role="assistant")
         return {"message": reply, "createdAt": created_at}
 
+    def reply_with_restaurant(reply_text, restaurant, restaurants):
+        # 추천 식당 응답을 저장·반환하고, 상위 후보들의 상세 정보는 응답 후 한 번에 조회
+        map_url = f"http://googleusercontent.com/maps/google.com/0:{restaurant.get('place_id')}"
+        name = restaurant.get("name")
+        formatted = (
+            f"{reply_text}<br><br>"
+            f"추천 식당: <strong>{name}</strong><br>"
+            f"주소: {restaurant.get('address')}<br>"
+            f"평점: {restaurant.get('rating','정보 없음')}점"
+        )
+        recommend_buffer.mark_shown(session_id, restaurant.get("place_id"))
+        background_tasks.add_task(fetch_details, restaurants)
+        crud.save_chat(db=db, session_id=session_id, user_id=user_id, message=formatted, url=map_url, name=name, role="assistant")
+        return {
+            "message": formatted, "restaurant": restaurant, "restaurants": [r.to_dict() for r in restaurants],
+            "name": name, "url": map_url, "createdAt": created_at, "location": location,
+        }
+
+    # "다른 식당" 요청: 직전 추천 음식의 캐시된 검색 결과에서 아직 보여 주지 않은 식당을 제공
+    if is_another_place(text) and recommend_buffer.last_suggested(session_id):
+        food = recommend_buffer.last_suggested(session_id)
+        shown = recommend_buffer.shown(session_id)
+        restaurants = find_restaurants_nearby(food, location)
+        candidate = next((r for r in restaurants if r.place_id not in shown), None)
+        if candidate:
+            return reply_with_restaurant(f"{food} 맛집을 한 곳 더 알려드릴게요.", candidate.to_dict(), restaurants)
+        reply = f"근처에 더 추천할 '{food}' 식당이 없어요. '재추천'이라고 말씀해 주시면 다른 음식을 추천해 드릴게요."
+        crud.save_chat(db=db, session_id=session_id, user_id=user_id, message=reply, url=None, name=None, role="assistant")
+        return {"message": reply, "createdAt": created_at}
+
     # 감정 분석 또는 재추천 요청 처리
     if is_recommend(text) or is_emotion_related(text):
-        food, reply_text = None, None
+        food, reply_text, restaurant = None, None, None
         
         if is_emotion_related(text):
-            chat_history = crud.get_session_logs(db=db, session_id=session_id)
-            emotion, food, reply_text = classify_emotion_and_reply_with_gpt(text, chat_history=chat_history)
+            # 최근 대화는 메모리 캐시에서 가져옵니다. (방금 저장한 메시지도 포함)
+            chat_history = crud.get_recent_logs(db=db, session_id=session_id, limit=CHAT_HISTORY_LIMIT)
+            # 이 세션에서 이미 추천한 음식은 캐시된 후보에서도 건너뜀
+            recent_foods = list(recommend_buffer.suggested(session_id))
+            emotion, food, reply_text = classify_emotion_and_reply_with_gpt(text, recent_foods=recent_foods, chat_history=chat_history)
         
         if not food:
             if not is_recommend(text):
@@ -230,23 +476,26 @@ async def get_response(
                 crud.save_chat(db=db, session_id=session_id, user_id=user_id, message=fallback_reply, url=None, name=None, role="assistant")
                 return {"message": fallback_reply, "createdAt": created_at}
             
-            foods = ["김밥", "떡볶이", "비빔밥", "갈비탕", "파스타", "치킨"]
-            food = random.choice(foods)
+            # 직전 추천 후 미리 찾아 둔 후보가 있으면 바로 사용
+            prefetched = recommend_buffer.pop(session_id, location)
+            if prefetched:
+                food, restaurant = prefetched
+            else:
+                suggested = recommend_buffer.suggested(session_id)
+                food = random.choice([f for f in RECOMMEND_FOODS if f not in suggested] or RECOMMEND_FOODS)
             reply_text = f"그렇다면 {food}는 어떠세요?"
 
-        restaurant = find_restaurant_nearby(food, location) # Form으로 받은 location 사용
+        # 상위 N개 후보는 음식 + 위치 단위로 캐시되므로, prefetch된 음식이면 API를 다시 호출하지 않음
+        restaurants = find_restaurants_nearby(food, location) # Form으로 받은 location 사용
+        if restaurant is None and restaurants:
+            restaurant = restaurants[0].to_dict()
+
+        # 다음 재추천에 대비해 응답 후 백그라운드에서 후보 음식과 식당을 미리 찾아 둠
+        recommend_buffer.mark_suggested(session_id, food)
+        background_tasks.add_task(recommend_buffer.prefetch, session_id, location, RECOMMEND_FOODS, find_restaurant_nearby)
 
         if restaurant:
-            map_url = f"http://googleusercontent.com/maps/google.com/0:{restaurant.get('place_id')}"
-            name = restaurant.get("name")
-            formatted = (
-                f"{reply_text}<br><br>"
-                f"추천 식당: <strong>{name}</strong><br>"
-                f"주소: {restaurant.get('address')}<br>"
-                f"평점: {restaurant.get('rating','정보 없음')}점"
-            )
-            crud.save_chat(db=db, session_id=session_id, user_id=user_id, message=formatted, url=map_url, name=name, role="assistant")
-            return { "message": formatted, "restaurant": restaurant, "name": name, "url": map_url, "createdAt": created_at, "location": location}
+            return reply_with_restaurant(reply_text, restaurant, restaurants)
         else:
             reply = f"{reply_text}<br><br>아쉽지만 근처 '{food}' 식당을 찾지 못했어요."
             crud.save_chat(db=db, session_id=session_id, user_id=user_id, message=reply, url=None, name=None, role="assistant")
@@ -257,6 +506,84 @@ async def get_response(
     crud.save_chat(db=db, session_id=session_id, user_id=user_id, message=off_topic, url=None, name=None, role="assistant")
     return {"message": off_topic, "createdAt": created_at}
 
+# 지도·홈 화면용 추천을 한 번에 조회 (채팅 로그를 남기지 않음)
+#   - (음식 또는 감정, 위치) 목록 또는 위치 하나 + 후보 음식 목록을 받아 입력 순서대로 식당 목록 반환
+#   - 같은 감정은 GPT를 한 번만, 같은 검색은 Places를 한 번만 호출하고 모두 동시에 진행
+#   - 요청 수 제한은 GPT·Places 요청으로 보고, GPT로 정할 감정 수 + 서로 다른 검색 수만큼 예산을 씀
+@app.post("/api/recommendations")
+async def api_recommendations(
+    data: RecommendBatch,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    user: models.User = Depends(current_user_from_token),
+    db: Session = Depends(get_db)
+):
+    default_location = data.location or "서울"
+    items = [(food.strip(), None, default_location) for food in data.foods if food.strip()]
+    for item in data.items:
+        food, emotion = (item.food or "").strip() or None, (item.emotion or "").strip() or None
+        if not food and not emotion:
+            raise HTTPException(status_code=422, detail="food 또는 emotion이 필요합니다.")
+        items.append((food, emotion, item.location or default_location))
+    if not items:
+        raise HTTPException(status_code=422, detail="조회할 음식이나 감정이 없습니다.")
+    if len(items) > RECOMMEND_BATCH_MAX:
+        raise HTTPException(status_code=422, detail=f"한 번에 최대 {RECOMMEND_BATCH_MAX}개까지 조회할 수 있습니다.")
+
+    # 감정은 응답 캐시와 같은 기준(감정 키워드 집합)으로 묶어 묶음마다 GPT를 한 번만 호출
+    groups = {}
+    for food, emotion, _ in items:
+        if not food:
+            groups.setdefault(match_emotion_keywords(emotion) or emotion, emotion)
+    if len(groups) > RECOMMEND_MAX_EMOTIONS:
+        raise HTTPException(status_code=422, detail=f"감정은 한 번에 최대 {RECOMMEND_MAX_EMOTIONS}가지까지 조회할 수 있습니다.")
+
+    # 서로 다른 Places 검색 수 (감정은 묶음별로 음식 하나, 위치는 공백만 정리해 셈 → 실제 호출 수의 상한)
+    lookups = {(food or match_emotion_keywords(emotion) or emotion, " ".join(location.split())) for food, emotion, location in items}
+    cost = len(groups) + len(lookups)
+    if cost > inbound_limiter.max_cost("llm"):
+        raise HTTPException(status_code=422, detail=f"한 번에 조회하는 감정과 검색이 너무 많습니다. (최대 {inbound_limiter.max_cost('llm')}건)")
+
+    user_id = user.id
+    await inbound_limiter.check_async(user_id, request.client.host if request.client else None, "llm", cost=cost)
+    db.close()  # 로그를 저장하지 않으므로 DB 연결은 더 필요 없음
+    async with upstream_scheduler.slot(user_id):
+        return await recommend_batch(items, groups, data.limit, background_tasks)
+
+async def recommend_batch(items, groups, limit, background_tasks):
+    replies = await asyncio.gather(
+        *(run_in_threadpool(classify_emotion_and_reply_with_gpt, emotion) for emotion in groups.values()),
+        return_exceptions=True,
+    )
+    picked = {}  # 감정 묶음 -> (음식, 추천 이유)
+    for group, reply in zip(groups, replies):
+        if isinstance(reply, Exception):
+            print(f"감정 추천 실패 ({groups[group]}): {reply}")
+        elif reply[1]:
+            picked[group] = (reply[1], reply[2])
+
+    resolved = []  # (음식, 감정, 위치, 추천 이유)
+    for food, emotion, location in items:
+        reason = None
+        if not food:
+            food, reason = picked.get(match_emotion_keywords(emotion) or emotion, (None, None))
+        resolved.append((food, emotion, location, reason))
+    found = await run_in_threadpool(find_restaurants_many, [(food, location) for food, _, location, _ in resolved if food], limit)
+
+    results, shown = [], {}
+    for food, emotion, location, reason in resolved:
+        restaurants = found.get((food, location)) if food else None
+        result = {"food": food, "emotion": emotion, "location": location, "reason": reason,
+                  "restaurants": [r.to_dict() for r in restaurants or []]}
+        if restaurants is None:
+            result["error"] = "추천할 음식을 정하지 못했어요." if not food else "식당을 검색하지 못했어요."
+        for r in restaurants or []:
+            shown.setdefault(r.place_id, r)
+        results.append(result)
+    # 상세 정보(영업시간·전화번호)는 응답 후 한 번에 조회해 두어 다음 조회부터 채워짐
+    background_tasks.add_task(fetch_details, list(shown.values()))
+    return {"results": results}
+
 # ────────────────────────────────────────────────
 # 8) 채팅 세션 API
 # ────────────────────────────────────────────────
@@ -267,28 +594,69 @@ async def api_create_session(body: SessionCreate, user: models.User = Depends(cu
     return db_session
 
 @app.get("/api/sessions", response_model=List[SessionOut])
-async def api_read_sessions(user: models.User = Depends(current_user_from_token), db: Session = Depends(get_db)):
-    # crud 모듈의 함수를 사용하여 세션 목록 조회
-    return crud.get_sessions(db=db, user_id=user.id)
+async def api_read_sessions(request: Request, user: models.User = Depends(current_user_from_token), db: Session = Depends(get_db)):
+    # 버전이 같으면 304, 아니면 필요한 컬럼만 조회하여 바로 직렬화 (응답 형식은 SessionOut과 동일)
+    # ETag에 사용자 ID를 넣어, 같은 브라우저에서 계정을 바꿔도 다른 사용자의 캐시가 쓰이지 않게 합니다.
+    etag = f'W/"s{user.id}-{crud.get_version(db, crud.sessions_scope(user.id))}"'
+    return conditional_response(request, etag, lambda: rows_response(
+        crud.get_session_rows(db=db, user_id=user.id), last_message=None, last_date=None))
 
 @app.get("/api/sessions/{session_id}/logs")
-async def api_read_session_logs(session_id: str, user: models.User = Depends(current_user_from_token), db: Session = Depends(get_db)):
+async def api_read_session_logs(session_id: str, request: Request, limit: Optional[int] = None, user: models.User = Depends(current_user_from_token), db: Session = Depends(get_db)):
     # 소유권 확인
-    sessions = crud.get_sessions(db=db, user_id=user.id)
-    if session_id not in [s.id for s in sessions]:
+    if not crud.session_belongs_to(db=db, session_id=session_id, user_id=user.id):
         raise HTTPException(status_code=403, detail="권한이 없습니다.")
-    # crud 모듈의 함수를 사용하여 로그 조회
-    return crud.get_session_logs(db=db, session_id=session_id)
+    # 버전이 같으면 304, 아니면 최근 사용된 세션은 메모리 캐시에서, 없으면 필요한 컬럼만 조회하여 바로 직렬화
+    # (limit이 있으면 최근 limit개만 반환, limit마다 응답이 다르므로 ETag에도 포함)
+    limit = max(limit, 1) if limit is not None else None
+    version = crud.get_version(db, crud.logs_scope(session_id))
+    etag = f'W/"l{session_id}-{version}-{limit or "all"}"'
+    return conditional_response(request, etag, lambda: rows_response(crud.get_recent_logs(db=db, session_id=session_id, limit=limit, version=version)))
+
+@app.get("/api/export")
+async def api_export(gzip: bool = False, user: models.User = Depends(current_user_from_token)):
+    """사용자의 전체 세션·채팅 로그를 NDJSON으로 스트리밍합니다. (?gzip=true면 .ndjson.gz 파일)"""
+    user_id = user.id
+
+    def stream():
+        # 응답이 끝날 때까지 커서를 유지해야 하므로 요청 의존성과 별도의 DB 세션을 사용합니다.
+        db = SessionLocal()
+        try:
+            yield from ndjson_chunks(crud.iter_export_records(db, user_id), compress=gzip)
+        finally:
+            db.close()
+
+    filename = "chat_export.ndjson.gz" if gzip else "chat_export.ndjson"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    if gzip:
+        # .gz 파일 자체가 본문이므로 GZipMiddleware가 한 번 더 압축하지 않도록 전송 인코딩을 명시합니다.
+        # (미들웨어는 Content-Encoding이 있는 응답을 건너뜁니다.)
+        headers["Content-Encoding"] = "identity"
+    return StreamingResponse(
+        stream(),
+        media_type="application/gzip" if gzip else "application/x-ndjson",
+        headers=headers,
+    )
+
+@app.get("/api/search")
+async def api_search(q: str, page: int = 1, limit: int = 20, user: models.User = Depends(current_user_from_token), db: Session = Depends(get_db)):
+    """현재 사용자의 채팅 로그·즐겨찾기를 검색하여 관련도 순으로 페이지 단위로 반환합니다.
+    partial이 true면 짧은 단어(1~2글자)만 있어 최근 기록만 찾은 결과입니다. (3글자 이상 단어를 함께 입력하면 전체 검색)"""
+    page, limit = max(page, 1), min(max(limit, 1), 100)
+    # 다음 페이지가 있는지 알기 위해 한 건 더 조회합니다.
+    results = search_index.search(db, user_id=user.id, query=q, limit=limit + 1, offset=(page - 1) * limit)
+    return {"results": results[:limit], "page": page, "limit": limit, "has_more": len(results) > limit,
+            "partial": search_index.is_partial(db, user_id=user.id, query=q)}
 
 @app.delete("/api/sessions/{session_id}")
 async def api_delete_session(session_id: str, user: models.User = Depends(current_user_from_token), db: Session = Depends(get_db)):
     # 소유권 확인
-    sessions = crud.get_sessions(db=db, user_id=user.id)
-    if session_id not in [s.id for s in sessions]:
+    if not crud.session_belongs_to(db=db, session_id=session_id, user_id=user.id):
         raise HTTPException(status_code=403, detail="권한이 없습니다.")
     
-    if not crud.delete_session(db=db, session_id=session_id):
+    if not await run_in_threadpool(crud.delete_session, db=db, session_id=session_id):
         raise HTTPException(status_code=500, detail="삭제에 실패했습니다.")
+    recommend_buffer.discard(session_id)
     return {"success": True}
 
 # ────────────────────────────────────────────────
@@ -296,32 +664,56 @@ async def api_delete_session(session_id: str, user: models.User = Depends(curren
 # ────────────────────────────────────────────────
 @app.post("/api/add_bookmark")
 async def api_add_bookmark(data: BookmarkCreate, user: models.User = Depends(current_user_from_token), db: Session = Depends(get_db)):
-    crud.add_bookmark(db=db, user_id=user.id, name=data.name, url=data.url)
-    return {"success": True, "message": "즐겨찾기 추가 성공"}
+    bookmark = crud.add_bookmark(db=db, user_id=user.id, name=data.name, url=data.url)
+    # 추가된 즐겨찾기를 함께 반환하여 클라이언트가 목록을 다시 조회하지 않아도 되게 합니다.
+    return {"success": True, "message": "즐겨찾기 추가 성공", "bookmark": bookmark_out(bookmark)}
 
 @app.get("/api/bookmarks")
-async def api_bookmarks(user: models.User = Depends(current_user_from_token), db: Session = Depends(get_db)):
-    return crud.get_bookmarks(db=db, user_id=user.id)
+async def api_bookmarks(request: Request, user: models.User = Depends(current_user_from_token), db: Session = Depends(get_db)):
+    etag = f'W/"b{user.id}-{crud.get_version(db, crud.bookmarks_scope(user.id))}"'
+    return conditional_response(request, etag, lambda: rows_response(crud.get_bookmark_rows(db=db, user_id=user.id)))
 
 @app.post("/api/delete_bookmark")
 async def api_delete_bookmark(data: BookmarkDelete, user: models.User = Depends(current_user_from_token), db: Session = Depends(get_db)):
-    # 참고: 실제 서비스에서는 이 북마크가 정말 해당 유저의 것인지 확인하는 로직이 추가되어야 합니다.
-    crud.delete_bookmark(db=db, bookmark_id=data.bookmark_id)
-    return {"success": True, "message": "즐겨찾기 삭제 성공"}
+    # 본인의 즐겨찾기가 아니면 존재 여부를 드러내지 않도록 404를 반환합니다.
+    if not crud.delete_bookmark(db=db, user_id=user.id, bookmark_id=data.bookmark_id):
+        raise HTTPException(status_code=404, detail="즐겨찾기를 찾을 수 없습니다.")
+    return {"success": True, "message": "즐겨찾기 삭제 성공", "bookmark_id": data.bookmark_id}
 
 @app.post("/api/update_bookmark")
 async def api_update_bookmark(data: BookmarkUpdate, user: models.User = Depends(current_user_from_token), db: Session = Depends(get_db)):
-    # 참고: 실제 서비스에서는 이 북마크가 정말 해당 유저의 것인지 확인하는 로직이 추가되어야 합니다.
-    crud.update_bookmark(db=db, bookmark_id=data.id, name=data.name, url=data.url)
-    return {"success": True, "message": "즐겨찾기 수정 성공"}
+    # 본인의 즐겨찾기가 아니면 존재 여부를 드러내지 않도록 404를 반환합니다.
+    bookmark = crud.update_bookmark(db=db, user_id=user.id, bookmark_id=data.id, name=data.name, url=data.url)
+    if not bookmark:
+        raise HTTPException(status_code=404, detail="즐겨찾기를 찾을 수 없습니다.")
+    return {"success": True, "message": "즐겨찾기 수정 성공", "bookmark": bookmark_out(bookmark)}
+
+# ────────────────────────────────────────────────
+# 10) 운영 지표 API
+# ────────────────────────────────────────────────
+@app.get("/api/metrics")
+async def api_metrics(admin: models.User = Depends(admin_user)):
+    # 캐시 적중률 등 성능 관련 지표를 조회합니다. (관리자만)
+    return {
+        "emotion_cache": response_cache.stats(),
+        "recommend_prefetch": recommend_buffer.stats(),
+        "idempotency": idempotency_store.stats(),
+        "passwords": passwords.stats(),
+        "session_logs": session_log_cache.stats(),
+        "cache": cache.stats(),
+        "rate_limit": inbound_limiter.stats(),
+        "upstream": upstream_scheduler.stats(),
+    }
 
 # ────────────────────────────────────────────────
-# 10) 서버 실행
+# 11) 서버 실행
 # ────────────────────────────────────────────────
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run("app:app", host="0.0.0.0", port=5000, reload=True)
+    # 여러 워커로 실행할 때는 CACHE_BACKEND=sqlite 또는 redis로 캐시를 공유 (reload는 워커 1개일 때만)
+    workers = int(os.getenv("UVICORN_WORKERS", "1"))
+    uvicorn.run("app:app", host="0.0.0.0", port=5000, reload=workers == 1, workers=workers)
 
 
 
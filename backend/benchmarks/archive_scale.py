@@ -0,0 +1,115 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : archive_scale.py
+# 설명        : 오래된 세션 보관(crud.archive_idle_sessions) 전후 채팅 로그 조회 비용 비교 벤치마크
+# 주요 기능   :
+#   1) 임시 SQLite DB에 최근 세션 소수와 오래된(ARCHIVE_IDLE_DAYS 이전) 세션 다수 생성
+#   2) 보관 전: 최근 세션 로그 조회·메시지 저장·검색 시간과 chat_logs 행 수 측정
+#   3) 오래된 세션 보관 → 같은 측정을 반복하고 압축률 출력
+#   4) 보관된 세션을 열 때(rehydrate) 걸리는 시간과 내용이 그대로인지 확인
+# 실행 방법   : backend 디렉터리에서 python benchmarks/archive_scale.py [--sessions N] [--logs M]
+# -----------------------------------------------------------------------------------
+
+import argparse
+import datetime
+import os
+import sys
+import tempfile
+import time
+
+DB_PATH = os.path.join(tempfile.mkdtemp(), "archive_bench.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func, insert, select
+import crud, models, search_index
+from database import SessionLocal, engine
+from session_cache import session_log_cache
+
+SAMPLE = "오늘은 비도 오고 기분이 좀 울적해서 따뜻한 국물 요리가 먹고 싶어요. 근처에 괜찮은 곳 있을까요?"
+
+def seed(db, sessions, logs, recent):
+    user_id = crud.create_user(db, name="bench", email="bench@bench", hashed_password="x").id
+    old = datetime.datetime.utcnow() - datetime.timedelta(days=crud.ARCHIVE_IDLE_DAYS + 30)
+    session_ids = []
+    for i in range(sessions):
+        session_id = f"session-{i:06d}"
+        db.add(models.ChatSession(id=session_id, user_id=user_id, title=f"세션 {i}"))
+        session_ids.append(session_id)
+    db.flush()
+    for start in range(0, sessions, 200):
+        rows = []
+        for i, session_id in enumerate(session_ids[start:start + 200], start):
+            base = datetime.datetime.utcnow() if i < recent else old
+            rows += [{"session_id": session_id, "user_id": user_id, "role": "user" if j % 2 else "assistant",
+                      "message": f"{SAMPLE} ({j})", "created_at": base - datetime.timedelta(minutes=logs - j)} for j in range(logs)]
+        db.execute(insert(models.ChatLog), rows)
+    db.commit()
+    return user_id, session_ids[:recent], session_ids[recent:]
+
+def measure(db, user_id, recent_ids, repeat=20):
+    # 최근 세션을 열고(캐시 미스 경로) 메시지를 저장하는 요청 경로의 평균 시간
+    start = time.perf_counter()
+    for i in range(repeat):
+        session_log_cache.invalidate(recent_ids[i % len(recent_ids)])
+        crud.get_recent_logs(db, recent_ids[i % len(recent_ids)], limit=20)
+    read_ms = (time.perf_counter() - start) / repeat * 1000
+    start = time.perf_counter()
+    for i in range(repeat):
+        crud.save_chat(db, recent_ids[i % len(recent_ids)], user_id, "벤치마크 메시지", None, None, "user")
+    write_ms = (time.perf_counter() - start) / repeat * 1000
+    start = time.perf_counter()
+    for _ in range(repeat):
+        search_index.search(db, user_id, "국물 요리", 20, 0)
+    search_ms = (time.perf_counter() - start) / repeat * 1000
+    hot_rows = db.execute(select(func.count()).select_from(models.ChatLog)).scalar()
+    return read_ms, write_ms, search_ms, hot_rows
+
+def table_bytes(name):
+    with engine.connect() as conn:
+        return conn.exec_driver_sql(f"SELECT sum(pgsize) FROM dbstat WHERE name = '{name}'").scalar() or 0
+
+def run(sessions, logs, recent):
+    # 앱과 같은 스키마 (검색 인덱스 트리거 포함)
+    models.Base.metadata.create_all(bind=engine)
+    search_index.init_search_index(engine)
+    db = SessionLocal()
+    user_id, recent_ids, old_ids = seed(db, sessions, logs, recent)
+
+    read_ms, write_ms, search_ms, hot_rows = measure(db, user_id, recent_ids)
+    print(f"before: chat_logs {hot_rows:>7} rows, recent session read {read_ms:6.2f} ms, save {write_ms:6.2f} ms, search {search_ms:7.2f} ms")
+
+    logs_bytes = table_bytes("chat_logs")
+    start = time.perf_counter()
+    archived = 0
+    while True:
+        count = crud.archive_idle_sessions(db)
+        archived += count
+        if count < crud.ARCHIVE_BATCH_SIZE:
+            break
+    elapsed = time.perf_counter() - start
+    archive_bytes = db.execute(select(func.sum(func.length(models.ArchivedSession.data)))).scalar()
+    print(f"archived {archived} sessions in {elapsed:.1f}s ({archived / elapsed:.0f} sessions/s), "
+          f"{logs_bytes / 1024 / 1024:.1f} MB of logs -> {archive_bytes / 1024 / 1024:.1f} MB compressed")
+
+    read_ms, write_ms, search_ms, hot_rows = measure(db, user_id, recent_ids)
+    print(f" after: chat_logs {hot_rows:>7} rows, recent session read {read_ms:6.2f} ms, save {write_ms:6.2f} ms, search {search_ms:7.2f} ms")
+
+    # 보관된 세션을 열면 원래 내용 그대로 되돌아와야 함
+    session_id = old_ids[0]
+    archived_data = db.get(models.ArchivedSession, session_id).data
+    expected = [(log["id"], log["message"]) for log in crud._unpack_logs(archived_data)]
+    start = time.perf_counter()
+    rows = crud.get_session_log_rows(db, session_id)
+    rehydrate_ms = (time.perf_counter() - start) * 1000
+    restored = [(row.id, row.message) for row in rows]
+    print(f"rehydrate {len(rows)} logs in {rehydrate_ms:.2f} ms, {'same content' if restored == expected else 'CONTENT DIFFERS'}")
+    db.close()
+    return 0 if restored == expected and hot_rows < sessions * logs else 1
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=3000)
+    parser.add_argument("--logs", type=int, default=30)
+    parser.add_argument("--recent", type=int, default=100)
+    args = parser.parse_args()
+    sys.exit(run(args.sessions, args.logs, args.recent))
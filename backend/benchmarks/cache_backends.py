@@ -0,0 +1,129 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : cache_backends.py
+# 설명        : 공유 캐시(cache.py) 백엔드별 동작 확인 및 속도 벤치마크
+# 주요 기능   :
+#   1) Redis 프로토콜을 흉내 내는 로컬 서버(tests/redis_stand_in.py)를 띄워 redis 백엔드를 실제 소켓으로 사용
+#   2) memory / sqlite / redis 백엔드에서 같은 동작 확인
+#      (값 복원, get_many, TTL 만료, 삭제, 이름공간 단위 비우기 — pytest로는 tests/test_cache.py에서 확인)
+#   3) sqlite / redis 백엔드는 다른 프로세스(워커 역할)가 저장한 값을 읽을 수 있는지 확인
+#   4) 서버가 꺼진 redis 백엔드가 오류 대신 미스로 처리되는지 확인
+#   5) 백엔드별 get / set 평균 소요 시간 출력
+# 실행 방법   : backend 디렉터리에서 python benchmarks/cache_backends.py [--ops N]
+# -----------------------------------------------------------------------------------
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cache import Cache, MemoryBackend, SQLiteBackend, RedisBackend
+from tests.redis_stand_in import StandInRedis
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 1) 동작 확인
+# ────────────────────────────────────────────────────────────────────────────────────
+def check(name, condition):
+    print(f"  {'OK  ' if condition else 'FAIL'} {name}")
+    return condition
+
+def conformance(backend):
+    places = Cache("bench_places", ttl=60, backend=backend)
+    other = Cache("bench_other", ttl=60, backend=backend)
+    places.clear()
+    other.clear()
+    ok = True
+
+    value = [["김치찌개", 4.5, None], {"hours": ["월 11:00~21:00"]}]
+    places.set(("김치찌개", "강남구", (37.5, 127.0)), value)
+    ok &= check("값 복원", places.get(("김치찌개", "강남구", (37.5, 127.0))) == value)
+    ok &= check("없는 키는 default", places.get("없음", "default") == "default")
+
+    places.set("a", 1)
+    places.set("b", 2)
+    ok &= check("get_many", places.get_many(["a", "b", "c"]) == {"a": 1, "b": 2})
+
+    places.set("short", "x", ttl=0.2)
+    before = places.get("short")
+    time.sleep(0.3)
+    ok &= check("TTL 만료", before == "x" and places.get("short") is None)
+
+    places.delete("a")
+    ok &= check("삭제", places.get("a") is None and places.get("b") == 2)
+
+    other.set("b", "다른 이름공간")
+    places.clear()
+    ok &= check("이름공간 단위 비우기", places.get("b") is None and other.get("b") == "다른 이름공간")
+    ok &= check("오류 없음", places.errors == 0 and other.errors == 0)
+    return ok
+
+def _worker_set(kind, target, key, value):
+    backend = SQLiteBackend(target) if kind == "sqlite" else RedisBackend(target)
+    Cache("bench_shared", backend=backend).set(key, value)
+
+def shared_between_processes(kind, target, backend):
+    process = multiprocessing.get_context("spawn").Process(target=_worker_set, args=(kind, target, "from-worker", {"pid": "other"}))
+    process.start()
+    process.join()
+    return check("다른 프로세스가 저장한 값 조회", Cache("bench_shared", backend=backend).get("from-worker") == {"pid": "other"})
+
+def outage():
+    cache = Cache("bench_outage", backend=RedisBackend("redis://127.0.0.1:1/0", timeout=0.2))
+    start = time.perf_counter()
+    value = cache.get("key", "miss")
+    cache.set("key", "value")
+    elapsed = time.perf_counter() - start
+    return check(f"서버가 꺼져 있으면 미스로 처리 ({elapsed * 1000:.0f} ms, errors={cache.errors})", value == "miss" and cache.errors == 2)
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 2) 속도
+# ────────────────────────────────────────────────────────────────────────────────────
+def throughput(backend, ops):
+    cache = Cache("bench_speed", ttl=60, backend=backend)
+    value = [{"name": f"식당{i}", "address": "서울 강남구", "rating": 4.2, "reviews": 120} for i in range(5)]
+    start = time.perf_counter()
+    for i in range(ops):
+        cache.set(("음식", i % 100), value)
+    set_us = (time.perf_counter() - start) / ops * 1e6
+    start = time.perf_counter()
+    for i in range(ops):
+        cache.get(("음식", i % 100))
+    get_us = (time.perf_counter() - start) / ops * 1e6
+    return set_us, get_us
+
+def run(ops):
+    server = StandInRedis().start()
+    redis_url = server.url
+    sqlite_path = os.path.join(tempfile.mkdtemp(), "cache_bench.sqlite3")
+
+    backends = [
+        ("memory", None, MemoryBackend()),
+        ("sqlite", sqlite_path, SQLiteBackend(sqlite_path)),
+        ("redis", redis_url, RedisBackend(redis_url)),
+    ]
+    ok = True
+    speeds = []
+    for kind, target, backend in backends:
+        print(f"[{kind}]")
+        ok &= conformance(backend)
+        if target:
+            ok &= shared_between_processes(kind, target, backend)
+        speeds.append((kind, *throughput(backend, ops)))
+    print("[redis 장애]")
+    ok &= outage()
+
+    print()
+    for kind, set_us, get_us in speeds:
+        print(f"{kind:>6}: set {set_us:7.1f} us/op, get {get_us:7.1f} us/op")
+    server.stop()
+    print("OK" if ok else "FAIL")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ops", type=int, default=2000)
+    args = parser.parse_args()
+    sys.exit(run(args.ops))
@@ -0,0 +1,245 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : crud_scale.py
+# 설명        : 데이터 규모별 crud 함수 조회 시간·실행 계획·SQL 문 수 벤치마크
+# 주요 기능   :
+#   1) 규모(scale)마다 새 DB를 만들고 datagen.py로 운영과 비슷한 분포의 데이터를 채움
+#      (scale=1: 사용자 10,000명, 세션 1,000,000개, 로그 10,000,000개)
+#   2) crud 함수마다 "보통" 대상(세션·로그 수가 중간인 사용자·세션)과 "큰" 대상(가장 많은 사용자·세션)으로
+#      실행해 평균 시간 측정
+#   3) 엔진의 before_cursor_execute 이벤트로 호출마다 실행된 SQL 문을 모아
+#      - SQL 문 수가 대상 크기에 따라 늘어나면 N+1로 보고 실패 (나눠 지우는 삭제 함수는 제외)
+#      - 각 문의 실행 계획(SQLite: EXPLAIN QUERY PLAN, Postgres: EXPLAIN)에서
+#        요청 경로 함수가 테이블 전체를 훑으면(SCAN / Seq Scan) 실패
+#   4) --plans를 주면 모든 실행 계획 출력
+# 실행 방법   : backend 디렉터리에서 python benchmarks/crud_scale.py [--scales 0.001,0.01,0.1] [--repeat 20]
+#               [--database-url postgresql://...] (비어 있는 DB, 규모마다 테이블을 지우고 다시 만듦)
+# -----------------------------------------------------------------------------------
+
+import argparse
+import os
+import re
+import statistics
+import sys
+import tempfile
+import time
+from collections import namedtuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scales", default="0.001,0.01,0.1")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seconds", type=float, default=2.0, help="함수·대상마다 최대 측정 시간")
+    parser.add_argument("--database-url")
+    parser.add_argument("--plans", action="store_true")
+    parser.add_argument("--seed", type=int, default=1)
+    return parser.parse_args()
+
+args = parse_args()
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'unused.db')}")
+
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.orm import sessionmaker
+import crud, models, search_index
+from session_cache import session_log_cache
+import datagen
+
+DATA_TABLES = {"users", "chat_sessions", "chat_logs", "chat_log_archive", "bookmark", "version_stamps"}
+SMALL_TABLE_ROWS = 1000  # 이보다 작은 테이블은 전체 스캔이 인덱스보다 싼 경우가 있어 검사하지 않음
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 1) SQL 문 수집 (엔진 이벤트)
+# ────────────────────────────────────────────────────────────────────────────────────
+class StatementRecorder:
+    def __init__(self, engine):
+        self.statements = None  # None이면 수집하지 않음
+        event.listen(engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if self.statements is not None:
+            self.statements.append((statement, parameters[0] if executemany and parameters else parameters))
+
+    def run(self, fn, *a):
+        self.statements = []
+        try:
+            fn(*a)
+            return self.statements
+        finally:
+            self.statements = None
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 2) 실행 계획
+# ────────────────────────────────────────────────────────────────────────────────────
+def explain(engine, statement, parameters):
+    """실행 계획을 줄 목록으로 반환 (INSERT ... VALUES 등 계획이 의미 없는 문은 None)"""
+    if not re.match(r"\s*(SELECT|UPDATE|DELETE|WITH)\b", statement, re.I):
+        return None
+    with engine.connect() as conn:
+        if engine.dialect.name == "sqlite":
+            return [row[3] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+        return [row[0] for row in conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)]
+
+def large_tables(engine):
+    with engine.connect() as conn:
+        return {t for t in DATA_TABLES if conn.exec_driver_sql(f"SELECT count(*) FROM {t}").scalar() >= SMALL_TABLE_ROWS}
+
+def full_scans(lines, tables_to_check):
+    """테이블 전체를 읽는 단계의 테이블 이름 (인덱스 전체를 순서대로 훑는 SQLite SCAN ... USING INDEX 포함)"""
+    tables = []
+    for line in lines:
+        match = re.search(r"^SCAN (\w+)", line.strip()) or re.search(r"Seq Scan on (\w+)", line)
+        if match and match.group(1) in tables_to_check:
+            tables.append(match.group(1))
+    return tables
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 3) 측정 대상
+#    - args: {"보통": [인자, ...], "큰": [인자, ...]}, 반복할 때마다 다음 인자 사용
+#    - consumes: 실행하면 대상이 사라지는 함수(삭제) → 인자 수만큼만 반복
+#    - hot: 요청 경로 함수 → 전체 스캔이면 실패 (보관 작업처럼 주기적으로 도는 작업은 시간만 측정)
+#    - batched: 행 수에 비례해 DELETE 문을 나눠 실행 → SQL 문 수 비교에서 제외
+# ────────────────────────────────────────────────────────────────────────────────────
+Case = namedtuple("Case", ["name", "fn", "args", "consumes", "hot", "batched"], defaults=[False, True, False])
+
+def scalars(db, stmt):
+    return db.execute(stmt).scalars().all()
+
+def build_cases(db, ds):
+    S, L, B = models.ChatSession, models.ChatLog, models.Bookmark
+    users = {"보통": ds.median_user, "큰": ds.heavy_user}
+    sessions = {"보통": ds.median_session, "큰": ds.heavy_session}
+    owner = {kind: db.execute(select(S.user_id).where(S.id == sid)).scalar() for kind, sid in sessions.items()}
+    per_user = db.execute(select(B.user_id).group_by(B.user_id).order_by(func.count(), B.user_id)).scalars().all()
+    bookmark_users = {"보통": per_user[len(per_user) // 2], "큰": per_user[-1]}
+    bookmarks = {kind: [(uid, bid) for bid in scalars(db, select(B.id).where(B.user_id == uid).limit(args.repeat))]
+                 for kind, uid in bookmark_users.items()}
+    # 삭제용: 큰 사용자의 세션 중 로그가 많은 세션 / 보통 세션과 비슷한 크기의 세션
+    log_count = select(L.session_id, func.count().label("n")).group_by(L.session_id).subquery()
+    median_logs = db.execute(select(func.count()).where(L.session_id == ds.median_session)).scalar()
+    doomed = {
+        "보통": scalars(db, select(log_count.c.session_id).where(log_count.c.n == median_logs, log_count.c.session_id != ds.median_session).limit(args.repeat)),
+        "큰": scalars(db, select(log_count.c.session_id).where(log_count.c.session_id != ds.heavy_session).order_by(log_count.c.n.desc()).limit(args.repeat)),
+    }
+
+    def recent_logs_miss(db, session_id):
+        session_log_cache.invalidate(session_id)
+        return crud.get_recent_logs(db, session_id, limit=20)
+
+    def export(db, user_id):
+        for _ in crud.iter_export_records(db, user_id):
+            pass
+
+    each = lambda values, make=lambda v: v: {kind: [make(v)] for kind, v in values.items()}
+    return [
+        Case("get_user_by_email", crud.get_user_by_email, each(users, datagen.email_of)),
+        Case("get_sessions", crud.get_sessions, each(users)),
+        Case("get_session_rows", crud.get_session_rows, each(users)),
+        Case("session_belongs_to", lambda db, a: crud.session_belongs_to(db, *a), {k: [(sessions[k], owner[k])] for k in sessions}),
+        Case("get_session_logs", crud.get_session_logs, each(sessions)),
+        Case("get_session_log_rows", crud.get_session_log_rows, each(sessions)),
+        Case("get_recent_logs (miss)", recent_logs_miss, each(sessions)),
+        Case("get_version", crud.get_version, each(sessions, crud.logs_scope)),
+        Case("get_bookmarks", crud.get_bookmarks, each(bookmark_users)),
+        Case("get_bookmark_rows", crud.get_bookmark_rows, each(bookmark_users)),
+        Case("iter_export_records", export, each(users)),
+        Case("create_session", lambda db, uid: crud.create_session(db, uid, "벤치마크"), each(users)),
+        Case("save_chat", lambda db, a: crud.save_chat(db, a[0], a[1], "벤치마크 메시지", None, None, "user"),
+             {k: [(sessions[k], owner[k])] for k in sessions}),
+        Case("add_bookmark", lambda db, uid: crud.add_bookmark(db, uid, "벤치마크 식당", "https://example.com"), each(users)),
+        Case("update_bookmark", lambda db, a: crud.update_bookmark(db, *a, "벤치마크 식당", "https://example.com"), bookmarks),
+        Case("update_password", lambda db, uid: crud.update_password(db, uid, "!"), each(users)),
+        Case("delete_bookmark", lambda db, a: crud.delete_bookmark(db, *a), bookmarks, consumes=True),
+        Case("delete_session", crud.delete_session, doomed, consumes=True, batched=True),
+        Case("archive_idle_sessions", lambda db, _: crud.archive_idle_sessions(db), {"큰": [None]}, consumes=True, hot=False, batched=True),
+        Case("delete_user", crud.delete_user, {k: [v] for k, v in users.items()}, consumes=True, batched=True),
+    ]
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 4) 실행
+# ────────────────────────────────────────────────────────────────────────────────────
+def prepare(scale):
+    if args.database_url:
+        engine = create_engine(args.database_url)
+        models.Base.metadata.drop_all(bind=engine)
+    else:
+        engine = create_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), f'crud_scale_{scale}.db')}")
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", lambda conn, record: conn.execute("PRAGMA foreign_keys=ON"))
+    # 앱과 같은 스키마 (인덱스·검색 인덱스 트리거 포함, 검색 인덱스는 데이터를 넣은 뒤 한 번에 채움)
+    models.Base.metadata.create_all(bind=engine)
+    return engine
+
+def measure(recorder, db, case, values):
+    """(평균 ms, 첫 호출의 SQL 문 목록)"""
+    repeat = len(values) if case.consumes else args.repeat
+    times, statements = [], None
+    deadline = time.perf_counter() + args.seconds
+    for i in range(repeat):
+        start = time.perf_counter()
+        recorded = recorder.run(case.fn, db, values[i % len(values)])
+        times.append((time.perf_counter() - start) * 1000)
+        statements = statements or recorded
+        if time.perf_counter() > deadline:
+            break
+    return statistics.mean(times), statements
+
+def run_scale(scale):
+    engine = prepare(scale)
+    start = time.perf_counter()
+    ds = datagen.generate(engine, scale, args.seed)
+    search_index.init_search_index(engine)
+    print(f"\n[scale {scale}] users {ds.users:,}, sessions {ds.sessions:,}, logs {ds.logs:,}, bookmarks {ds.bookmarks:,} "
+          f"({engine.dialect.name}, generated in {time.perf_counter() - start:.0f}s)")
+    print(f"  {'function':<24}{'보통 ms':>10}{'큰 ms':>10}{'SQL 문(보통/큰)':>16}  plan")
+
+    checked = large_tables(engine)
+    recorder = StatementRecorder(engine)
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    failures = []
+    for case in build_cases(db, ds):
+        results = {kind: measure(recorder, db, case, values) for kind, values in case.args.items() if values}
+        counts = {kind: len(statements) for kind, (_, statements) in results.items()}
+
+        problems = []
+        if not case.batched and counts.get("큰", 0) > counts.get("보통", 0) > 0:
+            problems.append("N+1")
+        plans, seen, scanned_tables = [], set(), set()
+        for _, statements in results.values():
+            for statement, parameters in statements:
+                if statement in seen:
+                    continue
+                seen.add(statement)
+                lines = explain(engine, statement, parameters)
+                if lines is None:
+                    continue
+                scanned = full_scans(lines, checked)
+                plans.append((statement, lines, scanned))
+                if case.hot:
+                    scanned_tables.update(scanned)
+
+        if scanned_tables:
+            problems.append("SCAN " + ",".join(sorted(scanned_tables)))
+        ms = {kind: f"{results[kind][0]:.2f}" if kind in results else "-" for kind in ("보통", "큰")}
+        stmt_counts = f"{counts.get('보통', '-')}/{counts.get('큰', '-')}"
+        print(f"  {case.name:<24}{ms['보통']:>10}{ms['큰']:>10}{stmt_counts:>16}  {'; '.join(problems) or 'ok'}")
+        if problems:
+            failures.append((scale, case.name, problems))
+        if args.plans or problems:
+            for statement, lines, scanned in plans:
+                print("      " + " ".join(statement.split())[:160])
+                for line in lines:
+                    print(f"        {line}")
+    db.close()
+    engine.dispose()
+    return failures
+
+if __name__ == "__main__":
+    failures = []
+    for scale in [float(s) for s in args.scales.split(",")]:
+        failures += run_scale(scale)
+    print()
+    for scale, name, problems in failures:
+        print(f"FAIL: scale {scale} {name}: {'; '.join(problems)}")
+    print("OK" if not failures else f"{len(failures)} failures")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,231 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : datagen.py
+# 설명        : 운영 DB와 비슷한 분포의 가짜 사용자·세션·채팅 로그·즐겨찾기를 대량으로 만드는 생성기
+# 주요 기능   :
+#   1) 기본 크기(scale=1): 사용자 10,000명, 세션 1,000,000개, 채팅 로그 10,000,000개, 즐겨찾기 50,000개
+#      scale로 모든 수를 같은 비율로 줄이거나 늘림 (예: 0.01 → 사용자 100명, 로그 100,000개)
+#   2) 분포
+#      - 사용자별 세션 수: Zipf (소수의 사용자가 대부분의 세션을 가짐)
+#      - 세션별 로그 수: 로그정규 (대부분 짧고 일부 세션만 매우 김)
+#      - 세션 시작 시각: 최근 1년, 최근일수록 많음 / 로그는 세션 안에서 수십 초 간격
+#      - 즐겨찾기: 세션이 많은 사용자일수록 많음
+#   3) ORM 객체 없이 Core INSERT로 나눠 넣고, 버전 스탬프(ETag용)도 함께 생성 후 통계 수집(ANALYZE)
+#   4) 단독 실행 시 지정한 DB(예: 로컬 Postgres)에 데이터를 채움
+#      (비밀번호 해시는 로그인할 수 없는 고정 문자열)
+# 실행 방법   : backend 디렉터리에서 python benchmarks/datagen.py --database-url URL [--scale 0.1] [--seed 1]
+# 요구 모듈   : numpy, sqlalchemy
+# -----------------------------------------------------------------------------------
+
+import argparse
+import datetime
+import os
+import sys
+import time
+import uuid
+from collections import namedtuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--scale", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    os.environ["DATABASE_URL"] = args.database_url  # database.py가 import 시 엔진을 만듦
+
+import numpy as np
+from sqlalchemy import insert, text
+import crud, models
+
+FULL_USERS = 10_000
+FULL_SESSIONS = 1_000_000
+FULL_LOGS = 10_000_000
+BOOKMARKS_PER_USER = 5
+
+SESSION_ZIPF = 0.9      # 사용자별 세션 수의 Zipf 지수 (클수록 상위 사용자에 몰림)
+LOG_SIGMA = 1.2         # 세션별 로그 수 로그정규 분포의 시그마 (클수록 긴 세션이 많음)
+HISTORY_DAYS = 365
+MESSAGE_GAP_SECONDS = 45
+CHUNK_ROWS = 50_000     # INSERT 한 번에 넣을 행 수
+
+USER_MESSAGES = [
+    "오늘 너무 우울해서 뭔가 맛있는 걸 먹고 싶어요",
+    "시험 끝나서 기분 최고! 뭐 먹을까?",
+    "비가 와서 그런지 따뜻한 국물이 생각나요",
+    "회사에서 스트레스를 너무 많이 받았어",
+    "근처에 괜찮은 식당 있을까요?",
+    "친구랑 싸워서 속상해요",
+    "고마워요",
+    "안녕하세요",
+]
+ASSISTANT_MESSAGES = [
+    "많이 힘드셨겠어요. 따뜻한 김치찌개 한 그릇 어떠세요?",
+    "축하해요! 오늘 같은 날엔 떡볶이로 기분을 더 올려 봐요.",
+    "비 오는 날엔 칼국수가 잘 어울려요. 근처 식당을 찾아봤어요.",
+    "스트레스엔 매콤한 음식이 도움이 될 수 있어요. 마라탕은 어떠세요?",
+    "천천히 이야기해 주세요. 듣고 있어요.",
+]
+PLACES = [
+    ("을지로 김치찌개", "https://maps.google.com/?q=%EC%9D%84%EC%A7%80%EB%A1%9C"),
+    ("신당동 떡볶이", "https://maps.google.com/?q=%EC%8B%A0%EB%8B%B9%EB%8F%99"),
+    ("명동 칼국수", "https://maps.google.com/?q=%EB%AA%85%EB%8F%99"),
+    ("건대 마라탕", "https://maps.google.com/?q=%EA%B1%B4%EB%8C%80"),
+]
+PLACE_PROBABILITY = 0.3  # 답변 중 식당 링크가 붙는 비율
+
+Dataset = namedtuple("Dataset", [
+    "users", "sessions", "logs", "bookmarks",
+    "heavy_user", "median_user",        # 세션이 가장 많은 사용자, 세션 수가 중간인 사용자
+    "heavy_session", "median_session",  # 로그가 가장 많은 세션, 로그 수가 중간인 세션
+])
+
+def email_of(user_id):
+    return f"user{user_id:06d}@example.com"
+
+def sizes(scale):
+    """scale에 맞춘 (사용자, 세션, 로그) 수"""
+    users = max(int(FULL_USERS * scale), 2)
+    sessions = max(int(FULL_SESSIONS * scale), users)
+    logs = max(int(FULL_LOGS * scale), sessions)
+    return users, sessions, logs
+
+def _split(rng, total, weights):
+    """total개를 weights 비율로 무작위 분배 (모든 칸에 최소 1개)"""
+    return rng.multinomial(total - len(weights), weights / weights.sum()) + 1
+
+def _datetimes(now, seconds_ago):
+    return (np.datetime64(now, "us") - (seconds_ago * 1e6).astype("timedelta64[us]")).tolist()
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 1) 분포 만들기
+# ────────────────────────────────────────────────────────────────────────────────────
+def plan(rng, users, sessions, logs):
+    """사용자별 세션 수, 세션별 소유자·로그 수·시작 시각(초 전)"""
+    ranks = np.arange(1, users + 1, dtype=float)
+    sessions_per_user = rng.permutation(_split(rng, sessions, ranks ** -SESSION_ZIPF))
+    session_owner = np.repeat(np.arange(1, users + 1), sessions_per_user)
+    logs_per_session = _split(rng, logs, rng.lognormal(0.0, LOG_SIGMA, sessions))
+    session_age = rng.beta(1.0, 4.0, sessions) * HISTORY_DAYS * 86400
+    return sessions_per_user, session_owner, logs_per_session, session_age
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 2) 테이블별 행 생성 (CHUNK_ROWS개씩)
+# ────────────────────────────────────────────────────────────────────────────────────
+def _chunks(rows):
+    for start in range(0, len(rows), CHUNK_ROWS):
+        yield rows[start:start + CHUNK_ROWS]
+
+def user_rows(users):
+    return [{"id": i, "name": f"사용자{i}", "email": email_of(i), "hashed_password": "!"} for i in range(1, users + 1)]
+
+def session_rows(rng, now, session_ids, session_owner, session_age):
+    created = _datetimes(now, session_age)
+    return [{"id": sid, "user_id": int(owner), "title": f"대화 {i % 97}", "created_at": created[i]}
+            for i, (sid, owner) in enumerate(zip(session_ids, session_owner))]
+
+def log_chunks(rng, now, session_ids, session_owner, logs_per_session, session_age):
+    """세션 순서대로 로그 행을 CHUNK_ROWS개 안팎씩 생성 (전체 로그를 한꺼번에 메모리에 두지 않음)"""
+    next_id = 1
+    starts = np.concatenate([[0], np.cumsum(logs_per_session)])
+    session = 0
+    while session < len(session_ids):
+        end = int(np.searchsorted(starts, starts[session] + CHUNK_ROWS, side="right"))
+        end = max(end - 1, session + 1)
+        counts = logs_per_session[session:end]
+        total = int(counts.sum())
+        session_of_log = np.repeat(np.arange(session, end), counts)
+        position = np.arange(total) - np.repeat(starts[session:end] - starts[session], counts)
+
+        # 세션 시작 시각부터 지수 분포 간격으로 진행, 현재 시각을 넘지 않음
+        gaps = rng.exponential(MESSAGE_GAP_SECONDS, total)
+        elapsed = np.cumsum(gaps)
+        elapsed -= np.repeat(elapsed[starts[session:end] - starts[session]] - gaps[starts[session:end] - starts[session]], counts)
+        seconds_ago = np.maximum(session_age[session_of_log] - elapsed, 0.0)
+        created = _datetimes(now, seconds_ago)
+
+        user_pick = rng.integers(0, len(USER_MESSAGES), total)
+        reply_pick = rng.integers(0, len(ASSISTANT_MESSAGES), total)
+        place_pick = np.where(rng.random(total) < PLACE_PROBABILITY, rng.integers(0, len(PLACES), total), -1)
+        rows = []
+        for j in range(total):
+            s = session_of_log[j]
+            if position[j] % 2 == 0:
+                role, message, name, url = "user", USER_MESSAGES[user_pick[j]], None, None
+            else:
+                role, message = "assistant", ASSISTANT_MESSAGES[reply_pick[j]]
+                name, url = PLACES[place_pick[j]] if place_pick[j] >= 0 else (None, None)
+            rows.append({"id": next_id + j, "session_id": session_ids[s], "user_id": int(session_owner[s]),
+                         "role": role, "message": message, "url": url, "name": name, "created_at": created[j]})
+        next_id += total
+        session = end
+        yield rows
+
+def bookmark_rows(rng, now, sessions_per_user):
+    users = len(sessions_per_user)
+    per_user = rng.multinomial(users * BOOKMARKS_PER_USER, sessions_per_user / sessions_per_user.sum())  # 0개인 사용자도 있음
+    owner = np.repeat(np.arange(1, users + 1), per_user)
+    created = _datetimes(now, rng.random(len(owner)) * HISTORY_DAYS * 86400)
+    pick = rng.integers(0, len(PLACES), len(owner))
+    return [{"id": i + 1, "user_id": int(owner[i]), "name": PLACES[pick[i]][0], "url": PLACES[pick[i]][1], "created_at": created[i]}
+            for i in range(len(owner))]
+
+def version_rows(session_ids, logs_per_session, users):
+    # 실제 서비스처럼 세션마다 logs: 버전, 사용자마다 sessions:·bookmarks: 버전이 있음
+    rows = [{"scope": crud.logs_scope(sid), "version": int(n)} for sid, n in zip(session_ids, logs_per_session)]
+    for user_id in range(1, users + 1):
+        rows.append({"scope": crud.sessions_scope(user_id), "version": 1})
+        rows.append({"scope": crud.bookmarks_scope(user_id), "version": 1})
+    return rows
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 3) DB에 넣기
+# ────────────────────────────────────────────────────────────────────────────────────
+def _insert(engine, table, chunks):
+    count = 0
+    for rows in chunks:
+        with engine.begin() as conn:
+            if engine.dialect.name == "sqlite":
+                conn.exec_driver_sql("PRAGMA synchronous=OFF")
+            conn.execute(insert(table), rows)
+        count += len(rows)
+    return count
+
+def generate(engine, scale=0.01, seed=1, verbose=True):
+    """빈 스키마(create_all 직후)에 데이터를 채우고 Dataset을 반환합니다."""
+
+    users, sessions, logs = sizes(scale)
+    rng = np.random.default_rng(seed)
+    now = datetime.datetime.utcnow()
+    sessions_per_user, session_owner, logs_per_session, session_age = plan(rng, users, sessions, logs)
+    session_ids = [str(uuid.UUID(bytes=rng.bytes(16), version=4)) for _ in range(sessions)]
+
+    start = time.perf_counter()
+    _insert(engine, models.User.__table__, _chunks(user_rows(users)))
+    _insert(engine, models.ChatSession.__table__, _chunks(session_rows(rng, now, session_ids, session_owner, session_age)))
+    log_count = 0
+    for rows in log_chunks(rng, now, session_ids, session_owner, logs_per_session, session_age):
+        log_count += _insert(engine, models.ChatLog.__table__, [rows])
+        if verbose and log_count % (CHUNK_ROWS * 20) < len(rows):
+            print(f"  chat_logs {log_count:,}/{logs:,} ({time.perf_counter() - start:.0f}s)", flush=True)
+    bookmark_count = _insert(engine, models.Bookmark.__table__, _chunks(bookmark_rows(rng, now, sessions_per_user)))
+    _insert(engine, models.VersionStamp.__table__, _chunks(version_rows(session_ids, logs_per_session, users)))
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+
+    by_sessions = np.argsort(sessions_per_user, kind="stable")
+    by_logs = np.argsort(logs_per_session, kind="stable")
+    return Dataset(
+        users=users, sessions=sessions, logs=log_count, bookmarks=bookmark_count,
+        heavy_user=int(by_sessions[-1]) + 1, median_user=int(by_sessions[users // 2]) + 1,
+        heavy_session=session_ids[by_logs[-1]], median_session=session_ids[by_logs[sessions // 2]],
+    )
+
+if __name__ == "__main__":
+    from database import engine
+    import search_index
+    models.Base.metadata.create_all(bind=engine)
+    start = time.perf_counter()
+    dataset = generate(engine, args.scale, args.seed)
+    search_index.init_search_index(engine)
+    print(f"{dataset} ({time.perf_counter() - start:.0f}s)")
@@ -0,0 +1,100 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : export_throughput.py
+# 설명        : /api/export(NDJSON 스트리밍 내보내기)의 처리량·메모리 벤치마크
+# 주요 기능   :
+#   1) 임시 SQLite DB에 가짜 사용자·세션·채팅 로그를 대량 생성 (기본 100,000개 메시지)
+#   2) 내보내기 스트림(crud.iter_export_records + ndjson_chunks)을 끝까지 읽으며 처리량(행/초, MB/초) 측정
+#   3) 메시지 수가 10배 차이 나는 두 사용자의 최대 할당 메모리(tracemalloc)를 비교하여,
+#      데이터 크기와 무관하게 메모리가 일정하지 않으면 실패
+# 실행 방법   : backend 디렉터리에서 python benchmarks/export_throughput.py [--messages N]
+# -----------------------------------------------------------------------------------
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+DB_PATH = os.path.join(tempfile.mkdtemp(), "export_bench.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert
+import crud, models
+from database import engine, SessionLocal
+from app import ndjson_chunks
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 1) 가짜 데이터 생성
+#    - 세션당 메시지 수는 고정, 메시지 본문은 실제 대화와 비슷한 길이의 한국어 문장
+# ────────────────────────────────────────────────────────────────────────────────────
+MESSAGES_PER_SESSION = 50
+SAMPLE = "오늘은 비도 오고 기분이 좀 울적해서 따뜻한 국물 요리가 먹고 싶어요. 근처에 괜찮은 곳 있을까요?"
+
+def seed_user(db, email, messages):
+    user = crud.create_user(db, name="bench", email=email, hashed_password="x")
+    sessions = max(messages // MESSAGES_PER_SESSION, 1)
+    for s in range(sessions):
+        session_id = f"{user.id}-{s}"
+        db.execute(insert(models.ChatSession), [{"id": session_id, "user_id": user.id, "title": f"세션 {s}"}])
+        count = min(MESSAGES_PER_SESSION, messages - s * MESSAGES_PER_SESSION)
+        db.execute(insert(models.ChatLog), [
+            {"session_id": session_id, "user_id": user.id, "role": "user" if i % 2 else "assistant",
+             "message": f"{SAMPLE} ({i})", "url": None, "name": None}
+            for i in range(count)
+        ])
+    db.commit()
+    return user.id
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 2) 측정
+# ────────────────────────────────────────────────────────────────────────────────────
+def consume(user_id, compress):
+    db = SessionLocal()
+    try:
+        total = 0
+        for chunk in ndjson_chunks(crud.iter_export_records(db, user_id), compress=compress):
+            total += len(chunk)
+        return total
+    finally:
+        db.close()
+
+def peak_memory_mb(user_id):
+    tracemalloc.start()
+    consume(user_id, compress=False)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024 / 1024
+
+def run(messages, budget_ratio):
+    models.Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    start = time.perf_counter()
+    small = seed_user(db, "small@bench", messages // 10)
+    large = seed_user(db, "large@bench", messages)
+    db.close()
+    print(f"seeded {messages + messages // 10:,} messages in {time.perf_counter() - start:.1f}s ({DB_PATH})")
+
+    for compress in (False, True):
+        start = time.perf_counter()
+        size = consume(large, compress)
+        elapsed = time.perf_counter() - start
+        label = "gzip  " if compress else "ndjson"
+        print(f"{label}: {messages:,} messages, {size / 1024 / 1024:7.1f} MB in {elapsed:.2f}s "
+              f"({messages / elapsed:,.0f} rows/s, {size / 1024 / 1024 / elapsed:.1f} MB/s)")
+
+    small_peak, large_peak = peak_memory_mb(small), peak_memory_mb(large)
+    print(f"peak traced memory: {messages // 10:,} messages={small_peak:.2f} MB, {messages:,} messages={large_peak:.2f} MB")
+    if large_peak > small_peak * budget_ratio:
+        print(f"FAIL: memory grew with data size ({large_peak / small_peak:.1f}x, budget {budget_ratio}x)")
+        return 1
+    print("OK")
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=100_000)
+    parser.add_argument("--budget-ratio", type=float, default=2.0)
+    args = parser.parse_args()
+    sys.exit(run(args.messages, args.budget_ratio))
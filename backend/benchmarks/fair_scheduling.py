@@ -0,0 +1,134 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : fair_scheduling.py
+# 설명        : 요청을 몰아 보내는 사용자가 있을 때 다른 사용자의 /get_response 지연 시간 벤치마크
+# 주요 기능   :
+#   1) 임시 SQLite DB와 앱(ASGI)을 같은 이벤트 루프에서 실행, GPT·Places 호출은 고정 지연으로 대체
+#   2) 스크립트 사용자 1명이 동시에 계속 요청을 보내는 동안, 일반 사용자들이 가끔 요청을 보냄
+#   3) 제한 없이 도착 순서대로 처리(fifo)와 요청 수 제한 + 사용자별 공정 분배(fair) 비교
+#   4) fair 방식에서 일반 사용자 p95 지연이 예산을 넘거나 429에 Retry-After가 없으면 실패
+# 실행 방법   : backend 디렉터리에서 python benchmarks/fair_scheduling.py [--seconds S] [--upstream-ms MS]
+# -----------------------------------------------------------------------------------
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+DB_PATH = os.path.join(tempfile.mkdtemp(), "fair_scheduling.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--upstream-ms", type=float, default=200.0)
+    parser.add_argument("--capacity", type=int, default=4)
+    parser.add_argument("--heavy-concurrency", type=int, default=24)
+    parser.add_argument("--light-users", type=int, default=4)
+    parser.add_argument("--budget-ms", type=float, default=1000.0)
+    return parser.parse_args()
+
+args = parse_args()
+os.environ["BCRYPT_ROUNDS"] = "4"
+
+import httpx
+import app as server
+import rate_limit
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 1) GPT·Places 대신 고정 지연 (스레드에서 실행되므로 time.sleep)
+# ────────────────────────────────────────────────────────────────────────────────────
+def fake_gpt(text, recent_foods=None, chat_history=None, use_cache=True):
+    time.sleep(args.upstream_ms / 1000)
+    return "우울함", "김치찌개", "따뜻한 국물이 기분을 풀어 줄 거예요."
+
+def fake_places(food, location="서울", limit=5, origin=None):
+    return []
+
+server.classify_emotion_and_reply_with_gpt = fake_gpt
+server.find_restaurants_nearby = fake_places
+server.recommend_buffer.prefetch = lambda *a, **k: None
+
+class FifoScheduler(rate_limit.FairScheduler):
+    """모든 요청을 한 줄로 세우는 비교용 스케줄러"""
+    def slot(self, key):
+        return super().slot("all")
+
+UNLIMITED = rate_limit.Limit(10 ** 9, 1)
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 2) 측정
+# ────────────────────────────────────────────────────────────────────────────────────
+def summary(latencies):
+    latencies = sorted(latencies)
+    p95 = latencies[max(int(len(latencies) * 0.95) - 1, 0)]
+    return statistics.median(latencies) * 1000, p95 * 1000, latencies[-1] * 1000
+
+async def client_for(email):
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=server.app), base_url="http://bench")
+    await client.post("/api/login", json={"email": email, "password": "pw"})
+    return client
+
+async def heavy_worker(client, stop, statuses, retry_headers):
+    while not stop.is_set():
+        response = await client.post("/get_response", data={"message": "너무 우울해"})
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        if response.status_code == 429:
+            retry_headers.append(response.headers.get("retry-after"))
+            await asyncio.sleep(0.05)  # 스크립트가 429를 무시하고 곧바로 다시 보내는 상황
+
+async def light_user(client, stop, latencies, statuses):
+    while not stop.is_set():
+        start = time.perf_counter()
+        response = await client.post("/get_response", data={"message": "오늘 좀 우울해"})
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        if response.status_code == 200:
+            latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(0.5)
+
+async def measure(mode):
+    if mode == "fifo":
+        server.inbound_limiter = rate_limit.InboundLimiter({"llm": UNLIMITED, "cheap": UNLIMITED}, {"llm": UNLIMITED, "cheap": UNLIMITED})
+        server.upstream_scheduler = FifoScheduler(capacity=args.capacity, max_queued=10 ** 6)
+    else:
+        server.inbound_limiter = rate_limit.InboundLimiter(ip_limits={"llm": UNLIMITED, "cheap": UNLIMITED})  # 모두 같은 테스트 IP
+        server.upstream_scheduler = rate_limit.FairScheduler(capacity=args.capacity, max_queued=2)
+
+    heavy = await client_for("heavy@bench.com")
+    lights = [await client_for(f"light{i}@bench.com") for i in range(args.light_users)]
+    stop = asyncio.Event()
+    heavy_statuses, light_statuses, latencies, retry_headers = {}, {}, [], []
+    tasks = [asyncio.create_task(heavy_worker(heavy, stop, heavy_statuses, retry_headers)) for _ in range(args.heavy_concurrency)]
+    tasks += [asyncio.create_task(light_user(client, stop, latencies, light_statuses)) for client in lights]
+    await asyncio.sleep(args.seconds)
+    stop.set()
+    await asyncio.gather(*tasks)
+    for client in [heavy, *lights]:
+        await client.aclose()
+
+    p50, p95, worst = summary(latencies) if latencies else (float("inf"),) * 3
+    print(f"{mode:>4}: light users p50/p95/max {p50:7.1f}/{p95:7.1f}/{worst:7.1f} ms ({len(latencies)} ok, {light_statuses}), "
+          f"heavy user {heavy_statuses}, upstream {server.upstream_scheduler.stats()}")
+    return p95, retry_headers, heavy_statuses
+
+async def run():
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=server.app), base_url="http://bench") as client:
+        for email in ["heavy@bench.com", *[f"light{i}@bench.com" for i in range(args.light_users)]]:
+            await client.post("/api/signup", json={"name": "bench", "email": email, "password": "pw"})
+
+    await measure("fifo")
+    p95, retry_headers, heavy_statuses = await measure("fair")
+    if p95 > args.budget_ms:
+        print(f"FAIL: light user p95 {p95:.1f} ms exceeds {args.budget_ms} ms")
+        return 1
+    if not heavy_statuses.get(429) or not all(h and int(h) >= 1 for h in retry_headers):
+        print("FAIL: heavy user was not limited with Retry-After")
+        return 1
+    print("OK")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(run()))
@@ -0,0 +1,69 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : import_time.py
+# 설명        : app.py import 시간(-X importtime)을 측정하고 예산과 비교하는 벤치마크
+# 주요 기능   :
+#   1) 새 파이썬 프로세스에서 python -X importtime -c "import app" 실행
+#   2) 누적 import 시간이 큰 모듈 상위 N개 출력
+#   3) 총 시간이 예산을 넘거나, 지연 로딩 대상 모듈이 import되면 실패
+# 실행 방법   : backend 디렉터리에서 python benchmarks/import_time.py [--budget-ms 1500]
+# -----------------------------------------------------------------------------------
+
+import argparse
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# app import 시점에 불러오면 안 되는(첫 사용 시 로드되어야 하는) 모듈
+LAZY_MODULES = ["openai", "groq", "cohere", "rich", "googlesearch", "Ai.Model", "Ai.Chatbot", "Ai.RealtimeSearchEngine", "Ai.AppControl"]
+
+def measure(runs):
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", "sqlite://")
+    best = None
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import app"],
+            cwd=BACKEND_DIR, env=env, capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            raise SystemExit(proc.stderr[-2000:])
+        rows = {}
+        for line in proc.stderr.splitlines():
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+            _, cumulative_us, name = line[len("import time:"):].split("|")
+            rows[name.strip()] = int(cumulative_us)
+        if best is None or rows["app"] < best["app"]:
+            best = rows
+    return best
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("IMPORT_BUDGET_MS", "1500")))
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    rows = measure(args.runs)
+    total_ms = rows["app"] / 1000
+    top_level = {name: us for name, us in rows.items() if "." not in name}
+    for name, us in sorted(top_level.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{us / 1000:9.1f} ms  {name}")
+    print(f"import app: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms, best of {args.runs})")
+
+    failed = False
+    eager = [name for name in LAZY_MODULES if name in rows]
+    if eager:
+        print(f"FAIL: 지연 로딩 대상 모듈이 import 되었습니다: {', '.join(eager)}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print("FAIL: import 시간이 예산을 초과했습니다.")
+        failed = True
+    if not failed:
+        print("OK")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
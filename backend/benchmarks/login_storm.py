@@ -0,0 +1,114 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : login_storm.py
+# 설명        : 로그인 폭주 중 채팅 요청 지연 시간 벤치마크
+# 주요 기능   :
+#   1) 임시 SQLite DB와 앱(ASGI)을 같은 이벤트 루프에서 실행
+#   2) 채팅 요청(/get_response 인사 메시지)을 계속 보내며 지연 시간을 측정하는 동안 로그인 요청을 한꺼번에 보냄
+#   3) bcrypt를 핸들러 안에서 바로 실행하던 이전 방식(inline)과 전용 프로세스 풀 방식(pool)을 비교
+#   4) pool 방식에서 폭주 중 채팅 p95 지연 증가량이 예산을 넘으면 실패
+# 실행 방법   : backend 디렉터리에서 python benchmarks/login_storm.py [--logins N] [--rounds R]
+# -----------------------------------------------------------------------------------
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+DB_PATH = os.path.join(tempfile.mkdtemp(), "login_storm.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=100.0)
+    return parser.parse_args()
+
+args = parse_args()
+os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+
+import bcrypt
+import httpx
+import app as server
+import passwords
+import rate_limit
+
+# 채팅 요청을 계속 보내 지연 시간만 측정하므로 요청 수 제한은 풀어 둠
+UNLIMITED = rate_limit.Limit(10 ** 9, 1)
+server.inbound_limiter = rate_limit.InboundLimiter({"llm": UNLIMITED, "cheap": UNLIMITED}, {"llm": UNLIMITED, "cheap": UNLIMITED})
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 1) 이전 방식: 이벤트 루프에서 bcrypt를 바로 실행
+# ────────────────────────────────────────────────────────────────────────────────────
+async def inline_verify(password, hashed):
+    return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
+
+pool_verify = passwords.verify_password
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 2) 측정
+# ────────────────────────────────────────────────────────────────────────────────────
+def summary(latencies):
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if len(latencies) >= 20 else latencies[-1]
+    return statistics.median(latencies) * 1000, p95 * 1000, latencies[-1] * 1000
+
+async def chat_probe(client, stop, latencies):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.post("/get_response", data={"message": "안녕"})
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(0.01)
+
+async def measure(mode, logins):
+    passwords.verify_password = inline_verify if mode == "inline" else pool_verify
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as chat, \
+               httpx.AsyncClient(transport=transport, base_url="http://bench") as storm:
+        await chat.post("/api/login", json={"email": "chat@bench.com", "password": "pw"})
+
+        baseline, during = [], []
+        stop = asyncio.Event()
+        probe = asyncio.create_task(chat_probe(chat, stop, baseline))
+        await asyncio.sleep(1.0)
+        stop.set()
+        await probe
+
+        stop = asyncio.Event()
+        probe = asyncio.create_task(chat_probe(chat, stop, during))
+        start = time.perf_counter()
+        responses = await asyncio.gather(*[
+            storm.post("/api/login", json={"email": "storm@bench.com", "password": "pw"}) for _ in range(logins)
+        ])
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await probe
+
+    statuses = {}
+    for response in responses:
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+    base, storm_stats = summary(baseline), summary(during)
+    print(f"{mode:>6}: chat p50/p95/max baseline {base[0]:6.1f}/{base[1]:6.1f}/{base[2]:6.1f} ms, "
+          f"during storm {storm_stats[0]:6.1f}/{storm_stats[1]:6.1f}/{storm_stats[2]:7.1f} ms "
+          f"({len(during)} chats), {logins} logins in {elapsed:.1f}s {statuses}")
+    return base[1], storm_stats[1]
+
+async def run(logins, budget_ms):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=server.app), base_url="http://bench") as client:
+        for email in ("chat@bench.com", "storm@bench.com"):
+            await client.post("/api/signup", json={"name": "bench", "email": email, "password": "pw"})
+
+    await measure("inline", logins)
+    base_p95, storm_p95 = await measure("pool", logins)
+    if storm_p95 - base_p95 > budget_ms:
+        print(f"FAIL: chat p95 rose {storm_p95 - base_p95:.1f} ms during the login storm (budget {budget_ms} ms)")
+        return 1
+    print("OK")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(run(args.logins, args.budget_ms)))
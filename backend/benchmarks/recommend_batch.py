@@ -0,0 +1,135 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : recommend_batch.py
+# 설명        : 여러 음식의 추천 식당을 /get_response로 하나씩 받을 때와 /api/recommendations로 한 번에 받을 때 비교
+# 주요 기능   :
+#   1) 임시 SQLite DB와 앱(ASGI)을 같은 프로세스에서 실행, GPT·Places 호출은 고정 지연으로 대체하고 호출 수 기록
+#   2) 순차: 한 세션에서 "재추천"을 음식 수만큼 보내 음식마다 식당을 받음 (요청마다 Places 호출·채팅 로그 저장)
+#   3) 묶음: 같은 음식들 + 표기만 다른 위치의 같은 음식들 + 감정 몇 개를 한 번의 요청으로 조회
+#   4) 묶음 요청이 채팅 로그를 남기거나, 같은 검색을 중복 호출하거나, 순차보다 느리면 실패
+# 실행 방법   : backend 디렉터리에서 python benchmarks/recommend_batch.py [--upstream-ms MS]
+# -----------------------------------------------------------------------------------
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+
+DB_PATH = os.path.join(tempfile.mkdtemp(), "recommend_batch.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+os.environ["BCRYPT_ROUNDS"] = "4"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from sqlalchemy import func, select
+import app as server
+import models, rate_limit
+from Ai import SearchContent
+from Ai.Logic import RECOMMEND_FOODS
+from database import SessionLocal
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 1) GPT·Places 대신 고정 지연 + 호출 수 기록
+# ────────────────────────────────────────────────────────────────────────────────────
+class Upstream:
+    def __init__(self, delay):
+        self.delay = delay
+        self.places = []
+        self.gpt = 0
+        self.lock = threading.Lock()
+
+    def search(self, food, location, resolved, origin, key):
+        with self.lock:
+            self.places.append(key)
+        time.sleep(self.delay)
+        restaurants = [SearchContent.Restaurant(name=f"{food} {i}호점", address=key[1], latitude=37.5, longitude=127.0,
+                                                rating=4.0, reviews=100, place_id=f"{food}-{i}") for i in range(5)]
+        SearchContent._search_cache.set(key, restaurants)
+        return restaurants
+
+    def gpt_reply(self, text, recent_foods=None, chat_history=None, use_cache=True):
+        with self.lock:
+            self.gpt += 1
+        time.sleep(self.delay)
+        return "우울함", "김치찌개", "따뜻한 국물이 기분을 풀어 줄 거예요."
+
+def chat_rows():
+    with SessionLocal() as db:
+        return db.execute(select(func.count()).select_from(models.ChatLog)).scalar()
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 2) 측정
+# ────────────────────────────────────────────────────────────────────────────────────
+async def sequential(client, location):
+    session_id = (await client.post("/api/sessions", json={"title": "bench"})).json()["id"]
+    found = {}
+    for _ in RECOMMEND_FOODS:
+        response = await client.post("/get_response", data={"message": "다른거 추천", "session_id": session_id, "location": location})
+        body = response.json()
+        found[body["message"].split("그렇다면 ")[1].split("는 어떠세요")[0]] = body.get("restaurants", [])
+    return found
+
+async def batch(client, location):
+    response = await client.post("/api/recommendations", json={
+        "location": location,
+        "foods": RECOMMEND_FOODS,
+        "items": [{"food": food, "location": "강남구 근처"} for food in RECOMMEND_FOODS]  # 표기만 다른 같은 위치
+                 + [{"emotion": "우울해"}, {"emotion": "너무 우울해"}, {"emotion": "우울해", "location": "강남구"}],
+    })
+    return response.json()["results"]
+
+async def run(upstream_ms):
+    upstream = Upstream(upstream_ms / 1000)
+    SearchContent._search_places = upstream.search
+    server.classify_emotion_and_reply_with_gpt = upstream.gpt_reply
+    server.recommend_buffer.prefetch = lambda *a, **k: None
+    SearchContent.fetch_details = server.fetch_details = lambda restaurants: restaurants
+    unlimited = rate_limit.Limit(10 ** 9, 1)
+    server.inbound_limiter = rate_limit.InboundLimiter({"llm": unlimited, "cheap": unlimited}, {"llm": unlimited, "cheap": unlimited})
+
+    location = "강남"
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=server.app), base_url="http://bench") as client:
+        await client.post("/api/signup", json={"name": "bench", "email": "bench@bench.com", "password": "pw"})
+        await client.post("/api/login", json={"email": "bench@bench.com", "password": "pw"})
+
+        rows = chat_rows()
+        start = time.perf_counter()
+        found = await sequential(client, location)
+        sequential_ms = (time.perf_counter() - start) * 1000
+        sequential_rows, sequential_places = chat_rows() - rows, len(upstream.places)
+        print(f"sequential: {len(RECOMMEND_FOODS)} requests, {sequential_ms:7.1f} ms, "
+              f"{sequential_places} Places calls, {sequential_rows} chat rows")
+
+        SearchContent._search_cache.clear()
+        upstream.places.clear()
+        rows = chat_rows()
+        start = time.perf_counter()
+        results = await batch(client, location)
+        batch_ms = (time.perf_counter() - start) * 1000
+        batch_rows, distinct = chat_rows() - rows, len(set(upstream.places))
+        print(f"     batch: 1 request ({len(results)} items), {batch_ms:7.1f} ms, {len(upstream.places)} Places calls "
+              f"({distinct} distinct), {upstream.gpt} GPT calls, {batch_rows} chat rows")
+
+    ok = True
+    if batch_rows:
+        print("FAIL: batch request wrote chat rows")
+        ok = False
+    if len(upstream.places) != distinct or distinct != len(set(RECOMMEND_FOODS) | {"김치찌개"}):
+        print("FAIL: batch request repeated or missed Places searches")
+        ok = False
+    if any(not r["restaurants"] for r in results) or set(found) != set(RECOMMEND_FOODS):
+        print("FAIL: missing recommendations")
+        ok = False
+    if batch_ms > sequential_ms:
+        print("FAIL: batch request slower than sequential requests")
+        ok = False
+    print("OK" if ok else "FAIL")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--upstream-ms", type=float, default=200.0)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args.upstream_ms)))
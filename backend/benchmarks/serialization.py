@@ -0,0 +1,79 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : serialization.py
+# 설명        : 목록 API(/api/sessions/{id}/logs 등)의 조회·직렬화 경로 전후 비교 벤치마크
+# 주요 기능   :
+#   1) 임시 SQLite DB에 1,000개 / 10,000개 로그를 가진 세션 생성
+#   2) 이전 경로(ORM 객체 조회 → jsonable_encoder → json)와
+#      현재 경로(컬럼 Row 조회 → orjson)의 소요 시간 비교
+#   3) 두 경로의 JSON 결과가 같은지 확인하고, gzip 압축 후 크기 출력
+# 실행 방법   : backend 디렉터리에서 python benchmarks/serialization.py [--repeat N]
+# -----------------------------------------------------------------------------------
+
+import argparse
+import gzip
+import json
+import os
+import sys
+import tempfile
+import time
+
+DB_PATH = os.path.join(tempfile.mkdtemp(), "serialization_bench.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import insert
+import crud, models
+from database import SessionLocal
+from app import rows_response
+
+SAMPLE = "오늘은 비도 오고 기분이 좀 울적해서 따뜻한 국물 요리가 먹고 싶어요. 근처에 괜찮은 곳 있을까요?"
+
+def seed_session(db, user_id, rows):
+    session = crud.create_session(db, user_id=user_id, title=f"{rows} rows")
+    db.execute(insert(models.ChatLog), [
+        {"session_id": session.id, "user_id": user_id, "role": "user" if i % 2 else "assistant",
+         "message": f"{SAMPLE} ({i})", "url": "https://maps.google.com/?q=x" if i % 5 == 0 else None, "name": None}
+        for i in range(rows)
+    ])
+    db.commit()
+    return session.id
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 1) 비교할 두 경로
+# ────────────────────────────────────────────────────────────────────────────────────
+def before(db, session_id):
+    logs = crud.get_session_logs(db=db, session_id=session_id)
+    return JSONResponse(jsonable_encoder(logs)).body
+
+def after(db, session_id):
+    return rows_response(crud.get_session_log_rows(db=db, session_id=session_id)).body
+
+def timed(func, db, session_id, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        db.expunge_all()  # 매번 새로 조회하도록 identity map 비움
+        start = time.perf_counter()
+        body = func(db, session_id)
+        best = min(best, time.perf_counter() - start)
+    return best, body
+
+def run(repeat):
+    db = SessionLocal()
+    user_id = crud.create_user(db, name="bench", email="bench@bench", hashed_password="x").id
+    for rows in (1_000, 10_000):
+        session_id = seed_session(db, user_id, rows)
+        old_time, old_body = timed(before, db, session_id, repeat)
+        new_time, new_body = timed(after, db, session_id, repeat)
+        assert json.loads(old_body) == json.loads(new_body), "두 경로의 응답이 다릅니다."
+        print(f"{rows:>6} rows: before {old_time * 1000:7.1f} ms, after {new_time * 1000:7.1f} ms "
+              f"({old_time / new_time:.1f}x), body {len(new_body) / 1024:.0f} KB, gzip {len(gzip.compress(new_body)) / 1024:.0f} KB")
+    db.close()
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    sys.exit(run(args.repeat))
@@ -0,0 +1,93 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : soak_ai_memory.py
+# 설명        : Ai 모듈(Chatbot, RealtimeSearchEngine, FirstLayerDMM)의 메모리 안정성 소크 벤치마크
+# 주요 기능   :
+#   1) 외부 API(Groq, 구글 검색) 대신 고정 응답을 돌려주는 가짜 클라이언트·검색 제공자 주입
+#   2) 여러 스레드에서 지정된 횟수(기본 100,000회)만큼 호출
+#   3) 주기적으로 RSS(상주 메모리)를 측정하고, 워밍업 이후 증가량이 예산을 넘으면 실패
+#      (질의가 모두 달라 검색 결과 캐시가 계속 채워지므로, 캐시 예산을 작게 잡아 워밍업 안에 가득 차게 함)
+# 실행 방법   : backend 디렉터리에서 python benchmarks/soak_ai_memory.py [--calls N]
+# -----------------------------------------------------------------------------------
+
+import argparse
+import os
+import resource
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("CACHE_BACKEND", "memory")
+os.environ.setdefault("CACHE_MAX_BYTES", str(1024 * 1024))
+from Ai import Chatbot, RealtimeSearchEngine, Model
+from Ai.Clients import set_client
+from Ai.Conversation import ConversationHistory
+from Ai.WebSearch import FixtureSearchProvider, set_provider
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 1) 가짜 클라이언트
+#    - Groq 스트리밍 응답과 같은 구조(chunk.choices[0].delta.content)를 흉내냄
+# ────────────────────────────────────────────────────────────────────────────────────
+class FakeCompletions:
+    def create(self, messages, **kwargs):
+        answer = f"응답입니다. (메시지 {len(messages)}개)"
+        return iter([SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=answer))])])
+
+FakeClient = SimpleNamespace(chat=SimpleNamespace(completions=FakeCompletions()))
+
+def current_rss_mb():
+    # 리눅스에서는 현재 RSS, 그 외 환경에서는 최대 RSS를 사용합니다.
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+# ────────────────────────────────────────────────────────────────────────────────────
+# 2) 소크 실행
+# ────────────────────────────────────────────────────────────────────────────────────
+def run(calls, workers, budget_mb):
+    set_client("groq", FakeClient)
+    set_provider(FixtureSearchProvider())
+
+    shared = ConversationHistory()  # 모든 요청이 공유하는 이력 (파일 저장 없음)
+
+    def call(i):
+        query = f"테스트 질문 {i}"
+        Model.FirstLayerDMM("오늘 날씨 알려줘")
+        if i % 2:
+            Chatbot.Chatbot(query, history=shared)
+        else:
+            RealtimeSearchEngine.RealtimeSearchEngine(query, history=ConversationHistory())
+
+    warmup = min(calls // 10, 10_000)
+    samples = []
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        batch = max(calls // 20, 1)
+        for offset in range(0, calls, batch):
+            list(pool.map(call, range(offset, min(offset + batch, calls))))
+            samples.append((min(offset + batch, calls), current_rss_mb()))
+    elapsed = time.perf_counter() - start
+
+    baseline = next(rss for done, rss in samples if done >= warmup)
+    growth = samples[-1][1] - baseline
+    for done, rss in samples:
+        print(f"{done:>8} calls  rss={rss:8.1f} MB")
+    print(f"{calls} calls in {elapsed:.1f}s ({calls / elapsed:,.0f} calls/s), "
+          f"history={len(shared)} messages, rss growth after warmup={growth:+.1f} MB")
+    assert len(RealtimeSearchEngine.SystemChatBot) == 3, "SystemChatBot이 요청 중에 변경되었습니다."
+    if growth > budget_mb:
+        print(f"FAIL: RSS grew {growth:.1f} MB (budget {budget_mb} MB)")
+        return 1
+    print("OK")
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--budget-mb", type=float, default=5.0)
+    args = parser.parse_args()
+    sys.exit(run(args.calls, args.workers, args.budget_mb))
@@ -0,0 +1,420 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : cache.py
+# 설명        : 백엔드와 Ai 모듈이 함께 쓰는 공유 캐시 (여러 uvicorn 워커가 같은 캐시를 보도록 백엔드 교체 가능)
+# 주요 기능   :
+#   1) Cache: 이름공간(namespace) 단위 get / get_many / set / delete / clear, 적중률 통계
+#      (키는 정렬된 JSON 문자열로, 값은 orjson으로 직렬화 → 어떤 백엔드든 같은 방식으로 저장·복원)
+#      JSON으로 바로 표현되지 않는 값(Restaurant, 튜플 등)은 이름공간별 encode / decode 함수로 변환
+#   2) 교체 가능한 백엔드 (CACHE_BACKEND)
+#      - memory: 프로세스 내 LRU (바이트 예산 CACHE_MAX_BYTES)
+#      - sqlite: 같은 서버의 워커들이 함께 쓰는 SQLite 파일 (WAL)
+#      - redis : Redis 프로토콜(RESP) 서버 (여러 서버가 함께 사용)
+#   3) 모든 백엔드에서 같은 TTL 의미 (벽시계 기준 만료, 만료된 항목은 조회되지 않음)
+#   4) 백엔드 오류·깨진 항목은 요청을 실패시키지 않고 캐시 미스로 처리, 오류 수를 통계에 기록
+# 요구 모듈   : collections, hashlib, orjson, os, socket, sqlite3, sys, threading, time, urllib
+# -----------------------------------------------------------------------------------
+
+from collections import OrderedDict
+import hashlib
+import orjson
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+from urllib.parse import unquote, urlparse
+
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")  # memory | sqlite | redis
+CACHE_URL = os.getenv("CACHE_URL", "")  # sqlite: 파일 경로(상대 경로는 backend 디렉터리 기준), redis: redis://[:비밀번호@]호스트:포트/DB번호
+CACHE_PREFIX = os.getenv("CACHE_PREFIX", "maum:")  # 다른 서비스와 같은 Redis를 쓸 때 키 충돌 방지
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "100000"))
+CACHE_TIMEOUT = float(os.getenv("CACHE_TIMEOUT", "0.5"))
+
+MAX_KEY_LENGTH = 200  # 이보다 긴 키는 해시로 줄임
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+SQLITE_PATH = os.path.join(BACKEND_DIR, "Data", "cache.sqlite3")  # 실행 위치와 관계없이 같은 파일
+
+class CacheError(Exception):
+    """캐시 백엔드가 요청을 처리하지 못함 (연결 실패, 오류 응답 등)"""
+
+# ────────────────────────────────────────────────
+# 1) 백엔드
+#    - get_many(keys) -> {key: bytes}, set(key, data, ttl), delete(keys), clear(prefix), stats()
+#    - 값은 이미 직렬화된 bytes, 만료 시각은 time.time() 기준 (워커·서버가 달라도 같은 기준)
+# ────────────────────────────────────────────────
+class MemoryBackend:
+    """프로세스 내 LRU. 워커끼리 공유되지 않으므로 단일 프로세스·개발용."""
+    name = "memory"
+    ENTRY_OVERHEAD = 200  # 항목마다 값 외에 드는 대략적인 크기(바이트): dict 노드, (만료 시각, 값) 튜플 등
+
+    def _size(self, key, data):
+        # 작은 값(빈 검색 결과 등)이 많아도 예산이 지켜지도록 키와 항목 자체의 크기도 셈
+        return sys.getsizeof(key) + len(data) + self.ENTRY_OVERHEAD
+
+    def __init__(self, max_bytes=CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (expires, data)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get_many(self, keys):
+        now = time.time()
+        found = {}
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                if entry[0] <= now:
+                    self._remove(key)
+                    continue
+                self._entries.move_to_end(key)
+                found[key] = entry[1]
+        return found
+
+    def set(self, key, data, ttl):
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (time.time() + ttl, data)
+            self._bytes += self._size(key, data)
+            while self._bytes > self.max_bytes and self._entries:
+                old_key, (_, old) = self._entries.popitem(last=False)
+                self._bytes -= self._size(old_key, old)
+                self.evictions += 1
+
+    def delete(self, keys):
+        with self._lock:
+            for key in keys:
+                self._remove(key)
+
+    def clear(self, prefix):
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                self._remove(key)
+
+    def _remove(self, key):
+        # 호출 측에서 lock을 잡은 상태로 호출합니다.
+        entry = self._entries.pop(key, None)
+        if entry:
+            self._bytes -= self._size(key, entry[1])
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes, "max_bytes": self.max_bytes, "evictions": self.evictions}
+
+class SQLiteBackend:
+    """같은 서버의 여러 워커 프로세스가 함께 쓰는 SQLite 파일 캐시. (스레드마다 연결 하나, WAL 모드)"""
+    name = "sqlite"
+    PURGE_EVERY = 500  # set 이 횟수마다 만료 항목 정리·최대 개수 유지
+
+    def __init__(self, path=SQLITE_PATH, max_entries=CACHE_MAX_ENTRIES, timeout=CACHE_TIMEOUT):
+        self.path = path
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._local = threading.local()
+        self._sets = 0
+        conn = self.connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL NOT NULL)")
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_cache_expires ON cache (expires)")
+
+    def connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # 다른 워커가 쓰는 중이면 timeout의 10배까지 기다림 (쓰기는 짧으므로 보통 즉시 처리)
+            conn = sqlite3.connect(self.path, timeout=self.timeout * 10, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get_many(self, keys):
+        keys = list(keys)
+        found = {}
+        now = time.time()
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            rows = self.connection().execute(
+                f"SELECT key, value FROM cache WHERE key IN ({','.join('?' * len(chunk))}) AND expires > ?", (*chunk, now)
+            )
+            found.update(rows)
+        return found
+
+    def set(self, key, data, ttl):
+        conn = self.connection()
+        conn.execute("INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)", (key, data, time.time() + ttl))
+        self._sets += 1
+        if self._sets % self.PURGE_EVERY == 0:
+            conn.execute("DELETE FROM cache WHERE expires <= ?", (time.time(),))
+            conn.execute(
+                "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY expires "
+                "LIMIT max((SELECT count(*) FROM cache) - ?, 0))", (self.max_entries,)
+            )
+
+    def delete(self, keys):
+        self.connection().executemany("DELETE FROM cache WHERE key = ?", [(key,) for key in keys])
+
+    def clear(self, prefix):
+        # prefix로 시작하는 키 = [prefix, prefix의 마지막 글자 + 1) 범위 (기본 키 인덱스 사용)
+        end = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        self.connection().execute("DELETE FROM cache WHERE key >= ? AND key < ?", (prefix, end))
+
+    def stats(self):
+        return {"entries": self.connection().execute("SELECT count(*) FROM cache").fetchone()[0], "path": self.path}
+
+class RedisBackend:
+    """Redis 프로토콜(RESP2) 클라이언트. 스레드마다 연결 하나를 유지하고, 끊어진 연결은 한 번 다시 연결해 재시도.
+    연결에 실패하면 RETRY_AFTER초 동안은 연결을 시도하지 않고 바로 실패 (요청마다 연결 대기 시간이 더해지지 않게)"""
+    name = "redis"
+    RETRY_AFTER = 5
+
+    def __init__(self, url="redis://localhost:6379/0", timeout=CACHE_TIMEOUT):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self._local = threading.local()
+        self._down_until = 0
+        self.connects = 0
+
+    def _connect(self):
+        if self._down_until > time.monotonic():
+            raise CacheError(f"Redis 연결 대기 중 ({self.host}:{self.port})")
+        try:
+            sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        except OSError:
+            self._down_until = time.monotonic() + self.RETRY_AFTER
+            raise
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._local.conn = (sock, sock.makefile("rb"))
+        self.connects += 1
+        if self.password:
+            self.command("AUTH", self.password)
+        if self.db:
+            self.command("SELECT", self.db)
+
+    def _close(self):
+        conn = getattr(self._local, "conn", None)
+        self._local.conn = None
+        if conn:
+            conn[1].close()
+            conn[0].close()
+
+    def command(self, *args):
+        """명령 하나를 보내고 응답을 반환합니다. (우리가 쓰는 명령은 모두 다시 보내도 안전함)"""
+        for attempt in (0, 1):
+            reused = getattr(self._local, "conn", None) is not None
+            try:
+                if not reused:
+                    self._connect()
+                sock, reader = self._local.conn
+                sock.sendall(_encode(args))
+                return _read_reply(reader)
+            except OSError as e:
+                self._close()
+                if attempt or not reused:
+                    raise CacheError(f"Redis 연결 실패 ({self.host}:{self.port}): {e}") from e
+
+    def get_many(self, keys):
+        keys = list(keys)
+        if not keys:
+            return {}
+        values = self.command("MGET", *keys)
+        return {key: value for key, value in zip(keys, values) if value is not None}
+
+    def set(self, key, data, ttl):
+        self.command("SET", key, data, "PX", max(int(ttl * 1000), 1))
+
+    def delete(self, keys):
+        keys = list(keys)
+        if keys:
+            self.command("DEL", *keys)
+
+    def clear(self, prefix):
+        pattern = "".join("\\" + c if c in "*?[]\\" else c for c in prefix) + "*"
+        cursor = "0"
+        while True:
+            cursor, keys = self.command("SCAN", cursor, "MATCH", pattern, "COUNT", 500)
+            cursor = cursor.decode()
+            if keys:
+                self.command("DEL", *keys)
+            if cursor == "0":
+                return
+
+    def stats(self):
+        return {"server": f"{self.host}:{self.port}/{self.db}", "connects": self.connects}
+
+def _encode(args):
+    out = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if not isinstance(arg, bytes):
+            arg = str(arg).encode("utf-8")
+        out.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(out)
+
+def _read_reply(reader):
+    line = reader.readline()
+    if not line.endswith(b"\r\n"):
+        raise ConnectionError("응답 도중 연결이 끊어졌습니다.")
+    kind, rest = line[:1], line[1:-2]
+    if kind == b"+":
+        return rest.decode()
+    if kind == b"-":
+        raise CacheError(rest.decode())
+    if kind == b":":
+        return int(rest)
+    if kind == b"$":
+        size = int(rest)
+        if size < 0:
+            return None
+        data = reader.read(size + 2)
+        if len(data) != size + 2:
+            raise ConnectionError("응답 도중 연결이 끊어졌습니다.")
+        return data[:-2]
+    if kind == b"*":
+        size = int(rest)
+        return None if size < 0 else [_read_reply(reader) for _ in range(size)]
+    raise CacheError(f"알 수 없는 응답: {line!r}")
+
+# ────────────────────────────────────────────────
+# 2) 기본 백엔드 (CACHE_BACKEND / CACHE_URL, 첫 사용 시 생성)
+# ────────────────────────────────────────────────
+def create_backend(kind=CACHE_BACKEND, url=CACHE_URL):
+    if kind == "memory":
+        return MemoryBackend()
+    if kind == "sqlite":
+        return SQLiteBackend(os.path.join(BACKEND_DIR, url) if url else SQLITE_PATH)
+    if kind == "redis":
+        return RedisBackend(url or "redis://localhost:6379/0")
+    raise ValueError(f"알 수 없는 CACHE_BACKEND: {kind}")
+
+_backend = None
+_backend_lock = threading.Lock()
+_caches = {}  # namespace -> Cache (통계용)
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = create_backend()
+    return _backend
+
+def set_backend(backend):
+    """기본 백엔드를 교체합니다. (벤치마크·스크립트용, 백엔드를 지정하지 않은 모든 Cache에 적용)"""
+    global _backend
+    _backend = backend
+
+# ────────────────────────────────────────────────
+# 3) Cache 클래스
+#    - namespace: 키 앞에 붙는 이름 (clear는 이 이름공간만 비움)
+#    - ttl      : 기본 유지 시간(초), set에서 항목별로 지정 가능
+#    - backend  : 없으면 기본 백엔드 사용
+#    - encode   : 저장 전 값을 JSON으로 표현 가능한 값(dict, list, str, 숫자, None)으로 바꾸는 함수
+#    - decode   : 읽은 JSON 값을 원래 값으로 되돌리는 함수 (튜플은 list로 읽히므로 여기서 복원)
+#    - 백엔드 오류·깨진 항목은 미스(get) 또는 무시(set·delete)로 처리하고 errors에 기록
+# ────────────────────────────────────────────────
+class Cache:
+    def __init__(self, namespace, ttl=3600, backend=None, encode=None, decode=None):
+        self.namespace = namespace
+        self.ttl = ttl
+        self._backend = backend
+        self._encode = encode or (lambda value: value)
+        self._decode = decode or (lambda value: value)
+        self._prefix = f"{CACHE_PREFIX}{namespace}:"
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.errors = 0
+        _caches[namespace] = self
+
+    @property
+    def backend(self):
+        return self._backend or get_backend()
+
+    def _key(self, key):
+        # 같은 키는 프로세스·버전이 달라도 같은 문자열이 되도록 정렬된 JSON 사용 (튜플은 배열로 표현)
+        # 문자열 키도 JSON으로 바꿔야 '["a"]'와 ("a",)가 같은 키가 되지 않음
+        text = orjson.dumps(key, option=orjson.OPT_SORT_KEYS).decode("utf-8")
+        if len(text) > MAX_KEY_LENGTH:
+            text = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        return self._prefix + text
+
+    def _count(self, hits=0, misses=0, sets=0, errors=0):
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+            self.sets += sets
+            self.errors += errors
+
+    def _failed(self, action, e):
+        self._count(errors=1)
+        print(f"캐시 {action} 실패 ({self.namespace}): {e}")
+
+    def get(self, key, default=None):
+        found = self.get_many([key])
+        return found[key] if key in found else default
+
+    def get_many(self, keys):
+        """{원래 키: 값} (없거나 만료된 키는 빠짐)"""
+        keys = list(keys)
+        names = {self._key(key): key for key in keys}
+        try:
+            found = self.backend.get_many(list(names))
+        except Exception as e:
+            self._failed("조회", e)
+            found = {}
+        values = {}
+        for name, data in found.items():
+            try:
+                values[names[name]] = self._decode(orjson.loads(data))
+            except Exception as e:
+                self._failed("복원", e)  # 깨졌거나 형식이 바뀐 항목은 미스로 처리 (다음 set에서 덮어씀)
+        self._count(hits=len(values), misses=len(keys) - len(values))
+        return values
+
+    def set(self, key, value, ttl=None):
+        try:
+            data = orjson.dumps(self._encode(value))
+            self.backend.set(self._key(key), data, self.ttl if ttl is None else ttl)
+        except Exception as e:
+            self._failed("저장", e)
+        else:
+            self._count(sets=1)
+
+    def delete(self, *keys):
+        try:
+            self.backend.delete([self._key(key) for key in keys])
+        except Exception as e:
+            self._failed("삭제", e)
+
+    def clear(self):
+        try:
+            self.backend.clear(self._prefix)
+        except Exception as e:
+            self._failed("비우기", e)
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "sets": self.sets,
+                "errors": self.errors,
+                "hit_rate": (self.hits / total) if total else 0.0,
+            }
+
+def stats():
+    """백엔드 상태와 이름공간별 적중률 (이 워커 프로세스 기준)"""
+    backend = get_backend()
+    try:
+        backend_stats = backend.stats()
+    except Exception as e:
+        backend_stats = {"error": str(e)}
+    return {"backend": backend.name, **backend_stats, "namespaces": {ns: c.stats() for ns, c in _caches.items()}}
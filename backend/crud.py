@@ -4,12 +4,55 @@
 # -----------------------------------------------------------------------------------
 
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, delete, func, insert, literal, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+import os
 import uuid
+import zlib
 import datetime
+import orjson
 
 # models.py에서 정의한 테이블 클래스들을 가져옵니다.
 import models
+from session_cache import session_log_cache, LogRow
+
+# 대량 삭제 시 한 번의 DELETE 문으로 지울 최대 행 수
+DELETE_BATCH_SIZE = int(os.getenv("DELETE_BATCH_SIZE", "1000"))
+
+def _delete_in_batches(db: Session, model, *criteria, batch_size: int = DELETE_BATCH_SIZE):
+    """조건에 맞는 행을 객체로 불러오지 않고 batch_size개씩 DELETE 문으로 지웁니다. (커밋은 호출 측에서)"""
+    deleted = 0
+    while True:
+        ids = select(model.id).where(*criteria).limit(batch_size).scalar_subquery()
+        result = db.execute(delete(model).where(model.id.in_(ids)).execution_options(synchronize_session=False))
+        deleted += result.rowcount
+        if result.rowcount < batch_size:
+            return deleted
+
+# ────────────────────────────────────────────────
+# 버전 스탬프 관련 함수 (ETag / 조건부 GET)
+# ────────────────────────────────────────────────
+def sessions_scope(user_id: int): return f"sessions:{user_id}"
+def bookmarks_scope(user_id: int): return f"bookmarks:{user_id}"
+def logs_scope(session_id: str): return f"logs:{session_id}"
+
+def get_version(db: Session, scope: str) -> int:
+    """범위의 현재 버전을 조회합니다. (기본 키 조회 한 번, 기록이 없으면 0)"""
+    version = db.execute(select(models.VersionStamp.version).where(models.VersionStamp.scope == scope)).scalar()
+    return version or 0
+
+def bump_version(db: Session, *scopes: str):
+    """범위들의 버전을 1씩 올립니다. 데이터 변경과 같은 트랜잭션에서 호출하고 커밋은 호출 측에서 합니다."""
+    V = models.VersionStamp
+    dialect = db.get_bind().dialect.name
+    for scope in scopes:
+        if dialect in ("postgresql", "sqlite"):
+            insert = pg_insert if dialect == "postgresql" else sqlite_insert
+            stmt = insert(V).values(scope=scope, version=1)
+            db.execute(stmt.on_conflict_do_update(index_elements=[V.scope], set_={"version": V.version + 1}))
+        elif db.execute(update(V).where(V.scope == scope).values(version=V.version + 1)).rowcount == 0:
+            db.add(V(scope=scope, version=1))
 
 # ────────────────────────────────────────────────
 # User 관련 함수
@@ -26,14 +69,36 @@ def create_user(db: Session, name: str, email: str, hashed_password: str):
     db.refresh(db_user)
     return db_user
 
+def update_password(db: Session, user_id: int, hashed_password: str):
+    """사용자의 비밀번호 해시를 교체합니다. (작업 비용 변경 후 재해시용)"""
+    db.execute(update(models.User).where(models.User.id == user_id).values(hashed_password=hashed_password))
+    db.commit()
+
 def delete_user(db: Session, user_id: int):
-    """ID를 기준으로 사용자를 삭제합니다."""
-    db_user = db.query(models.User).filter(models.User.id == user_id).first()
-    if db_user:
-        # 참고: 이 작업이 성공하려면 User와 연결된 다른 데이터(채팅, 즐겨찾기 등)들이
-        # 데이터베이스 모델(models.py)에서 'ondelete="CASCADE"' 옵션으로 설정되어 있어야 합니다.
-        db.delete(db_user)
+    """ID를 기준으로 사용자와 그 사용자의 세션·채팅 로그·즐겨찾기를 삭제합니다.
+
+    하위 데이터를 ORM 객체로 불러오지 않고 자식 테이블부터 DELETE 문으로 나눠 지우며,
+    전체 작업은 하나의 트랜잭션으로 커밋합니다. (ON DELETE CASCADE가 없는 기존 DB에서도 동작)
+    """
+    sessions = select(models.ChatSession.id).where(models.ChatSession.user_id == user_id)
+    session_ids = get_session_ids(db, user_id)
+    try:
+        _delete_in_batches(db, models.ChatLog, models.ChatLog.session_id.in_(sessions))
+        _delete_in_batches(db, models.ArchivedLogText, models.ArchivedLogText.user_id == user_id)
+        db.execute(delete(models.ArchivedSession).where(models.ArchivedSession.user_id == user_id).execution_options(synchronize_session=False))
+        _delete_in_batches(db, models.Bookmark, models.Bookmark.user_id == user_id)
+        # 세션별 로그 버전은 세션 ID(재사용되지 않음)에 묶여 있으므로 세션과 함께 지웁니다.
+        log_scopes = select(literal(logs_scope("")) + models.ChatSession.id).where(models.ChatSession.user_id == user_id)
+        db.execute(delete(models.VersionStamp).where(models.VersionStamp.scope.in_(log_scopes)))
+        db.execute(delete(models.ChatSession).where(models.ChatSession.user_id == user_id).execution_options(synchronize_session=False))
+        db.execute(delete(models.User).where(models.User.id == user_id).execution_options(synchronize_session=False))
+        # 같은 ID가 재사용되더라도 이전 ETag와 겹치지 않도록 버전은 지우지 않고 올립니다.
+        bump_version(db, sessions_scope(user_id), bookmarks_scope(user_id))
         db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    session_log_cache.invalidate(*session_ids)
     return True
 
 # ────────────────────────────────────────────────
@@ -44,43 +109,96 @@ def create_session(db: Session, user_id: int, title: str):
     session_id = str(uuid.uuid4())
     db_session = models.ChatSession(id=session_id, user_id=user_id, title=title)
     db.add(db_session)
+    bump_version(db, sessions_scope(user_id))
     db.commit()
     db.refresh(db_session)
     return db_session
 
 def get_sessions(db: Session, user_id: int):
-    # lazy='joined' 덕분에 더 이상 복잡한 서브쿼리가 필요 없습니다.
     return db.query(models.ChatSession).filter(models.ChatSession.user_id == user_id).order_by(desc(models.ChatSession.created_at)).all()
 
-def get_session_logs(db: Session, session_id: str):
-    return db.query(models.ChatLog).filter(models.ChatLog.session_id == session_id).order_by(models.ChatLog.created_at).all()
+def get_session_ids(db: Session, user_id: int):
+    """사용자의 세션 ID 목록을 조회합니다. (사용자 삭제 전 세션별 메모리 상태를 정리할 때 사용)"""
+    return db.execute(select(models.ChatSession.id).where(models.ChatSession.user_id == user_id)).scalars().all()
 
-def delete_session(db: Session, session_id: str):
-    db_session = db.query(models.ChatSession).filter(models.ChatSession.id == session_id).first()
-    if db_session:
-        db.delete(db_session)
-        db.commit()
-        return True
-    return False # 세션이 없어도 오류를 일으키지 않고 False 반환
+def session_belongs_to(db: Session, session_id: str, user_id: int):
+    """세션이 해당 사용자의 것인지 확인합니다. (세션·로그를 불러오지 않는 단일 조회)"""
+    return db.execute(
+        select(models.ChatSession.id).where(models.ChatSession.id == session_id, models.ChatSession.user_id == user_id)
+    ).first() is not None
+
+def get_session_rows(db: Session, user_id: int):
+    """세션 목록을 필요한 컬럼만 담은 Row로 조회합니다. (목록 API용, 로그는 불러오지 않음)"""
+    S = models.ChatSession
+    return db.execute(
+        select(S.id, S.title, S.created_at).where(S.user_id == user_id).order_by(desc(S.created_at))
+    ).all()
+
+def get_session_log_rows(db: Session, session_id: str, last: int = None):
+    """특정 세션의 채팅 로그를 ORM 객체 대신 컬럼 Row로 시간순 조회합니다. (last가 있으면 최근 last개만)"""
+    rehydrate_session(db, session_id)
+    L = models.ChatLog
+    stmt = select(L.id, L.session_id, L.user_id, L.role, L.message, L.url, L.name, L.created_at).where(L.session_id == session_id)
+    if last is None:
+        return db.execute(stmt.order_by(L.created_at, L.id)).all()
+    return db.execute(stmt.order_by(L.created_at.desc(), L.id.desc()).limit(last)).all()[::-1]
+
+def get_recent_logs(db: Session, session_id: str, limit: int = None, version: int = None):
+    """세션의 최근 limit개(없으면 전체) 로그를 시간순으로 반환합니다.
+
+    최근 사용된 세션은 메모리 캐시(session_log_cache)에서 바로 응답하고,
+    없으면 최근 HOT_SESSION_MESSAGES개를 조회해 캐시를 채웁니다.
+    캐시는 세션 로그 버전(version, 없으면 조회)이 같을 때만 사용합니다.
+    """
+    if version is None:
+        version = get_version(db, logs_scope(session_id))
+    cached = session_log_cache.get(session_id, version, limit)
+    if cached is not None:
+        return cached
+
+    window = session_log_cache.max_messages
+    token = session_log_cache.begin_fill(session_id)
+    # begin_fill 이후에 버전을 다시 읽어야, 그 사이 이 프로세스에서 저장된 로그(append)가 fill을 취소해 중복되지 않습니다.
+    version = get_version(db, logs_scope(session_id))
+    # 한 건 더 조회해서 세션 전체가 캐시 범위 안에 들어오는지 확인합니다.
+    rows = get_session_log_rows(db, session_id, last=window + 1)
+    complete = len(rows) <= window
+    session_log_cache.fill(session_id, token, rows, complete, version)
+
+    if complete or (limit is not None and limit <= window):
+        return rows[-limit:] if limit else rows
+    return get_session_log_rows(db, session_id, last=limit)
 
 def get_session_logs(db: Session, session_id: str):
     """특정 세션의 모든 채팅 로그를 조회합니다."""
+    rehydrate_session(db, session_id)
     return db.query(models.ChatLog).filter(models.ChatLog.session_id == session_id).order_by(models.ChatLog.created_at).all()
 
 def delete_session(db: Session, session_id: str):
-    """특정 채팅 세션을 삭제합니다."""
-    db_session = db.query(models.ChatSession).filter(models.ChatSession.id == session_id).first()
-    if db_session:
-        db.delete(db_session)
+    """특정 채팅 세션을 삭제합니다. (로그를 불러오지 않고 DELETE 문으로 나눠 지움, 세션이 없으면 False)"""
+    user_id = db.execute(select(models.ChatSession.user_id).where(models.ChatSession.id == session_id)).scalar()
+    if user_id is None:
+        return False
+    try:
+        _delete_in_batches(db, models.ChatLog, models.ChatLog.session_id == session_id)
+        db.execute(delete(models.ArchivedLogText).where(models.ArchivedLogText.session_id == session_id))
+        db.execute(delete(models.ArchivedSession).where(models.ArchivedSession.session_id == session_id))
+        db.execute(delete(models.ChatSession).where(models.ChatSession.id == session_id).execution_options(synchronize_session=False))
+        db.execute(delete(models.VersionStamp).where(models.VersionStamp.scope == logs_scope(session_id)))
+        bump_version(db, sessions_scope(user_id))
         db.commit()
-        return True
-    return False
+    except Exception:
+        db.rollback()
+        raise
+    session_log_cache.invalidate(session_id)
+    return True
 
 # ────────────────────────────────────────────────
 # Chat Log 관련 함수
 # ────────────────────────────────────────────────
 def save_chat(db: Session, session_id: str, user_id: int, message: str, url: str, name: str, role: str):
-    """채팅 메시지를 DB에 저장합니다."""
+    """채팅 메시지를 DB에 저장합니다. (보관된 세션이면 이전 로그를 먼저 되돌림)"""
+    rehydrate_session(db, session_id)
     db_log = models.ChatLog(
         session_id=session_id,
         user_id=user_id,
@@ -90,34 +208,221 @@ def save_chat(db: Session, session_id: str, user_id: int, message: str, url: str
         role=role
     )
     db.add(db_log)
+    bump_version(db, logs_scope(session_id))
+    db.flush()  # id·created_at을 받아 둠 (eager_defaults)
+    row = LogRow(db_log.id, session_id, user_id, role, message, url, name, db_log.created_at)
+    version = get_version(db, logs_scope(session_id))  # 커밋 전까지 버전 행이 잠겨 있으므로 이 저장이 올린 값
     db.commit()
+    session_log_cache.append(session_id, row, version)
+
+# ────────────────────────────────────────────────
+# 내보내기(Export) 관련 함수
+# ────────────────────────────────────────────────
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+def iter_export_records(db: Session, user_id: int, batch_size: int = EXPORT_BATCH_SIZE):
+    """사용자의 모든 세션과 채팅 로그를 한 건씩 dict로 내보냅니다.
+
+    ORM 객체를 만들지 않고 필요한 컬럼만 서버 측 커서(stream_results)로 batch_size개씩 읽으므로,
+    로그 수와 관계없이 메모리 사용량이 일정합니다. 세션이 바뀔 때마다 세션 레코드를 먼저 내보냅니다.
+    보관된 세션은 되돌리지 않고 보관 데이터를 풀어서 내보냅니다.
+    """
+    S, L, A = models.ChatSession, models.ChatLog, models.ArchivedSession
+    archived = set(db.execute(select(A.session_id).where(A.user_id == user_id)).scalars())
+    stmt = (
+        select(S.id, S.title, S.created_at, L.id, L.role, L.message, L.url, L.name, L.created_at)
+        .outerjoin(L, L.session_id == S.id)
+        .where(S.user_id == user_id)
+        .order_by(S.created_at, S.id, L.created_at, L.id)
+        .execution_options(stream_results=True, yield_per=batch_size)
+    )
+    current = None
+    for session_id, title, session_created, log_id, role, message, url, name, log_created in db.execute(stmt):
+        if session_id != current:
+            current = session_id
+            yield {"type": "session", "id": session_id, "title": title,
+                   "created_at": session_created.isoformat() if session_created else None}
+            if session_id in archived:
+                data = db.execute(select(A.data).where(A.session_id == session_id)).scalar()
+                for log in _unpack_logs(data) if data else []:
+                    yield {"type": "log", "session_id": session_id, "role": log["role"], "message": log["message"],
+                           "url": log["url"], "name": log["name"],
+                           "created_at": log["created_at"].isoformat() if log["created_at"] else None}
+        if log_id is not None:
+            yield {"type": "log", "session_id": session_id, "role": role, "message": message, "url": url, "name": name,
+                   "created_at": log_created.isoformat() if log_created else None}
+
+# ────────────────────────────────────────────────
+# 오래된 대화 보관(Archive) 관련 함수
+#   - ARCHIVE_IDLE_DAYS일 넘게 새 메시지가 없는 세션의 로그를 chat_logs에서 빼내
+#     세션당 한 행(chat_log_archive)에 압축 보관 → chat_logs에는 최근에 사용된 세션만 남음
+#   - 보관된 세션을 열면(로그 조회·메시지 저장) 원래 id·시각 그대로 chat_logs로 되돌림
+#   - 로그 내용은 바뀌지 않으므로 로그 버전(ETag·메모리 캐시)은 올리지 않음
+#   - 보관된 로그도 검색되도록 로그마다 본문만 chat_log_archive_text에 남기고(search_index가 인덱스에 넣음),
+#     검색 결과의 나머지 내용은 get_archived_logs로 보관 데이터에서 풀어 씀
+# ────────────────────────────────────────────────
+ARCHIVE_IDLE_DAYS = int(os.getenv("ARCHIVE_IDLE_DAYS", "30"))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "200"))  # archive_idle_sessions 한 번에 보관할 최대 세션 수
+ARCHIVE_COLUMNS = ("id", "user_id", "role", "message", "url", "name", "created_at")
+
+def _pack_logs(logs):
+    return zlib.compress(orjson.dumps([[log[c] for c in ARCHIVE_COLUMNS] for log in logs]), 6)
+
+def _unpack_logs(data):
+    logs = [dict(zip(ARCHIVE_COLUMNS, values)) for values in orjson.loads(zlib.decompress(data))]
+    for log in logs:
+        log["created_at"] = datetime.datetime.fromisoformat(log["created_at"]) if log["created_at"] else None
+    return logs
+
+def _search_body(log):
+    # search_index의 채팅 로그 본문과 같은 형식 (message || ' ' || coalesce(name, ''))
+    return log["message"] + " " + (log["name"] or "")
+
+def _add_archived_text(db, user_id, session_id, logs):
+    if logs:
+        db.execute(insert(models.ArchivedLogText), [
+            {"id": log["id"], "session_id": session_id, "user_id": user_id, "body": _search_body(log), "created_at": log["created_at"]}
+            for log in logs
+        ])
+
+def _as_utc(value):
+    # SQLite는 시간대 없는 UTC 시각, PostgreSQL은 시간대가 있는 시각을 돌려줍니다.
+    return value.replace(tzinfo=datetime.timezone.utc) if value.tzinfo is None else value
+
+def archive_session(db: Session, session_id: str, cutoff: datetime.datetime):
+    """세션의 마지막 메시지가 cutoff 이전이면 로그를 압축 보관하고 True를 반환합니다."""
+    S, L, A = models.ChatSession, models.ChatLog, models.ArchivedSession
+    try:
+        # PostgreSQL은 세션 행을 잠가 보관하는 동안 같은 세션에 로그가 저장되지 않게 하고,
+        # SQLite는 아래 DELETE부터 커밋까지 쓰기 잠금을 가집니다.
+        user_id = db.execute(select(S.user_id).where(S.id == session_id).with_for_update()).scalar()
+        rows = db.execute(
+            delete(L).where(L.session_id == session_id)
+            .returning(*(getattr(L, c) for c in ARCHIVE_COLUMNS))
+            .execution_options(synchronize_session=False)
+        ).all()
+        # 확인과 삭제 사이에 새 메시지가 저장되었으면 보관하지 않음
+        if user_id is None or not rows or any(r.created_at is None or _as_utc(r.created_at) >= cutoff for r in rows):
+            db.rollback()
+            return False
+
+        # 되돌리기와 보관이 겹쳐 보관 행이 남아 있는 드문 경우에는 합쳐서 다시 보관
+        existing = db.get(A, session_id)
+        _add_archived_text(db, user_id, session_id, [dict(r._mapping) for r in rows])
+        logs = (_unpack_logs(existing.data) if existing else []) + [dict(r._mapping) for r in rows]
+        logs.sort(key=lambda log: log["id"])
+        if existing:
+            existing.data, existing.log_count = _pack_logs(logs), len(logs)
+        else:
+            db.add(A(session_id=session_id, user_id=user_id, log_count=len(logs), data=_pack_logs(logs)))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return True
+
+def archive_idle_sessions(db: Session, idle_days: int = ARCHIVE_IDLE_DAYS, limit: int = ARCHIVE_BATCH_SIZE):
+    """마지막 메시지가 idle_days일보다 오래된 세션을 최대 limit개 보관하고, 보관한 세션 수를 반환합니다."""
+    L = models.ChatLog
+    cutoff = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=idle_days)
+    session_ids = db.execute(
+        select(L.session_id).group_by(L.session_id).having(func.max(L.created_at) < cutoff).limit(limit)
+    ).scalars().all()
+    db.rollback()  # 조회 트랜잭션을 끝내고 세션마다 따로 커밋
+
+    archived = 0
+    for session_id in session_ids:
+        try:
+            archived += archive_session(db, session_id, cutoff)
+        except Exception as e:
+            print(f"세션 보관 실패 ({session_id}): {e}")
+    return archived
+
+def rehydrate_session(db: Session, session_id: str):
+    """보관된 세션이면 로그를 원래 id·시각 그대로 chat_logs로 되돌리고 True를 반환합니다.
+    (보관되지 않은 세션은 기본 키 조회 한 번으로 끝남)"""
+    A = models.ArchivedSession
+    if db.execute(select(A.session_id).where(A.session_id == session_id)).first() is None:
+        return False
+    try:
+        # 동시에 같은 세션을 되돌리는 요청이 있어도 보관 행을 지운 한쪽만 로그를 넣음
+        data = db.execute(
+            delete(A).where(A.session_id == session_id).returning(A.data).execution_options(synchronize_session=False)
+        ).scalar()
+        if data is None:
+            db.rollback()
+            return False
+        # 검색 인덱스에서 같은 로그가 두 번 잡히지 않도록 검색용 본문을 먼저 지움
+        db.execute(delete(models.ArchivedLogText).where(models.ArchivedLogText.session_id == session_id))
+        db.execute(insert(models.ChatLog), [{**log, "session_id": session_id} for log in _unpack_logs(data)])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return True
+
+def get_archived_logs(db: Session, session_ids):
+    """보관된 세션들의 로그를 풀어 {로그 id: 로그 dict}로 반환합니다. (검색 결과 채우기용)"""
+    A = models.ArchivedSession
+    logs = {}
+    for session_id, data in db.execute(select(A.session_id, A.data).where(A.session_id.in_(list(session_ids)))):
+        for log in _unpack_logs(data):
+            logs[log["id"]] = {**log, "session_id": session_id}
+    return logs
+
+def index_archived_sessions(db: Session):
+    """검색용 본문 없이 보관된 세션(검색 본문을 만들기 전 버전에서 보관)의 본문을 만들고 그 세션 수를 반환합니다."""
+    A, T = models.ArchivedSession, models.ArchivedLogText
+    missing = select(A.session_id).where(~select(T.id).where(T.session_id == A.session_id).exists())
+    indexed = 0
+    for session_id in db.execute(missing).scalars().all():
+        user_id, data = db.execute(select(A.user_id, A.data).where(A.session_id == session_id)).one()
+        _add_archived_text(db, user_id, session_id, _unpack_logs(data))
+        db.commit()
+        indexed += 1
+    return indexed
 
 # ────────────────────────────────────────────────
 # Bookmark 관련 함수
 # ────────────────────────────────────────────────
 def add_bookmark(db: Session, user_id: int, name: str, url: str):
-    """즐겨찾기를 추가합니다."""
+    """즐겨찾기를 추가하고 추가된 즐겨찾기를 반환합니다."""
     db_bookmark = models.Bookmark(user_id=user_id, name=name, url=url)
     db.add(db_bookmark)
+    bump_version(db, bookmarks_scope(user_id))
     db.commit()
+    db.refresh(db_bookmark)
+    return db_bookmark
 
 def get_bookmarks(db: Session, user_id: int):
     """사용자의 모든 즐겨찾기를 조회합니다."""
     return db.query(models.Bookmark).filter(models.Bookmark.user_id == user_id).order_by(models.Bookmark.created_at).all()
 
-def update_bookmark(db: Session, bookmark_id: int, name: str, url: str):
-    db_bookmark = db.query(models.Bookmark).filter(models.Bookmark.id == bookmark_id).first()
+def get_bookmark_rows(db: Session, user_id: int):
+    """사용자의 즐겨찾기를 ORM 객체 대신 컬럼 Row로 조회합니다."""
+    B = models.Bookmark
+    return db.execute(
+        select(B.id, B.user_id, B.name, B.url, B.created_at).where(B.user_id == user_id).order_by(B.created_at)
+    ).all()
+
+def update_bookmark(db: Session, user_id: int, bookmark_id: int, name: str, url: str):
+    """사용자 본인의 즐겨찾기만 수정합니다. (없거나 다른 사용자의 것이면 None)"""
+    db_bookmark = db.query(models.Bookmark).filter(models.Bookmark.id == bookmark_id, models.Bookmark.user_id == user_id).first()
     if db_bookmark: # 북마크가 존재할 때만 업데이트
         db_bookmark.name = name
         db_bookmark.url = url
+        bump_version(db, bookmarks_scope(user_id))
         db.commit()
+        db.refresh(db_bookmark)
         return db_bookmark
     return None # 북마크가 없으면 None 반환
 
-def delete_bookmark(db: Session, bookmark_id: int):
-    db_bookmark = db.query(models.Bookmark).filter(models.Bookmark.id == bookmark_id).first()
+def delete_bookmark(db: Session, user_id: int, bookmark_id: int):
+    """사용자 본인의 즐겨찾기만 삭제합니다. (없거나 다른 사용자의 것이면 False)"""
+    db_bookmark = db.query(models.Bookmark).filter(models.Bookmark.id == bookmark_id, models.Bookmark.user_id == user_id).first()
     if db_bookmark: # 북마크가 존재할 때만 삭제
         db.delete(db_bookmark)
+        bump_version(db, bookmarks_scope(user_id))
         db.commit()
         return True
     return False # 북마크가 없어도 오류 없이 False 반환
\ No newline at end of file
@@ -0,0 +1,85 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : idempotency.py
+# 설명        : 클라이언트가 보낸 Idempotency-Key로 재시도 요청의 중복 처리를 막는 저장소
+# 주요 기능   :
+#   1) (사용자, 키) 단위로 첫 요청의 응답을 짧은 TTL 동안 보관하여 재시도 시 그대로 반환
+#   2) 첫 요청이 아직 처리 중이면 같은 키의 요청은 그 결과를 기다림 (LLM·Places 호출, 로그 저장이 한 번만 일어남)
+#   3) 같은 키로 내용이 다른 요청이 오면 KeyReusedError
+#   4) 최대 항목 수(LRU)·TTL로 메모리 제한, 통계 제공
+# -----------------------------------------------------------------------------------
+
+from collections import OrderedDict
+from concurrent.futures import Future
+import threading
+import time
+
+class KeyReusedError(Exception):
+    """같은 Idempotency-Key가 다른 내용의 요청에 사용됨"""
+
+# ────────────────────────────────────────────────
+# IdempotencyStore 클래스
+#    - claim   : 키를 선점하면 (Future, True), 이미 있으면 (기존 Future, False)
+#    - complete: 선점한 요청의 응답을 저장 (TTL은 완료 시각부터)
+#    - fail    : 선점한 요청이 실패하면 키를 풀어 다음 재시도가 다시 실행되게 함
+# ────────────────────────────────────────────────
+class IdempotencyStore:
+    def __init__(self, ttl=300, max_entries=10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> [fingerprint, Future, expires(None=처리 중)]
+        self._lock = threading.Lock()
+        self.replayed = 0
+        self.waited = 0
+        self.stored = 0
+
+    def claim(self, key, fingerprint):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[2] is not None and entry[2] < time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                future = Future()
+                self._entries[key] = [fingerprint, future, None]
+                self._evict()
+                return future, True
+            if entry[0] != fingerprint:
+                raise KeyReusedError(key)
+            if entry[1].done():
+                self.replayed += 1
+            else:
+                self.waited += 1
+            return entry[1], False
+
+    def complete(self, key, result):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                entry[2] = time.monotonic() + self.ttl
+                self._entries.move_to_end(key)
+                self.stored += 1
+        if entry:
+            entry[1].set_result(result)
+
+    def fail(self, key, error):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        if entry:
+            entry[1].set_exception(error)
+
+    def _evict(self):
+        # 호출 측에서 lock을 잡은 상태로 호출합니다. 처리 중인 항목은 제거하지 않습니다.
+        while len(self._entries) > self.max_entries:
+            oldest = next((k for k, entry in self._entries.items() if entry[2] is not None), None)
+            if oldest is None:
+                return
+            del self._entries[oldest]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "stored": self.stored,
+                "replayed": self.replayed,
+                "waited": self.waited,
+            }
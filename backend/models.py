@@ -1,6 +1,7 @@
 # models.py
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, LargeBinary, Index, inspect, text
 from sqlalchemy.orm import relationship, subqueryload
+from sqlalchemy.schema import AddConstraint
 from sqlalchemy.sql import func
 from database import Base
 
@@ -11,23 +12,38 @@ class User(Base):
     email = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
     
-    sessions = relationship("ChatSession", back_populates="owner", lazy="joined")
-    bookmarks = relationship("Bookmark", back_populates="owner", lazy="joined")
+    # 하위 데이터는 crud.delete_user가 DELETE 문으로 먼저 지우므로(DB의 ON DELETE CASCADE는 보조 수단),
+    # 삭제할 때 ORM이 목록을 불러오지 않도록 passive_deletes 사용
+    sessions = relationship("ChatSession", back_populates="owner", passive_deletes=True)
+    bookmarks = relationship("Bookmark", back_populates="owner", passive_deletes=True)
 
 class ChatSession(Base):
     __tablename__ = "chat_sessions"
+    # 사용자별 최신순 세션 목록, 내보내기, 사용자 삭제(외래 키 확인 포함)에 사용
+    __table_args__ = (Index("ix_chat_sessions_user_created", "user_id", "created_at"),)
     id = Column(String, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     title = Column(String)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     owner = relationship("User", back_populates="sessions")
-    logs = relationship("ChatLog", back_populates="session", cascade="all, delete-orphan", lazy="joined")
+    # 세션을 불러올 때마다 전체 로그를 JOIN하지 않도록 로그는 접근할 때만 조회
+    logs = relationship("ChatLog", back_populates="session", cascade="all, delete-orphan", passive_deletes=True)
 
 class ChatLog(Base):
     __tablename__ = "chat_logs"
+    # INSERT 시 RETURNING으로 id·created_at을 함께 받아, 저장 직후 다시 조회하지 않고 캐시에 넣을 수 있게 함
+    __mapper_args__ = {"eager_defaults": True}
+    # 세션별 시간순 조회, 보관 대상(마지막 메시지 시각) 찾기, 세션 단위 삭제에 사용
+    # 사용자별 최근 로그 조회(짧은 검색어 검색)에 사용
+    __table_args__ = (
+        Index("ix_chat_logs_session_created", "session_id", "created_at"),
+        Index("ix_chat_logs_user_created", "user_id", "created_at"),
+        # 보관(archive)으로 빠진 로그의 id를 SQLite가 새 로그에 다시 쓰지 않도록 (되돌릴 때 원래 id 그대로 넣음)
+        {"sqlite_autoincrement": True},
+    )
     id = Column(Integer, primary_key=True, index=True)
-    session_id = Column(String, ForeignKey("chat_sessions.id"), nullable=False)
+    session_id = Column(String, ForeignKey("chat_sessions.id", ondelete="CASCADE"), nullable=False)
     user_id = Column(Integer, nullable=False)
     role = Column(String, nullable=False)
     message = Column(Text, nullable=False)
@@ -37,12 +53,71 @@ class ChatLog(Base):
     
     session = relationship("ChatSession", back_populates="logs")
 
+class ArchivedSession(Base):
+    # 오래 사용되지 않은 세션의 로그를 세션당 한 행으로 압축 보관 (chat_logs에는 최근에 사용된 세션만 남김)
+    # 보관된 세션을 열면 crud.rehydrate_session이 원래 id·시각 그대로 chat_logs로 되돌리고 이 행을 지움
+    __tablename__ = "chat_log_archive"
+    session_id = Column(String, ForeignKey("chat_sessions.id", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(Integer, nullable=False, index=True)
+    log_count = Column(Integer, nullable=False)
+    data = Column(LargeBinary, nullable=False)  # zlib으로 압축한 JSON 배열 [[id, user_id, role, message, url, name, created_at], ...]
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class ArchivedLogText(Base):
+    # 보관된 로그의 검색용 본문 (로그마다 한 행, search_index가 채팅 로그와 같은 검색 인덱스에 넣음)
+    # 보관할 때 만들고 되돌리거나 세션을 지울 때 함께 지움, 나머지 내용은 chat_log_archive에서 풀어 씀
+    __tablename__ = "chat_log_archive_text"
+    __table_args__ = (Index("ix_chat_log_archive_text_user_created", "user_id", "created_at"),)
+    id = Column(Integer, primary_key=True)  # 원래 chat_logs.id
+    session_id = Column(String, ForeignKey("chat_sessions.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(Integer, nullable=False)
+    body = Column(Text, nullable=False)  # message + " " + name (채팅 로그의 검색 본문과 같음)
+    created_at = Column(DateTime(timezone=True))
+
 class Bookmark(Base):
     __tablename__ = "bookmark"
+    # 사용자별 즐겨찾기 목록(추가순), 사용자 삭제에 사용
+    __table_args__ = (Index("ix_bookmark_user_created", "user_id", "created_at"),)
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     name = Column(String)
     url = Column(String)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
-    owner = relationship("User", back_populates="bookmarks")
\ No newline at end of file
+    owner = relationship("User", back_populates="bookmarks")
+
+class VersionStamp(Base):
+    # 목록(세션·즐겨찾기: 사용자 단위, 로그: 세션 단위)이 바뀔 때마다 1씩 증가하는 버전 (ETag 생성용)
+    __tablename__ = "version_stamps"
+    scope = Column(String, primary_key=True)  # 예: "sessions:1", "bookmarks:1", "logs:<session_id>"
+    version = Column(Integer, nullable=False, default=0)
+
+# create_all은 이미 있는 테이블의 외래 키를 바꾸지 않으므로, ON DELETE 동작이 모델과 다른 외래 키는 서버 시작 시 다시 만듭니다.
+def stale_foreign_keys(engine):
+    """DB의 외래 키 중 ON DELETE 동작이 모델과 다른 것 [(테이블, DB의 제약 이름, 모델의 ForeignKeyConstraint), ...]"""
+    inspector = inspect(engine)
+    stale = []
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = inspector.get_foreign_keys(table.name)
+        for constraint in table.foreign_key_constraints:
+            wanted = (constraint.ondelete or "NO ACTION").upper()
+            for fk in existing:
+                if fk["constrained_columns"] == constraint.column_keys and fk["referred_table"] == constraint.referred_table.name \
+                        and (fk.get("options", {}).get("ondelete") or "NO ACTION").upper() != wanted:
+                    stale.append((table, fk["name"], constraint))
+    return stale
+
+def sync_foreign_keys(engine):
+    """ON DELETE 동작이 다른 외래 키를 지우고 모델대로 다시 만든 뒤 바꾼 개수를 반환합니다.
+    SQLite는 ALTER TABLE로 외래 키를 바꿀 수 없어 건너뜁니다. (crud의 삭제 함수는 CASCADE 없이도 자식 행부터 지움)"""
+    if engine.dialect.name == "sqlite":
+        return 0
+    quote = engine.dialect.identifier_preparer.quote
+    stale = stale_foreign_keys(engine)
+    with engine.begin() as conn:
+        for table, name, constraint in stale:
+            conn.execute(text(f"ALTER TABLE {quote(table.name)} DROP CONSTRAINT {quote(name)}"))
+            conn.execute(AddConstraint(constraint))
+    return len(stale)
@@ -0,0 +1,122 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : passwords.py
+# 설명        : 비밀번호 해시(bcrypt)를 이벤트 루프 밖의 전용 프로세스 풀에서 처리하는 모듈
+# 주요 기능   :
+#   1) hash_password / verify_password: 프로세스 풀에서 bcrypt를 실행하고 결과를 await
+#   2) 동시에 대기·처리 중인 작업 수를 PASSWORD_QUEUE_LIMIT으로 제한, 초과 시 PasswordBusyError
+#      (로그인 폭주 시 채팅 요청까지 느려지지 않도록 초과분은 503으로 거절)
+#   3) BCRYPT_ROUNDS로 작업 비용(work factor) 설정, needs_rehash로 비용이 바뀐 해시 판별
+#   4) 작업 프로세스가 죽어 풀이 깨지면(BrokenProcessPool) 새 풀을 만들고 그 작업을 한 번 다시 실행
+# 요구 모듈   : bcrypt, asyncio, concurrent.futures, multiprocessing, os, threading
+# -----------------------------------------------------------------------------------
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import os
+import threading
+import bcrypt
+
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+PASSWORD_WORKERS = int(os.getenv("PASSWORD_WORKERS", str(min(2, os.cpu_count() or 1))))
+PASSWORD_QUEUE_LIMIT = int(os.getenv("PASSWORD_QUEUE_LIMIT", str(PASSWORD_WORKERS * 8)))
+PASSWORD_NICE = int(os.getenv("PASSWORD_NICE", "5"))  # 작업 프로세스의 CPU 우선순위를 낮춰 요청 처리에 양보
+
+class PasswordBusyError(Exception):
+    """대기 중인 비밀번호 작업이 한도를 넘음 (잠시 후 다시 시도)"""
+
+# ────────────────────────────────────────────────
+# 1) 작업 프로세스에서 실행되는 함수 (pickle 가능하도록 모듈 최상위에 정의)
+# ────────────────────────────────────────────────
+def _init_worker(nice):
+    if nice:
+        os.nice(nice)
+
+def _hash(password, rounds):
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds)).decode("utf-8")
+
+def _check(password, hashed):
+    return bcrypt.checkpw(password, hashed)
+
+# ────────────────────────────────────────────────
+# 2) 프로세스 풀과 동시 작업 수 제한
+#    - 풀은 첫 사용 시 생성 (서버 시작·import 비용 없음)
+#    - 작업 프로세스는 fork 대신 forkserver(없으면 spawn)로 시작
+#      (스레드·DB 연결·이벤트 루프가 있는 서버 프로세스를 복제하지 않음)
+#    - 깨진 풀은 버리고 다음 작업에서 새로 만듦 (깨진 풀은 이후 모든 submit을 거절하므로)
+# ────────────────────────────────────────────────
+_pool = None
+_pending = 0
+_restarts = 0
+_lock = threading.Lock()
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        with _lock:
+            if _pool is None:
+                method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                _pool = ProcessPoolExecutor(max_workers=PASSWORD_WORKERS, mp_context=multiprocessing.get_context(method),
+                                            initializer=_init_worker, initargs=(PASSWORD_NICE,))
+    return _pool
+
+def _discard_pool(pool):
+    global _pool, _restarts
+    with _lock:
+        if _pool is not pool:
+            return  # 다른 요청이 이미 새 풀로 바꿈
+        _pool = None
+        _restarts += 1
+    print("비밀번호 작업 프로세스 풀이 깨져 새로 만듭니다.")
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def _release(_future):
+    global _pending
+    with _lock:
+        _pending -= 1
+
+async def _submit(func, *args):
+    global _pending
+    for attempt in (0, 1):
+        pool = _get_pool()
+        with _lock:
+            if _pending >= PASSWORD_QUEUE_LIMIT:
+                raise PasswordBusyError()
+            _pending += 1
+        try:
+            future = pool.submit(func, *args)
+        except BaseException as e:
+            _release(None)
+            if not isinstance(e, BrokenProcessPool) or attempt:
+                raise
+            _discard_pool(pool)
+            continue
+        future.add_done_callback(_release)
+        try:
+            return await asyncio.wrap_future(future)
+        except BrokenProcessPool:
+            _discard_pool(pool)
+            if attempt:
+                raise
+
+# ────────────────────────────────────────────────
+# 3) 공개 함수
+# ────────────────────────────────────────────────
+async def hash_password(password: str, rounds: int = None) -> str:
+    return await _submit(_hash, password.encode("utf-8"), rounds or BCRYPT_ROUNDS)
+
+async def verify_password(password: str, hashed: str) -> bool:
+    return await _submit(_check, password.encode("utf-8"), hashed.encode("utf-8"))
+
+def needs_rehash(hashed: str) -> bool:
+    """해시의 작업 비용이 현재 BCRYPT_ROUNDS와 다르면 True. (형식: $2b$<rounds>$...)"""
+    try:
+        return int(hashed.split("$")[2]) != BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
+def stats():
+    with _lock:
+        return {"pending": _pending, "queue_limit": PASSWORD_QUEUE_LIMIT, "workers": PASSWORD_WORKERS, "rounds": BCRYPT_ROUNDS,
+                "restarts": _restarts}
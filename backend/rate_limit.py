@@ -0,0 +1,289 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : rate_limit.py
+# 설명        : /get_response 요청 수 제한(사용자·IP별 토큰 버킷)과 GPT·Places 호출 차례의 공정한 분배
+# 주요 기능   :
+#   1) InboundLimiter: 사용자별·IP별 토큰 버킷을 GPT·Places를 쓰는 요청(llm)과
+#      바로 답하는 인사·감사 요청(cheap)에 따로 적용, 초과 시 RateLimited(retry_after)
+#   2) 버킷 저장소: 프로세스 내(기본) 또는 공유 캐시 백엔드(sqlite / redis, 여러 워커가 같은 예산 사용)
+#      (공유 저장소를 만들거나 조회하다 오류가 나면 이 프로세스의 버킷으로 대신 제한, 공유 저장소 조회는 이벤트 루프 밖 스레드에서 실행)
+#   3) FairScheduler: 동시에 처리할 GPT·Places 요청 수를 제한하고, 기다리는 요청은 사용자별로 번갈아 처리
+#      (요청을 많이 보내는 사용자가 다른 사용자의 차례를 빼앗지 못함, 사용자당 대기 수 제한)
+# 요구 모듈   : cache, asyncio, collections, contextlib, os, threading, time
+# -----------------------------------------------------------------------------------
+
+import asyncio
+from collections import OrderedDict, deque, namedtuple
+from contextlib import asynccontextmanager
+import os
+import threading
+import time
+import cache
+
+# "요청 수/초": 한 번에 보낼 수 있는 최대 요청 수, 그만큼이 다시 채워지는 시간
+RATE_USER_LLM = os.getenv("RATE_USER_LLM", "10/60")
+RATE_USER_CHEAP = os.getenv("RATE_USER_CHEAP", "60/60")
+RATE_IP_LLM = os.getenv("RATE_IP_LLM", "30/60")  # 같은 IP(회사·학교 NAT 등)를 여러 사용자가 쓸 수 있어 넉넉하게
+RATE_IP_CHEAP = os.getenv("RATE_IP_CHEAP", "180/60")
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")  # memory | shared (cache.py의 CACHE_BACKEND 사용)
+
+class RateLimited(Exception):
+    """요청 수 제한을 넘음 (retry_after초 후 다시 시도)"""
+    def __init__(self, retry_after):
+        super().__init__(retry_after)
+        self.retry_after = retry_after
+
+Limit = namedtuple("Limit", ["burst", "period"])
+
+def parse_limit(spec):
+    burst, period = spec.split("/")
+    return Limit(int(burst), float(period))
+
+# ────────────────────────────────────────────────
+# 1) 토큰 버킷
+#    - 버킷마다 "버킷이 다시 가득 차는 시각"(tat) 하나만 저장하는 GCRA 방식
+#      (요청 하나가 period / burst초만큼 tat를 뒤로 미루고, tat가 지금보다 period 넘게 뒤면 거절)
+#    - 저장소의 take(key, limit, cost)는 허용이면 0, 거절이면 다시 시도할 수 있을 때까지의 초를 반환
+#    - blocking: take가 파일 잠금·네트워크를 기다릴 수 있으면 True (비동기 경로에서는 스레드에서 실행)
+# ────────────────────────────────────────────────
+def _advance(tat, now, limit, cost):
+    """(새 tat | None, retry_after)"""
+    new_tat = max(tat or now, now) + cost * limit.period / limit.burst
+    over = new_tat - now - limit.period
+    if over > 0:
+        return None, over
+    return new_tat, 0.0
+
+class LocalBuckets:
+    name = "memory"
+    blocking = False
+
+    def __init__(self, max_keys=100000):
+        self.max_keys = max_keys
+        self._tats = OrderedDict()  # key -> tat (time.monotonic 기준)
+        self._lock = threading.Lock()
+
+    def take(self, key, limit, cost=1):
+        now = time.monotonic()
+        with self._lock:
+            new_tat, retry_after = _advance(self._tats.get(key), now, limit, cost)
+            if new_tat is not None:
+                self._tats[key] = new_tat
+                self._tats.move_to_end(key)
+                # 가장 오래전에 쓰인 버킷부터 제거 (이미 가득 찬 버킷은 없는 것과 같음)
+                while len(self._tats) > self.max_keys:
+                    self._tats.popitem(last=False)
+            return retry_after
+
+class SQLiteBuckets:
+    """같은 서버의 워커들이 공유 캐시 SQLite 파일의 rate_limits 테이블을 함께 사용"""
+    name = "sqlite"
+    blocking = True
+    PURGE_EVERY = 1000
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._takes = 0
+        self.backend.connection().execute("CREATE TABLE IF NOT EXISTS rate_limits (key TEXT PRIMARY KEY, tat REAL NOT NULL)")
+
+    def take(self, key, limit, cost=1):
+        conn = self.backend.connection()
+        now = time.time()
+        # 읽고 고치는 사이 다른 워커가 끼어들지 않도록 쓰기 잠금을 먼저 잡음
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tat FROM rate_limits WHERE key = ?", (key,)).fetchone()
+            new_tat, retry_after = _advance(row[0] if row else None, now, limit, cost)
+            if new_tat is not None:
+                conn.execute("INSERT OR REPLACE INTO rate_limits (key, tat) VALUES (?, ?)", (key, new_tat))
+            self._takes += 1
+            if self._takes % self.PURGE_EVERY == 0:
+                conn.execute("DELETE FROM rate_limits WHERE tat < ?", (now,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return retry_after
+
+class RedisBuckets:
+    """Redis 서버에서 Lua 스크립트로 읽고 고치기를 한 번에 실행 (여러 서버가 같은 예산 사용)"""
+    name = "redis"
+    blocking = True
+    SCRIPT = """
+local now, interval, period, cost = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3]), tonumber(ARGV[4])
+local tat = tonumber(redis.call('GET', KEYS[1]) or ARGV[1])
+if tat < now then tat = now end
+local new_tat = tat + cost * interval
+local over = new_tat - now - period
+if over > 0 then return tostring(over) end
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000))
+return '0'
+"""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def take(self, key, limit, cost=1):
+        reply = self.backend.command("EVAL", self.SCRIPT, 1, key, repr(time.time()), limit.period / limit.burst, limit.period, cost)
+        return float(reply)
+
+def create_buckets(kind=RATE_LIMIT_BACKEND):
+    if kind == "memory":
+        return LocalBuckets()
+    if kind == "shared":
+        backend = cache.get_backend()
+        if backend.name == "sqlite":
+            return SQLiteBuckets(backend)
+        if backend.name == "redis":
+            return RedisBuckets(backend)
+        return LocalBuckets()
+    raise ValueError(f"알 수 없는 RATE_LIMIT_BACKEND: {kind}")
+
+# ────────────────────────────────────────────────
+# 2) InboundLimiter 클래스
+#    - kind: "llm"(GPT·Places를 쓰는 요청) 또는 "cheap"(서버에서 바로 답하는 요청)
+#    - 사용자 버킷을 먼저 확인하고, 통과하면 IP 버킷을 확인
+# ────────────────────────────────────────────────
+class InboundLimiter:
+    CREATE_RETRY = 30  # 저장소를 만들지 못했을 때 다시 시도하기까지의 초
+
+    def __init__(self, user_limits=None, ip_limits=None, buckets=None):
+        self.user_limits = user_limits or {"llm": parse_limit(RATE_USER_LLM), "cheap": parse_limit(RATE_USER_CHEAP)}
+        self.ip_limits = ip_limits or {"llm": parse_limit(RATE_IP_LLM), "cheap": parse_limit(RATE_IP_CHEAP)}
+        self._buckets = buckets
+        self._fallback = LocalBuckets()
+        self._retry_at = 0
+        self._lock = threading.Lock()
+        self.allowed = {"llm": 0, "cheap": 0}
+        self.limited = {}  # "user:llm" 등 -> 거절 수
+        self.errors = 0
+
+    @property
+    def buckets(self):
+        """버킷 저장소 (만들지 못하면 CREATE_RETRY초 동안 이 프로세스의 버킷을 대신 사용)"""
+        if self._buckets is None:
+            if time.monotonic() < self._retry_at:
+                return self._fallback
+            try:
+                self._buckets = create_buckets()
+            except Exception as e:
+                with self._lock:
+                    self.errors += 1
+                self._retry_at = time.monotonic() + self.CREATE_RETRY
+                print(f"요청 수 제한 저장소를 만들지 못해 프로세스 내 버킷 사용: {e}")
+                return self._fallback
+        return self._buckets
+
+    def max_cost(self, kind):
+        """요청 하나가 쓸 수 있는 최대 토큰 수 (이보다 큰 요청은 기다려도 통과할 수 없음)"""
+        return min(self.user_limits[kind].burst, self.ip_limits[kind].burst)
+
+    def _take(self, key, limit, cost):
+        try:
+            return self.buckets.take(key, limit, cost)
+        except Exception as e:
+            with self._lock:
+                self.errors += 1
+            print(f"요청 수 제한 저장소 오류, 프로세스 내 버킷 사용: {e}")
+            return self._fallback.take(key, limit, cost)
+
+    def check(self, user_id, ip, kind, cost=1):
+        """제한을 넘으면 RateLimited를 발생시킵니다. (cost: 요청 하나가 쓰는 토큰 수, 여러 건을 묶은 요청용)"""
+        for scope, subject, limit in (("user", user_id, self.user_limits[kind]), ("ip", ip, self.ip_limits[kind])):
+            if subject is None:
+                continue
+            retry_after = self._take(f"{cache.CACHE_PREFIX}rl:{scope}:{kind}:{subject}", limit, cost)
+            if retry_after:
+                with self._lock:
+                    self.limited[f"{scope}:{kind}"] = self.limited.get(f"{scope}:{kind}", 0) + 1
+                raise RateLimited(retry_after)
+        with self._lock:
+            self.allowed[kind] += 1
+
+    async def check_async(self, user_id, ip, kind, cost=1):
+        """check와 같지만 공유 저장소를 쓰면 스레드에서 실행해 이벤트 루프를 막지 않습니다."""
+        if self.buckets.blocking:
+            await asyncio.to_thread(self.check, user_id, ip, kind, cost)
+        else:
+            self.check(user_id, ip, kind, cost)
+
+    def stats(self):
+        with self._lock:
+            return {"backend": self.buckets.name, "allowed": dict(self.allowed), "limited": dict(self.limited), "errors": self.errors}
+
+# ────────────────────────────────────────────────
+# 3) FairScheduler 클래스
+#    - capacity  : 동시에 실행할 최대 작업 수
+#    - max_queued: 키(사용자)마다 기다릴 수 있는 최대 요청 수, 넘으면 RateLimited
+#    - 자리가 나면 기다리는 사용자들 사이를 돌아가며 한 요청씩 실행 (사용자별 FIFO + 라운드 로빈)
+#    - 이벤트 루프 안에서만 사용합니다. (스레드 잠금 없음)
+# ────────────────────────────────────────────────
+class FairScheduler:
+    def __init__(self, capacity=8, max_queued=2):
+        self.capacity = capacity
+        self.max_queued = max_queued
+        self.active = 0
+        self._queues = OrderedDict()  # key -> deque[Future], 앞쪽 키가 다음 차례
+        self.queued_total = 0
+        self.rejected = 0
+        self.max_wait = 0.0
+
+    async def acquire(self, key):
+        if self.active < self.capacity and not self._queues:
+            self.active += 1
+            return
+        queue = self._queues.setdefault(key, deque())
+        if len(queue) >= self.max_queued:
+            if not queue:
+                del self._queues[key]
+            self.rejected += 1
+            raise RateLimited(1)
+        future = asyncio.get_running_loop().create_future()
+        queue.append(future)
+        self.queued_total += 1
+        start = time.monotonic()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()  # 차례를 받은 직후 취소됨 → 다음 요청에 넘김
+            else:
+                # release()가 취소된 future를 이미 꺼냈을 수 있음
+                if future in queue:
+                    queue.remove(future)
+                if not queue and self._queues.get(key) is queue:
+                    del self._queues[key]
+            raise
+        self.max_wait = max(self.max_wait, time.monotonic() - start)
+
+    def release(self):
+        # 자리를 줄이지 않고 다음 사용자의 가장 오래 기다린 요청에 바로 넘김
+        while self._queues:
+            key, queue = next(iter(self._queues.items()))
+            future = queue.popleft()
+            if queue:
+                self._queues.move_to_end(key)
+            else:
+                del self._queues[key]
+            if not future.done():
+                future.set_result(None)
+                return
+        self.active -= 1
+
+    @asynccontextmanager
+    async def slot(self, key):
+        await self.acquire(key)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self):
+        return {
+            "active": self.active,
+            "capacity": self.capacity,
+            "waiting": sum(len(q) for q in self._queues.values()),
+            "waiting_users": len(self._queues),
+            "queued_total": self.queued_total,
+            "rejected": self.rejected,
+            "max_wait": round(self.max_wait, 3),
+        }
@@ -0,0 +1,233 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : search_index.py
+# 설명        : 채팅 로그(ChatLog.message, ChatLog.name)와 즐겨찾기(Bookmark.name) 전문 검색 모듈
+#               (보관된 로그는 로그마다 남긴 검색용 본문(ArchivedLogText.body)으로 함께 검색)
+# 주요 기능   :
+#   1) init_search_index: DB 종류에 맞는 검색 인덱스를 생성 (여러 번 호출해도 안전)
+#      - PostgreSQL: pg_trgm 확장 + GIN 트라이그램 인덱스
+#      - SQLite    : FTS5(trigram 토크나이저) 가상 테이블 + 동기화 트리거
+#   2) search: 현재 사용자의 데이터만 대상으로 관련도 순 페이지 단위 검색
+#      - 3글자 이상 단어는 트라이그램 인덱스로 찾고, 함께 적힌 짧은 단어는 찾은 행 안에서만 LIKE로 거름
+#      - 짧은 단어(1~2글자)만 있으면 트라이그램 인덱스를 쓸 수 없으므로
+#        (user_id, created_at) 인덱스로 그 사용자의 최근 SHORT_QUERY_RECENT_ROWS개 로그·즐겨찾기만 LIKE 검색
+#        (오래된 기록까지 찾으려면 3글자 이상 단어를 함께 입력)
+#   3) is_partial: 위처럼 최근 행만 살펴본 검색인지 (API 응답의 partial로 알려 줌)
+#   4) 보관된 로그가 찾아지면 보관 데이터에서 내용(메시지·이름·링크)을 풀어 일반 로그와 같은 형식으로 반환
+# -----------------------------------------------------------------------------------
+
+import os
+
+from sqlalchemy import text, select, literal, null, or_, union_all
+from sqlalchemy.orm import Session
+
+import crud
+import models
+
+# 트라이그램 인덱스는 3글자 이상일 때만 사용할 수 있습니다.
+MIN_INDEXED_LENGTH = 3
+# 짧은 단어만으로 검색할 때 살펴볼 최근 로그·즐겨찾기 수 (각각)
+SHORT_QUERY_RECENT_ROWS = int(os.getenv("SEARCH_SHORT_RECENT_ROWS", "2000"))
+
+# ────────────────────────────────────────────────
+# 인덱스 생성
+# ────────────────────────────────────────────────
+POSTGRES_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_chat_logs_message_trgm ON chat_logs USING gin (message gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_chat_logs_name_trgm ON chat_logs USING gin (name gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_bookmark_name_trgm ON bookmark USING gin (name gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_chat_log_archive_text_body_trgm ON chat_log_archive_text USING gin (body gin_trgm_ops)",
+]
+
+# search_fts의 rowid는 채팅 로그면 id*2, 즐겨찾기면 id*2+1 (삭제·수정 트리거가 rowid로 바로 찾도록)
+# 보관된 로그는 chat_logs에서 빠진 뒤 검색용 본문이 같은 rowid(원래 id*2)로 들어감
+SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS search_fts USING fts5(user_id UNINDEXED, body, tokenize='trigram')",
+    """CREATE TRIGGER IF NOT EXISTS chat_logs_search_ai AFTER INSERT ON chat_logs BEGIN
+        INSERT INTO search_fts(rowid, user_id, body) VALUES (new.id * 2, new.user_id, new.message || ' ' || coalesce(new.name, ''));
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS chat_logs_search_au AFTER UPDATE OF message, name ON chat_logs BEGIN
+        UPDATE search_fts SET body = new.message || ' ' || coalesce(new.name, '') WHERE rowid = new.id * 2;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS chat_logs_search_ad AFTER DELETE ON chat_logs BEGIN
+        DELETE FROM search_fts WHERE rowid = old.id * 2;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS chat_log_archive_text_search_ai AFTER INSERT ON chat_log_archive_text BEGIN
+        INSERT INTO search_fts(rowid, user_id, body) VALUES (new.id * 2, new.user_id, new.body);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS chat_log_archive_text_search_ad AFTER DELETE ON chat_log_archive_text BEGIN
+        DELETE FROM search_fts WHERE rowid = old.id * 2;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS bookmark_search_ai AFTER INSERT ON bookmark BEGIN
+        INSERT INTO search_fts(rowid, user_id, body) VALUES (new.id * 2 + 1, new.user_id, coalesce(new.name, ''));
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS bookmark_search_au AFTER UPDATE OF name ON bookmark BEGIN
+        UPDATE search_fts SET body = coalesce(new.name, '') WHERE rowid = new.id * 2 + 1;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS bookmark_search_ad AFTER DELETE ON bookmark BEGIN
+        DELETE FROM search_fts WHERE rowid = old.id * 2 + 1;
+    END""",
+]
+
+SQLITE_BACKFILL = [
+    "INSERT INTO search_fts(rowid, user_id, body) SELECT id * 2, user_id, message || ' ' || coalesce(name, '') FROM chat_logs",
+    "INSERT INTO search_fts(rowid, user_id, body) SELECT id * 2 + 1, user_id, coalesce(name, '') FROM bookmark",
+    "INSERT INTO search_fts(rowid, user_id, body) SELECT id * 2, user_id, body FROM chat_log_archive_text",
+]
+
+def init_search_index(engine):
+    """검색 인덱스를 만듭니다. 테이블 생성(create_all) 이후 서버 시작 시 한 번 호출합니다."""
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as conn:
+            for statement in POSTGRES_DDL:
+                conn.execute(text(statement))
+    elif engine.dialect.name == "sqlite":
+        with engine.begin() as conn:
+            exists = conn.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'search_fts'")).first()
+            for statement in SQLITE_DDL:
+                conn.execute(text(statement))
+            # 기존 DB에 처음 인덱스를 만들 때만 기존 데이터를 채워 넣습니다.
+            if not exists:
+                for statement in SQLITE_BACKFILL:
+                    conn.execute(text(statement))
+
+# ────────────────────────────────────────────────
+# 검색
+# ────────────────────────────────────────────────
+def _row(kind, id, session_id, message, name, url, created_at, score):
+    return {
+        "type": kind,
+        "id": id,
+        "session_id": session_id,
+        "message": message,
+        "name": name,
+        "url": url,
+        "created_at": created_at,
+        "score": score,
+    }
+
+def _escape_like(query):
+    return query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def _term_patterns(terms, prefix="p"):
+    """단어별 LIKE 패턴 (모든 단어가 포함된 행만 찾음)"""
+    return {f"{prefix}{i}": f"%{_escape_like(term)}%" for i, term in enumerate(terms)}
+
+def _search_postgres(db, user_id, query, limit, offset):
+    # 단어마다 GIN 트라이그램 인덱스를 쓰는 ILIKE 조건을 AND로 묶고, word_similarity로 정렬합니다.
+    patterns = _term_patterns(query.split())
+    log_terms = " AND ".join(f"(message ILIKE :{p} OR name ILIKE :{p})" for p in patterns)
+    bookmark_terms = " AND ".join(f"name ILIKE :{p}" for p in patterns)
+    archived_terms = " AND ".join(f"body ILIKE :{p}" for p in patterns)
+    statement = text(f"""
+        SELECT 'log' AS kind, id, session_id, message, name, url, created_at,
+               greatest(word_similarity(:q, message), word_similarity(:q, coalesce(name, ''))) AS score
+          FROM chat_logs
+         WHERE user_id = :user_id AND {log_terms}
+        UNION ALL
+        SELECT 'bookmark', id, NULL, name, name, url, created_at, word_similarity(:q, coalesce(name, ''))
+          FROM bookmark
+         WHERE user_id = :user_id AND {bookmark_terms}
+        UNION ALL
+        SELECT 'archived', id, session_id, NULL, NULL, NULL, created_at, word_similarity(:q, body)
+          FROM chat_log_archive_text
+         WHERE user_id = :user_id AND {archived_terms}
+         ORDER BY score DESC, created_at DESC
+         LIMIT :limit OFFSET :offset
+    """)
+    rows = db.execute(statement, {"q": query, "user_id": user_id, "limit": limit, "offset": offset, **patterns})
+    return [_row(*row) for row in rows]
+
+def _search_sqlite(db, user_id, long_terms, short_terms, limit, offset):
+    # 긴 단어마다 따옴표로 감싸 부분 문자열 검색(AND)으로 만들고, bm25 순위(rank)로 정렬합니다.
+    # 짧은 단어는 MATCH로 찾은 행의 본문에서만 LIKE로 확인합니다.
+    match = " ".join('"' + term.replace('"', '""') + '"' for term in long_terms)
+    patterns = _term_patterns(short_terms, prefix="s")
+    short_filter = "".join(f" AND f.body LIKE :{p} ESCAPE '\\'" for p in patterns)
+    statement = text(f"""
+        SELECT CASE WHEN f.rowid % 2 = 1 THEN 'bookmark' WHEN l.id IS NULL THEN 'archived' ELSE 'log' END AS kind,
+               coalesce(l.id, a.id, b.id), coalesce(l.session_id, a.session_id), coalesce(l.message, b.name),
+               coalesce(l.name, b.name), coalesce(l.url, b.url), coalesce(l.created_at, a.created_at, b.created_at),
+               -f.rank AS score
+          FROM search_fts AS f
+          LEFT JOIN chat_logs AS l ON f.rowid % 2 = 0 AND l.id = f.rowid / 2
+          LEFT JOIN chat_log_archive_text AS a ON f.rowid % 2 = 0 AND l.id IS NULL AND a.id = f.rowid / 2
+          LEFT JOIN bookmark AS b ON f.rowid % 2 = 1 AND b.id = f.rowid / 2
+         WHERE search_fts MATCH :match AND f.user_id = :user_id{short_filter}
+         ORDER BY f.rank
+         LIMIT :limit OFFSET :offset
+    """)
+    rows = db.execute(statement, {"match": match, "user_id": user_id, "limit": limit, "offset": offset, **patterns})
+    return [_row(*row) for row in rows]
+
+def _search_like(db, user_id, query, limit, offset, recent_rows=None):
+    """인덱스를 쓸 수 없을 때: 해당 사용자의 행만 LIKE로 검색하고 최신순으로 정렬합니다.
+    recent_rows가 있으면 (user_id, created_at) 인덱스로 최근 행 그만큼만 살펴봅니다."""
+    patterns = _term_patterns(query.split()).values()
+    L, B, A = models.ChatLog, models.Bookmark, models.ArchivedLogText
+    if recent_rows:
+        L = select(L).where(L.user_id == user_id).order_by(L.created_at.desc()).limit(recent_rows).subquery().c
+        B = select(B).where(B.user_id == user_id).order_by(B.created_at.desc()).limit(recent_rows).subquery().c
+        A = select(A).where(A.user_id == user_id).order_by(A.created_at.desc()).limit(recent_rows).subquery().c
+    logs = select(literal("log").label("kind"), L.id, L.session_id, L.message, L.name, L.url, L.created_at) \
+        .where(L.user_id == user_id, *(or_(L.message.like(p, escape="\\"), L.name.like(p, escape="\\")) for p in patterns))
+    bookmarks = select(literal("bookmark"), B.id, null(), B.name, B.name, B.url, B.created_at) \
+        .where(B.user_id == user_id, *(B.name.like(p, escape="\\") for p in patterns))
+    archived = select(literal("archived"), A.id, A.session_id, null(), null(), null(), A.created_at) \
+        .where(A.user_id == user_id, *(A.body.like(p, escape="\\") for p in patterns))
+    combined = union_all(logs, bookmarks, archived).subquery()
+    rows = db.execute(select(combined).order_by(combined.c.created_at.desc()).limit(limit).offset(offset))
+    return [_row(*row, None) for row in rows]
+
+def _fill_archived(db, rows):
+    """보관된 로그 결과("archived")의 메시지·이름·링크를 보관 데이터에서 채워 일반 로그("log")로 바꿉니다."""
+    session_ids = {row["session_id"] for row in rows if row["type"] == "archived"}
+    if not session_ids:
+        return rows
+    logs = crud.get_archived_logs(db, session_ids)
+    # 검색과 채우기 사이에 세션이 되돌려졌으면 chat_logs에서 찾음
+    missing = [row["id"] for row in rows if row["type"] == "archived" and row["id"] not in logs]
+    if missing:
+        L = models.ChatLog
+        for id, message, name, url in db.execute(select(L.id, L.message, L.name, L.url).where(L.id.in_(missing))):
+            logs[id] = {"message": message, "name": name, "url": url}
+    for row in rows:
+        if row["type"] == "archived":
+            log = logs.get(row["id"], {})
+            row.update(type="log", message=log.get("message"), name=log.get("name"), url=log.get("url"))
+    return rows
+
+def _short_only(db, query):
+    """짧은 단어만 있어 최근 행만 LIKE 검색하는 경우인지"""
+    terms = query.split()
+    return bool(terms) and all(len(term) < MIN_INDEXED_LENGTH for term in terms) \
+        and db.get_bind().dialect.name in ("postgresql", "sqlite")
+
+def is_partial(db: Session, user_id: int, query: str):
+    """짧은 단어만으로 검색해 SHORT_QUERY_RECENT_ROWS개보다 오래된 로그·즐겨찾기를 살펴보지 않았으면 True"""
+    if not _short_only(db, query):
+        return False
+    for model in (models.ChatLog, models.Bookmark, models.ArchivedLogText):
+        older = select(model.id).where(model.user_id == user_id).order_by(model.created_at.desc()) \
+            .offset(SHORT_QUERY_RECENT_ROWS).limit(1)
+        if db.execute(older).first():
+            return True
+    return False
+
+def search(db: Session, user_id: int, query: str, limit: int = 20, offset: int = 0):
+    """현재 사용자의 채팅 로그와 즐겨찾기에서 query를 검색하여 관련도 순으로 반환합니다."""
+    query = " ".join(query.split())
+    if not query:
+        return []
+    dialect = db.get_bind().dialect.name
+    long_terms = [term for term in query.split() if len(term) >= MIN_INDEXED_LENGTH]
+    short_terms = [term for term in query.split() if len(term) < MIN_INDEXED_LENGTH]
+    if _short_only(db, query):
+        rows = _search_like(db, user_id, query, limit, offset, recent_rows=SHORT_QUERY_RECENT_ROWS)
+    elif dialect == "postgresql":
+        rows = _search_postgres(db, user_id, query, limit, offset)
+    elif dialect == "sqlite":
+        rows = _search_sqlite(db, user_id, long_terms, short_terms, limit, offset)
+    else:
+        rows = _search_like(db, user_id, query, limit, offset)
+    return _fill_archived(db, rows)
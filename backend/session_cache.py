@@ -0,0 +1,144 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : session_cache.py
+# 설명        : 최근 사용된 채팅 세션의 마지막 N개 로그를 메모리에 보관하는 write-through 캐시
+# 주요 기능   :
+#   1) 세션 로그 조회 시 최근 N개를 채워 두고(fill), 같은 세션의 다음 조회·GPT 대화 이력 생성에 재사용
+#   2) crud.save_chat이 저장한 메시지를 바로 덧붙임(append) → 방금 쓴 행을 다시 읽지 않음
+#   3) 세션·사용자 삭제 시 무효화(invalidate)
+#      여러 워커 프로세스가 각자 캐시를 가지므로, 세션 로그 버전(crud.logs_scope)을 함께 저장하고
+#      조회 시 DB의 버전과 다르면(다른 워커가 쓰거나 지움) 버리고 다시 채움
+#   4) 전체 바이트 예산(HOT_SESSION_BYTES)을 넘으면 가장 오래 사용되지 않은 세션부터 제거, 통계 제공
+# 요구 모듈   : collections, itertools, os, sys, threading
+# -----------------------------------------------------------------------------------
+
+from collections import OrderedDict, deque, namedtuple
+from itertools import count
+import os
+import sys
+import threading
+
+HOT_SESSION_MESSAGES = int(os.getenv("HOT_SESSION_MESSAGES", "50"))
+HOT_SESSION_BYTES = int(os.getenv("HOT_SESSION_BYTES", str(8 * 1024 * 1024)))
+
+# 저장 직후 캐시에 덧붙이는 로그 한 건 (조회 결과 Row와 같은 필드·같은 _asdict() 사용법)
+LogRow = namedtuple("LogRow", ["id", "session_id", "user_id", "role", "message", "url", "name", "created_at"])
+
+ROW_OVERHEAD = 300  # 튜플·숫자·datetime 등 문자열 외 대략적인 크기(바이트)
+
+def row_size(row):
+    return ROW_OVERHEAD + sum(sys.getsizeof(v) for v in (row.message, row.url, row.name) if v)
+
+class _Entry:
+    __slots__ = ("rows", "complete", "bytes", "version")
+
+    def __init__(self, rows, complete, max_messages, version):
+        self.rows = deque(rows, maxlen=max_messages)
+        self.complete = complete  # True면 세션의 전체 로그가 들어 있음
+        self.bytes = sum(row_size(r) for r in self.rows)
+        self.version = version  # 캐시된 내용이 반영하는 세션 로그 버전
+
+# ────────────────────────────────────────────────
+# SessionLogCache 클래스
+#    - begin_fill → (DB 조회) → fill 순서로 채움
+#      조회하는 사이 같은 세션에 쓰기·삭제가 있었으면 fill을 버려 오래된 내용이 캐시되지 않게 함
+# ────────────────────────────────────────────────
+class SessionLogCache:
+    def __init__(self, max_messages=HOT_SESSION_MESSAGES, max_bytes=HOT_SESSION_BYTES):
+        self.max_messages = max_messages
+        self.max_bytes = max_bytes
+        self._sessions = OrderedDict()  # session_id -> _Entry
+        self._filling = {}  # session_id -> token
+        self._tokens = count()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, session_id, version, limit=None):
+        """최근 limit개(없으면 전체) 로그를 시간순으로 반환합니다. 캐시로 응답할 수 없으면 None."""
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry and entry.version != version:
+                self._remove(session_id)
+                entry = None
+            if entry and (entry.complete or (limit is not None and limit <= len(entry.rows))):
+                self._sessions.move_to_end(session_id)
+                self.hits += 1
+                rows = list(entry.rows)
+                return rows[-limit:] if limit else rows
+            self.misses += 1
+            return None
+
+    def begin_fill(self, session_id):
+        with self._lock:
+            token = self._filling[session_id] = next(self._tokens)
+            return token
+
+    def fill(self, session_id, token, rows, complete, version):
+        """DB에서 읽은 최근 로그(시간순)로 세션을 채웁니다. (version은 로그보다 먼저 읽은 값)"""
+        with self._lock:
+            if self._filling.get(session_id) != token:
+                return
+            del self._filling[session_id]
+            self._remove(session_id)
+            entry = self._sessions[session_id] = _Entry(rows[-self.max_messages:], complete and len(rows) <= self.max_messages, self.max_messages, version)
+            self._bytes += entry.bytes
+            self._evict()
+
+    def append(self, session_id, row, version):
+        """저장된 로그를 캐시된 세션 끝에 덧붙입니다. (캐시에 없는 세션은 무시)
+        version은 이 로그를 저장하며 올린 버전으로, 그 사이 다른 워커의 쓰기가 있었으면 세션을 버립니다."""
+        with self._lock:
+            self._filling.pop(session_id, None)
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return
+            if entry.version != version - 1:
+                self._remove(session_id)
+                return
+            entry.version = version
+            if len(entry.rows) == entry.rows.maxlen:
+                self._bytes -= row_size(entry.rows[0])
+                entry.bytes -= row_size(entry.rows[0])
+                entry.complete = False
+            entry.rows.append(row)
+            size = row_size(row)
+            entry.bytes += size
+            self._bytes += size
+            self._sessions.move_to_end(session_id)
+            self._evict()
+
+    def invalidate(self, *session_ids):
+        with self._lock:
+            for session_id in session_ids:
+                self._filling.pop(session_id, None)
+                self._remove(session_id)
+
+    def _remove(self, session_id):
+        # 호출 측에서 lock을 잡은 상태로 호출합니다.
+        entry = self._sessions.pop(session_id, None)
+        if entry:
+            self._bytes -= entry.bytes
+
+    def _evict(self):
+        # 호출 측에서 lock을 잡은 상태로 호출합니다.
+        while self._bytes > self.max_bytes and self._sessions:
+            _, entry = self._sessions.popitem(last=False)
+            self._bytes -= entry.bytes
+            self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "sessions": len(self._sessions),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits / total) if total else 0.0,
+            }
+
+session_log_cache = SessionLogCache()
@@ -0,0 +1,52 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : conftest.py
+# 설명        : backend 테스트 공통 설정
+# 주요 기능   :
+#   1) 앱 모듈을 불러오기 전에 임시 SQLite DB·캐시 경로와 테스트용 환경 변수 지정
+#   2) 상대 경로(Data/...)가 맞도록 backend 디렉터리를 작업 디렉터리·import 경로로 사용
+#   3) db: 테이블·검색 인덱스를 만든 임시 DB의 세션 (테스트마다 모든 행을 지움)
+#   4) client: 가입·로그인된 사용자의 앱 TestClient (백그라운드 보관 작업 없이 실행)
+# 실행 방법   : backend 디렉터리에서 python -m pytest -q
+# -----------------------------------------------------------------------------------
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TMP_DIR = tempfile.mkdtemp(prefix="backend-tests-")
+
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(TMP_DIR, 'test.db')}"
+os.environ["GEOCODE_CACHE_PATH"] = os.path.join(TMP_DIR, "geocode_cache.sqlite3")
+os.environ["GOOGLE_MAPS_API_KEY"] = ""
+os.environ["BCRYPT_ROUNDS"] = "4"
+os.environ["ARCHIVE_INTERVAL"] = "0"
+
+os.chdir(BACKEND_DIR)
+sys.path.insert(0, BACKEND_DIR)
+
+@pytest.fixture
+def db():
+    import models, search_index
+    from database import SessionLocal, engine
+    models.Base.metadata.create_all(engine)
+    search_index.init_search_index(engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        with engine.begin() as conn:
+            for table in reversed(models.Base.metadata.sorted_tables):
+                conn.execute(table.delete())
+
+@pytest.fixture
+def client(db):
+    from fastapi.testclient import TestClient
+    import app as server
+    client = TestClient(server.app)
+    response = client.post("/api/signup", json={"name": "테스트", "email": "user@test.com", "password": "pw"})
+    assert response.status_code == 200
+    return client
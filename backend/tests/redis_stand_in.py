@@ -0,0 +1,141 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : redis_stand_in.py
+# 설명        : Redis 프로토콜(RESP)을 흉내 내는 로컬 서버 (테스트·벤치마크용)
+# 주요 기능   :
+#   1) cache.RedisBackend가 쓰는 명령(PING, AUTH, SELECT, GET, MGET, SET PX, DEL, SCAN) 지원
+#   2) EVAL: lupa(Lua 런타임)로 스크립트를 실제로 실행 (redis.call은 이 서버의 명령으로 연결)
+#      → rate_limit.RedisBuckets의 Lua 스크립트를 Redis 없이 확인
+#   3) 명령은 잠금 하나로 차례로 실행 (Redis처럼 스크립트 실행 중 다른 명령이 끼어들지 않음)
+# 사용 방법   : with StandInRedis() as server: RedisBackend(server.url) ... (또는 start() / stop())
+# 요구 모듈   : socketserver, threading, lupa(EVAL만, 없으면 EVAL이 오류로 응답)
+# -----------------------------------------------------------------------------------
+
+import fnmatch
+import socketserver
+import threading
+import time
+
+try:
+    from lupa import LuaRuntime
+except ImportError:
+    LuaRuntime = None
+
+class Status(str):
+    """+OK 같은 상태 응답"""
+
+class StandInRedis(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), RESPHandler)
+        self.data = {}  # key -> (value, expires | None)
+        self.lock = threading.Lock()
+        self.commands = []  # 받은 명령 이름 (EVAL 안의 redis.call은 제외)
+        self.lua = None
+        if LuaRuntime is not None:
+            self.lua = LuaRuntime(encoding=None)
+            self.lua.globals().redis = self.lua.table_from({b"call": self._lua_call})
+
+    @property
+    def url(self):
+        return f"redis://127.0.0.1:{self.server_address[1]}/0"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def alive(self, key):
+        entry = self.data.get(key)
+        if entry and entry[1] is not None and entry[1] <= time.time():
+            del self.data[key]
+            return None
+        return entry
+
+    def execute(self, command, args):
+        """명령을 실행해 파이썬 값으로 반환 (None, bytes, int, list, Status)"""
+        if command in ("PING", "AUTH", "SELECT"):
+            return Status("OK")
+        if command == "GET":
+            return (self.alive(args[0]) or (None,))[0]
+        if command == "MGET":
+            return [(self.alive(k) or (None,))[0] for k in args]
+        if command == "SET":
+            expires = time.time() + int(args[3]) / 1000 if len(args) > 3 and args[2].upper() == b"PX" else None
+            self.data[args[0]] = (args[1], expires)
+            return Status("OK")
+        if command == "DEL":
+            return sum(self.data.pop(k, None) is not None for k in args)
+        if command == "SCAN":
+            pattern = args[args.index(b"MATCH") + 1].decode() if b"MATCH" in args else "*"
+            keys = [k for k in list(self.data) if self.alive(k) and fnmatch.fnmatchcase(k.decode(), pattern.replace("\\", ""))]
+            return [b"0", keys]
+        if command == "EVAL":
+            if self.lua is None:
+                raise RuntimeError("EVAL needs lupa")
+            count = int(args[1])
+            self.lua.globals().KEYS = self.lua.table_from(args[2:2 + count])
+            self.lua.globals().ARGV = self.lua.table_from(args[2 + count:])
+            return self._from_lua(self.lua.execute(args[0]))
+        raise RuntimeError(f"unknown command '{command}'")
+
+    def _lua_call(self, command, *args):
+        reply = self.execute(_to_bytes(command).decode().upper(), [_to_bytes(arg) for arg in args])
+        return False if reply is None else reply  # Redis Lua에서 nil 응답은 false
+
+    @staticmethod
+    def _from_lua(value):
+        # Redis와 같이 Lua 숫자는 정수로, false는 nil로 변환
+        if value is None or value is False:
+            return None
+        if value is True:
+            return 1
+        if isinstance(value, float):
+            return int(value)
+        return value
+
+def _to_bytes(value):
+    if isinstance(value, bytes):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).encode()
+
+def encode_reply(value):
+    if isinstance(value, Status):
+        return b"+%s\r\n" % value.encode()
+    if isinstance(value, Exception):
+        return b"-ERR %s\r\n" % str(value).splitlines()[0].encode()
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, list):
+        return b"*%d\r\n" % len(value) + b"".join(encode_reply(item) for item in value)
+    return b"$%d\r\n%s\r\n" % (len(value), value)
+
+class RESPHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            args = [self.rfile.read(int(self.rfile.readline()[1:-2]) + 2)[:-2] for _ in range(int(line[1:-2]))]
+            command = args[0].decode().upper()
+            with self.server.lock:
+                self.server.commands.append(command)
+                try:
+                    reply = self.server.execute(command, args[1:])
+                except Exception as e:
+                    reply = e
+            self.wfile.write(encode_reply(reply))
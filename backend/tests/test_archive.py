@@ -0,0 +1,102 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : test_archive.py
+# 설명        : crud.py 오래된 대화 보관(archive)과 되돌리기(rehydrate) 테스트
+# -----------------------------------------------------------------------------------
+
+from sqlalchemy import func, select, update
+
+import crud
+import models
+import search_index
+
+def make_session(db, messages):
+    if db.get(models.User, 1) is None:
+        db.add(models.User(id=1, name="u", email="u@test.com", hashed_password="x"))
+        db.commit()
+    session_id = crud.create_session(db, 1, "t").id
+    for i, message in enumerate(messages):
+        crud.save_chat(db, session_id, 1, message, f"https://example.com/{i}" if i % 2 else None, "식당" if i % 2 else None,
+                       "assistant" if i % 2 else "user")
+    return session_id
+
+def age(db, session_id, days):
+    L = models.ChatLog
+    db.execute(update(L).where(L.session_id == session_id).values(created_at=func.datetime("now", f"-{days} days")))
+    db.commit()
+
+def log_rows(db, session_id):
+    return [tuple(r) for r in crud.get_session_log_rows(db, session_id)]
+
+def count(db, model):
+    return db.execute(select(func.count()).select_from(model)).scalar()
+
+def test_archive_and_rehydrate_round_trip(db):
+    idle = make_session(db, ["국밥 먹고 싶어", "국밥집 추천", "고마워"])
+    active = make_session(db, ["라멘 먹고 싶어"])
+    age(db, idle, 40)
+    age(db, active, 1)
+    before = log_rows(db, idle)
+
+    assert crud.archive_idle_sessions(db, idle_days=30) == 1
+    assert count(db, models.ChatLog) == 1 and count(db, models.ArchivedSession) == 1
+    # 보관된 로그도 검색되고, 내용은 보관 데이터에서 채움
+    hits = search_index.search(db, 1, "국밥집")
+    assert [(r["type"], r["session_id"], r["message"], r["name"], r["url"]) for r in hits] == \
+        [("log", idle, "국밥집 추천", "식당", "https://example.com/1")]
+    assert sorted(r["message"] for r in search_index.search(db, 1, "국밥")) == ["국밥 먹고 싶어", "국밥집 추천"]  # 짧은 단어(LIKE)
+    exported = [r for r in crud.iter_export_records(db, 1) if r["type"] == "log" and r["session_id"] == idle]
+    assert [r["message"] for r in exported] == ["국밥 먹고 싶어", "국밥집 추천", "고마워"]
+
+    # 세션을 열면 원래 id·시각·내용 그대로 되돌림
+    assert log_rows(db, idle) == before
+    assert count(db, models.ArchivedSession) == 0 and count(db, models.ArchivedLogText) == 0
+    assert [(r["id"], r["message"]) for r in search_index.search(db, 1, "국밥집")] == [(hits[0]["id"], "국밥집 추천")]
+
+def test_save_to_archived_session_keeps_order(db):
+    session_id = make_session(db, ["첫 메시지", "첫 답변"])
+    age(db, session_id, 40)
+    assert crud.archive_idle_sessions(db, idle_days=30) == 1
+    crud.save_chat(db, session_id, 1, "다시 왔어", None, None, "user")
+    assert [r.message for r in crud.get_session_log_rows(db, session_id)] == ["첫 메시지", "첫 답변", "다시 왔어"]
+
+def test_recent_session_is_not_archived(db):
+    session_id = make_session(db, ["방금 보낸 메시지"])
+    age(db, session_id, 40)
+    archived = crud.archive_session(db, session_id, cutoff=crud._as_utc(db.execute(
+        select(func.min(models.ChatLog.created_at))).scalar()))
+    assert not archived  # 마지막 메시지가 cutoff 이후
+    assert count(db, models.ChatLog) == 1
+
+def test_delete_archived_session(db):
+    session_id = make_session(db, ["지울 대화"])
+    age(db, session_id, 40)
+    crud.archive_idle_sessions(db, idle_days=30)
+    assert search_index.search(db, 1, "지울 대화")
+    assert crud.delete_session(db, session_id)
+    assert count(db, models.ArchivedSession) == 0 and count(db, models.ArchivedLogText) == 0
+    assert search_index.search(db, 1, "지울 대화") == []
+
+def test_search_finds_archived_and_live_logs_of_the_user_only(db):
+    old = make_session(db, ["김치찌개 맛집 알려줘"])
+    age(db, old, 40)
+    crud.archive_idle_sessions(db, idle_days=30)
+    make_session(db, ["김치찌개 또 먹고 싶어"])
+    db.add(models.User(id=2, name="v", email="v@test.com", hashed_password="x"))
+    db.add(models.ChatSession(id="other", user_id=2, title="t"))
+    db.commit()
+    crud.save_chat(db, "other", 2, "김치찌개 최고", None, None, "user")
+    assert sorted(r["message"] for r in search_index.search(db, 1, "김치찌개")) == ["김치찌개 또 먹고 싶어", "김치찌개 맛집 알려줘"]
+    assert [r["message"] for r in search_index.search(db, 1, "김치찌개", limit=1, offset=1)] != \
+        [r["message"] for r in search_index.search(db, 1, "김치찌개", limit=1)]
+
+def test_index_archived_sessions_fills_missing_text(db):
+    session_id = make_session(db, ["예전에 보관한 대화"])
+    age(db, session_id, 40)
+    crud.archive_idle_sessions(db, idle_days=30)
+    # 검색용 본문을 만들기 전 버전에서 보관된 세션
+    db.execute(models.ArchivedLogText.__table__.delete())
+    db.commit()
+    assert search_index.search(db, 1, "보관한 대화") == []
+    assert crud.index_archived_sessions(db) == 1
+    assert crud.index_archived_sessions(db) == 0
+    assert [r["message"] for r in search_index.search(db, 1, "보관한 대화")] == ["예전에 보관한 대화"]
@@ -0,0 +1,166 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : test_cache.py
+# 설명        : cache.py 공유 캐시 테스트 (TTL, 용량 초과 시 제거, 직렬화, 깨진 항목 처리)
+#               memory / sqlite / redis(tests/redis_stand_in.py) 백엔드에서 같은 동작 확인
+#               (sqlite·redis는 다른 프로세스가 저장한 값 조회, 꺼진 redis는 미스로 처리)
+# -----------------------------------------------------------------------------------
+
+import multiprocessing
+import os
+
+import pytest
+
+import cache
+from cache import Cache, MemoryBackend, RedisBackend, SQLiteBackend
+from Ai.SearchContent import Restaurant, _details_cache, _search_cache
+from tests.redis_stand_in import StandInRedis
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache.time, "time", clock)
+    return clock
+
+@pytest.fixture
+def redis_server():
+    with StandInRedis() as server:
+        yield server
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return MemoryBackend()
+    if request.param == "sqlite":
+        return SQLiteBackend(str(tmp_path / "cache.sqlite3"))
+    return RedisBackend(request.getfixturevalue("redis_server").url)
+
+def test_ttl(backend, clock):
+    c = Cache("test_ttl", ttl=60, backend=backend)
+    c.set("default", 1)
+    c.set("short", 2, ttl=5)
+    clock.now += 10
+    assert c.get_many(["default", "short"]) == {"default": 1}
+    clock.now += 60
+    assert c.get("default") is None
+    assert c.stats()["hits"] == 1
+
+def test_memory_eviction_is_lru():
+    backend = MemoryBackend()
+    c = Cache("test_evict", backend=backend)
+    backend.max_bytes = 3 * backend._size(c._key("a"), b'"xxxxx"')  # 세 항목까지 보관
+    for key in "abc":
+        c.set(key, "x" * 5)
+    assert c.get("a") == "x" * 5  # a를 최근 사용으로 옮김
+    c.set("d", "x" * 5)
+    c.set("e", "x" * 5)
+    assert set(c.get_many("abcde")) == {"a", "d", "e"}
+    assert backend.stats()["evictions"] == 2
+    assert backend.stats()["bytes"] <= backend.max_bytes
+
+def test_memory_budget_counts_small_entries():
+    # 값이 아주 작아도(빈 목록) 항목 수가 예산 안에서 제한되어야 함
+    backend = MemoryBackend(max_bytes=100_000)
+    c = Cache("test_small", backend=backend)
+    for i in range(10_000):
+        c.set(f"질의 {i}", [])
+    assert backend.stats()["entries"] < 1000
+    assert backend.stats()["bytes"] <= 100_000
+
+def test_sqlite_keeps_max_entries(tmp_path, monkeypatch, clock):
+    backend = SQLiteBackend(str(tmp_path / "cache.sqlite3"), max_entries=3)
+    monkeypatch.setattr(SQLiteBackend, "PURGE_EVERY", 5)
+    c = Cache("test_max", backend=backend)
+    for i in range(5):
+        clock.now += 1
+        c.set(i, i)
+    # 만료가 가장 이른(오래된) 항목부터 정리
+    assert c.get_many(range(5)) == {2: 2, 3: 3, 4: 4}
+
+def test_namespaces_and_canonical_keys(backend):
+    a = Cache("test_a", backend=backend)
+    b = Cache("test_b", backend=backend)
+    a.set(("김치찌개", "강남구", (37.5, 127.0)), "a")
+    b.set(("김치찌개", "강남구", (37.5, 127.0)), "b")
+    # 다른 워커의 같은 이름공간 인스턴스도 같은 키 문자열을 만듦
+    assert Cache("test_a", backend=backend).get(("김치찌개", "강남구", (37.5, 127.0))) == "a"
+    assert a._key(("김치찌개", (37.5, 127.0))) == cache.CACHE_PREFIX + 'test_a:["김치찌개",[37.5,127.0]]'
+    assert a._key((("외로움", "피곤"), "저녁")) == cache.CACHE_PREFIX + 'test_a:[["외로움","피곤"],"저녁"]'
+    a.clear()
+    assert a.get(("김치찌개", "강남구", (37.5, 127.0))) is None
+    assert b.get(("김치찌개", "강남구", (37.5, 127.0))) == "b"
+
+def test_string_and_sequence_keys_do_not_collide(backend):
+    c = Cache("test_keys", backend=backend)
+    c.set('["a"]', "문자열")
+    c.set(("a",), "튜플")
+    c.set("1", "문자열 1")
+    c.set(1, "숫자 1")
+    assert c.get_many(['["a"]', ("a",), "1", 1]) == {'["a"]': "문자열", ("a",): "튜플", "1": "문자열 1", 1: "숫자 1"}
+
+def test_get_many_delete_and_defaults(backend):
+    c = Cache("test_basic", backend=backend)
+    value = [["김치찌개", 4.5, None], {"hours": ["월 11:00~21:00"]}]
+    c.set("a", value)
+    c.set("b", 2)
+    assert c.get("없음", "default") == "default"
+    assert c.get_many(["a", "b", "c"]) == {"a": value, "b": 2}
+    c.delete("a")
+    assert c.get_many(["a", "b"]) == {"b": 2}
+    assert c.stats()["errors"] == 0
+
+def _worker_set(kind, target, key, value):
+    backend = SQLiteBackend(target) if kind == "sqlite" else RedisBackend(target)
+    Cache("test_shared", backend=backend).set(key, value)
+
+@pytest.mark.parametrize("kind", ["sqlite", "redis"])
+def test_shared_between_processes(kind, tmp_path, request):
+    target = str(tmp_path / "cache.sqlite3") if kind == "sqlite" else request.getfixturevalue("redis_server").url
+    backend = SQLiteBackend(target) if kind == "sqlite" else RedisBackend(target)
+    process = multiprocessing.get_context("spawn").Process(target=_worker_set, args=(kind, target, "from-worker", {"pid": "other"}))
+    process.start()
+    process.join()
+    assert process.exitcode == 0
+    assert Cache("test_shared", backend=backend).get("from-worker") == {"pid": "other"}
+
+def test_redis_outage_is_miss():
+    c = Cache("test_outage", backend=RedisBackend("redis://127.0.0.1:1/0", timeout=0.2))
+    assert c.get("key", "miss") == "miss"
+    c.set("key", "value")
+    assert c.stats()["errors"] == 2
+
+def test_sqlite_paths_are_relative_to_backend(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)  # 작업 디렉터리와 관계없음
+    monkeypatch.setattr(cache, "SQLiteBackend", lambda path: path)
+    assert cache.create_backend("sqlite", "") == os.path.join(cache.BACKEND_DIR, "Data", "cache.sqlite3")
+    assert cache.create_backend("sqlite", "Data/other.sqlite3") == os.path.join(cache.BACKEND_DIR, "Data", "other.sqlite3")
+    assert cache.create_backend("sqlite", str(tmp_path / "c.sqlite3")) == str(tmp_path / "c.sqlite3")
+    assert SQLiteBackend.__init__.__defaults__[0] == cache.SQLITE_PATH
+
+def test_corrupt_entry_is_miss(backend):
+    c = Cache("test_corrupt", backend=backend)
+    backend.set(c._key("bad"), b"\x80\x04not json", 60)
+    c.set("good", 1)
+    assert c.get_many(["bad", "good"]) == {"good": 1}
+    assert c.stats()["errors"] == 1 and c.stats()["misses"] == 1
+
+def test_unserializable_value_is_not_stored(backend):
+    c = Cache("test_unserializable", backend=backend)
+    c.set("key", object())
+    assert c.get("key") is None
+    assert c.stats()["errors"] == 1
+
+def test_restaurant_and_tuple_codecs(monkeypatch):
+    monkeypatch.setattr(_search_cache, "_backend", MemoryBackend())
+    monkeypatch.setattr(_details_cache, "_backend", MemoryBackend())
+    restaurants = [Restaurant(name="식당", address="서울", latitude=37.5, longitude=127.0, rating=4.5, hours=["월 11:00"])]
+    _search_cache.set(("김치찌개", "서울특별시 강남구", (37.5, 127.0)), restaurants)
+    _details_cache.set("place-1", ("02-000-0000", ["월 11:00"]))
+    assert _search_cache.get(("김치찌개", "서울특별시 강남구", (37.5, 127.0))) == restaurants
+    assert _details_cache.get("place-1") == ("02-000-0000", ["월 11:00"])
@@ -0,0 +1,74 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : test_conversation.py
+# 설명        : IntegratedAI / Chatbot이 세션마다 별도의 대화 이력을 쓰는지 테스트
+# -----------------------------------------------------------------------------------
+
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from Ai import Chatbot, Model
+from Ai.Clients import set_client
+from Ai.Conversation import ConversationHistory
+from Ai.Logic import IntegratedAI
+
+class RecordingGroq:
+    """Groq 스트리밍 응답을 흉내 내고, 요청마다 받은 메시지 목록을 기록"""
+    def __init__(self):
+        self.prompts = []
+        self.lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=self)
+
+    def create(self, messages, **kwargs):
+        with self.lock:
+            self.prompts.append(messages)
+        answer = f"답변: {messages[-1]['content']}"
+        return iter([SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=answer))])])
+
+@pytest.fixture
+def groq(monkeypatch):
+    client = RecordingGroq()
+    set_client("groq", client)
+    monkeypatch.setattr(Model, "FirstLayerDMM", lambda query: [f"general {query}"])
+    yield client
+    set_client("groq", None)
+
+def log(role, message):
+    return SimpleNamespace(role=role, message=message)
+
+def contents(messages):
+    return [m["content"] for m in messages if m["role"] != "system"]
+
+def test_sessions_do_not_share_history(groq):
+    session_a = [log("user", "내 이름은 민수야"), log("assistant", "반가워요 민수님")]
+    session_b = [log("user", "나는 부산에 살아")]
+    IntegratedAI("내 이름이 뭐야?", chat_history=session_a)
+    IntegratedAI("내가 어디 산다고 했지?", chat_history=session_b)
+    IntegratedAI("처음 왔어요")
+
+    first, second, third = (contents(p) for p in groq.prompts)
+    assert first == ["내 이름은 민수야", "반가워요 민수님", "내 이름이 뭐야?"]
+    assert second == ["나는 부산에 살아", "내가 어디 산다고 했지?"]
+    assert third == ["처음 왔어요"]
+
+def test_concurrent_histories_stay_isolated(groq):
+    histories = [ConversationHistory() for _ in range(8)]
+    def talk(i):
+        for turn in range(5):
+            Chatbot.Chatbot(f"세션{i}-{turn}", histories[i])
+    threads = [threading.Thread(target=talk, args=(i,)) for i in range(len(histories))]
+    for t in threads: t.start()
+    for t in threads: t.join()
+
+    for i, history in enumerate(histories):
+        questions = [m["content"] for m in history.snapshot() if m["role"] == "user"]
+        assert questions == [f"세션{i}-{turn}" for turn in range(5)]
+    for prompt in groq.prompts:
+        session = contents(prompt)[-1].split("-")[0]
+        assert all(text.split("-")[0].removeprefix("답변: ") == session for text in contents(prompt))
+
+def test_history_is_bounded():
+    logs = [log("user", str(i)) for i in range(50)]
+    history = ConversationHistory.from_logs(logs, max_messages=10)
+    assert [m["content"] for m in history.snapshot()] == [str(i) for i in range(40, 50)]
@@ -0,0 +1,77 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : test_etag.py
+# 설명        : 세션·로그·즐겨찾기 목록 API의 ETag / If-None-Match(304) 테스트
+# -----------------------------------------------------------------------------------
+
+import crud
+from database import SessionLocal
+
+def revalidate(client, url):
+    first = client.get(url)
+    assert first.status_code == 200 and first.headers["ETag"].startswith('W/"')
+    again = client.get(url, headers={"If-None-Match": first.headers["ETag"]})
+    assert again.status_code == 304 and again.content == b"" and again.headers["ETag"] == first.headers["ETag"]
+    return first
+
+def test_sessions_change_etag_on_create_and_delete(client):
+    first = revalidate(client, "/api/sessions")
+    session_id = client.post("/api/sessions", json={"title": "새 대화"}).json()["id"]
+    changed = client.get("/api/sessions", headers={"If-None-Match": first.headers["ETag"]})
+    assert changed.status_code == 200 and [s["id"] for s in changed.json()] == [session_id]
+    etag = revalidate(client, "/api/sessions").headers["ETag"]
+    client.delete(f"/api/sessions/{session_id}")
+    assert client.get("/api/sessions", headers={"If-None-Match": etag}).status_code == 200
+
+def test_logs_change_etag_on_new_message(client):
+    session_id = client.post("/api/sessions", json={"title": "대화"}).json()["id"]
+    url = f"/api/sessions/{session_id}/logs"
+    etag = revalidate(client, url).headers["ETag"]
+    with SessionLocal() as db:
+        user_id = crud.get_user_by_email(db, "user@test.com").id
+        crud.save_chat(db, session_id, user_id, "안녕", None, None, "user")
+    changed = client.get(url, headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and [log["message"] for log in changed.json()] == ["안녕"]
+    assert client.get(url, headers={"If-None-Match": f'"other", {changed.headers["ETag"]}'}).status_code == 304
+    assert client.get(url, headers={"If-None-Match": "*"}).status_code == 304
+
+def test_bookmarks_change_etag_on_add(client):
+    etag = revalidate(client, "/api/bookmarks").headers["ETag"]
+    client.post("/api/add_bookmark", json={"name": "국밥집", "url": "https://example.com"})
+    changed = client.get("/api/bookmarks", headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and [b["name"] for b in changed.json()] == ["국밥집"]
+
+def test_etag_is_per_user(client):
+    etag = revalidate(client, "/api/sessions").headers["ETag"]
+    client.post("/api/signup", json={"name": "다른 사용자", "email": "other@test.com", "password": "pw"})
+    assert client.get("/api/sessions", headers={"If-None-Match": etag}).status_code == 200
+
+def test_logs_etag_depends_on_limit(client):
+    session_id = client.post("/api/sessions", json={"title": "대화"}).json()["id"]
+    url = f"/api/sessions/{session_id}/logs"
+    etags = {client.get(url).headers["ETag"], client.get(f"{url}?limit=5").headers["ETag"], client.get(f"{url}?limit=10").headers["ETag"]}
+    assert len(etags) == 3
+    etag = client.get(f"{url}?limit=5").headers["ETag"]
+    assert client.get(f"{url}?limit=5", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get(f"{url}?limit=10", headers={"If-None-Match": etag}).status_code == 200
+
+def test_other_users_bookmarks_are_not_found(client):
+    from fastapi.testclient import TestClient
+    import app as server
+
+    bookmark = client.post("/api/add_bookmark", json={"name": "국밥집", "url": "https://example.com"}).json()["bookmark"]
+    etag = revalidate(client, "/api/bookmarks").headers["ETag"]
+
+    other = TestClient(server.app)
+    other.post("/api/signup", json={"name": "다른 사용자", "email": "other@test.com", "password": "pw"})
+    update = other.post("/api/update_bookmark", json={"id": bookmark["id"], "name": "바꿈", "url": "https://evil.example"})
+    assert update.status_code == 404 and "user_id" not in update.text
+    assert other.post("/api/delete_bookmark", json={"bookmark_id": bookmark["id"]}).status_code == 404
+
+    # 주인의 목록·ETag는 그대로
+    assert client.get("/api/bookmarks", headers={"If-None-Match": etag}).status_code == 304
+    assert [b["name"] for b in client.get("/api/bookmarks").json()] == ["국밥집"]
+
+    updated = client.post("/api/update_bookmark", json={"id": bookmark["id"], "name": "순댓국집", "url": "https://example.com"})
+    assert updated.status_code == 200 and updated.json()["bookmark"]["name"] == "순댓국집"
+    assert client.post("/api/delete_bookmark", json={"bookmark_id": bookmark["id"]}).status_code == 200
+    assert client.post("/api/delete_bookmark", json={"bookmark_id": bookmark["id"]}).status_code == 404
@@ -0,0 +1,33 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : test_export.py
+# 설명        : /api/export NDJSON 스트리밍 내보내기 테스트 (gzip 파일이 이중 압축되지 않는지)
+# -----------------------------------------------------------------------------------
+
+import gzip
+import json
+
+import crud
+from database import SessionLocal
+
+def fill_logs(client, count):
+    session_id = client.post("/api/sessions", json={"title": "내보내기"}).json()["id"]
+    with SessionLocal() as db:
+        user_id = crud.get_user_by_email(db, "user@test.com").id
+        for i in range(count):
+            crud.save_chat(db, session_id, user_id, f"메시지 {i} " + "국밥 " * (i % 7), None, None, "user")
+    return session_id
+
+def test_export_streams_ndjson(client):
+    session_id = fill_logs(client, 5)
+    response = client.get("/api/export")
+    assert response.status_code == 200 and response.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["message"] for r in records if r["type"] == "log" and r["session_id"] == session_id][0] == "메시지 0 "
+
+def test_export_gzip_is_compressed_once(client):
+    fill_logs(client, 300)
+    plain = client.get("/api/export").content
+    response = client.get("/api/export?gzip=true", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200 and response.headers["content-type"] == "application/gzip"
+    assert response.headers.get("content-encoding") != "gzip"
+    assert gzip.decompress(response.content) == plain
@@ -0,0 +1,63 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : test_idempotency.py
+# 설명        : idempotency.py IdempotencyStore 테스트 (선점, 재전송, 내용이 다른 재사용, 실패, 만료)
+# -----------------------------------------------------------------------------------
+
+import threading
+
+import pytest
+
+import idempotency
+from idempotency import IdempotencyStore, KeyReusedError
+
+def test_claim_then_replay():
+    store = IdempotencyStore()
+    future, owner = store.claim((1, "k"), ("안녕", None, "서울"))
+    assert owner
+    store.complete((1, "k"), {"message": "ok"})
+    replay, owner = store.claim((1, "k"), ("안녕", None, "서울"))
+    assert not owner and replay is future and replay.result() == {"message": "ok"}
+    assert store.stats() == {"entries": 1, "stored": 1, "replayed": 1, "waited": 0}
+
+def test_waits_for_in_flight_request():
+    store = IdempotencyStore()
+    store.claim((1, "k"), "body")
+    waiting, owner = store.claim((1, "k"), "body")
+    assert not owner and not waiting.done()
+    threading.Timer(0.05, store.complete, ((1, "k"), "done")).start()
+    assert waiting.result(timeout=2) == "done"
+    assert store.stats()["waited"] == 1
+
+def test_fingerprint_mismatch():
+    store = IdempotencyStore()
+    store.claim((1, "k"), ("안녕", None, "서울"))
+    with pytest.raises(KeyReusedError):
+        store.claim((1, "k"), ("다른 메시지", None, "서울"))
+    _, owner = store.claim((2, "k"), ("다른 메시지", None, "서울"))  # 다른 사용자의 같은 키
+    assert owner
+
+def test_failure_releases_key():
+    store = IdempotencyStore()
+    future, _ = store.claim((1, "k"), "body")
+    waiting, _ = store.claim((1, "k"), "body")
+    store.fail((1, "k"), RuntimeError("upstream"))
+    with pytest.raises(RuntimeError):
+        waiting.result()
+    _, owner = store.claim((1, "k"), "body")
+    assert owner
+
+def test_expiry_and_eviction(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(idempotency.time, "monotonic", lambda: now[0])
+    store = IdempotencyStore(ttl=10, max_entries=2)
+    store.claim("a", "body")
+    store.complete("a", 1)
+    now[0] += 11
+    _, owner = store.claim("a", "other body")  # 만료된 키는 새 요청으로 선점
+    assert owner
+    store.claim("b", "body")
+    store.complete("b", 2)
+    store.claim("c", "body")  # 처리 중인 a는 남기고 완료된 b를 제거
+    assert store.stats()["entries"] == 2
+    assert not store.claim("a", "other body")[1]
+    assert store.claim("b", "changed")[1]
@@ -0,0 +1,80 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : test_intent_classifier.py
+# 설명        : Ai/IntentClassifier.py 로컬 분류기 정확도와 원격 모델(Cohere) 위임 기준 테스트
+# -----------------------------------------------------------------------------------
+
+import pytest
+
+from Ai import Model
+from Ai.IntentClassifier import TRAINING_EXAMPLES, LocalDMM, get_classifier
+
+# 학습 데이터에 없는 라벨링된 표본 (remote = 원격 모델에 맡길 태스크)
+SAMPLE = [
+    ("안녕 반가워", "general"), ("너 이름이 뭐야", "general"), ("광합성이 뭐야", "general"),
+    ("김치찌개 레시피 알려줘", "general"), ("세종대왕은 어떤 업적이 있어", "general"),
+    ("운동 루틴 추천해줘", "general"), ("블랙홀에 대해 설명해줘", "general"), ("심심해 이야기 좀 하자", "general"),
+    ("오늘 부산 날씨 알려줘", "realtime"), ("지금 달러 환율 얼마야", "realtime"), ("오늘 주요 뉴스 알려줘", "realtime"),
+    ("요즘 인기 있는 영화 뭐야", "realtime"), ("이더리움 시세 알려줘", "realtime"), ("어제 축구 경기 결과 알려줘", "realtime"),
+    ("메모장 열어줘", "open"), ("카카오톡 켜줘", "open"), ("엑셀 실행해줘", "open"), ("파워포인트 열어줘", "open"),
+    ("크롬 열어서", "open"),
+    ("메모장 닫아줘", "close"), ("카카오톡 꺼줘", "close"), ("엑셀 종료해줘", "close"), ("파워포인트 닫아줘", "close"),
+    ("아이유 노래 틀어줘", "remote"), ("잔잔한 음악 재생해줘", "remote"), ("내일 7시에 알람 맞춰줘", "remote"),
+    ("회의 리마인더 설정해줘", "remote"), ("강아지 그림 그려줘", "remote"), ("볼륨 낮춰줘", "remote"),
+    ("유튜브에서 강아지 영상 검색해줘", "remote"), ("구글에서 날씨 검색해줘", "remote"),
+]
+
+def test_sample_is_held_out():
+    trained = {text for text, _ in TRAINING_EXAMPLES}
+    assert not trained & {text for text, _ in SAMPLE}
+
+def test_accuracy_on_labelled_sample():
+    classifier = get_classifier()
+    correct = sum(classifier.predict(text)[0] == label for text, label in SAMPLE)
+    assert correct / len(SAMPLE) >= 0.85
+
+def test_confident_answers_are_correct():
+    # 기본 기준(0.6) 이상으로 로컬에서 처리한 결과는 모두 맞아야 함 (틀릴 바에는 원격 모델에 위임)
+    handled = 0
+    for text, label in SAMPLE:
+        tasks = LocalDMM(text, threshold=Model.LocalThreshold)
+        if tasks is not None:
+            handled += 1
+            assert label != "remote" and all(task.startswith(label + " ") for task in tasks), (text, tasks)
+    assert handled >= 5
+
+@pytest.mark.parametrize("text, tasks", [
+    ("크롬 열고 세종대왕에 대해 알려주세요", ["open 크롬", "general 세종대왕에 대해 알려주세요"]),
+    ("크롬과 파이어폭스 열어줘", ["open 크롬", "open 파이어폭스"]),
+    ("크롬을 열어줘", ["open 크롬"]),
+    ("유튜브 열어서", ["open 유튜브"]),
+    ("메모장 닫아줘", ["close 메모장"]),
+])
+def test_task_format(text, tasks):
+    assert LocalDMM(text, threshold=0.0) == tasks
+
+def test_verbs_are_not_kept_in_app_names():
+    # 뒤 절(노래 재생)은 로컬에서 만들 수 없으므로 전체를 원격 모델에 맡김
+    assert LocalDMM("유튜브 열어서 노래 틀어줘", threshold=0.0) is None
+    for text in ["크롬 열어서 뉴스 보여줘", "메모장 켜고 일기 써줘"]:
+        tasks = LocalDMM(text, threshold=0.0) or []
+        assert not any(task.startswith(("open", "close")) and " " in task.split(" ", 1)[1] for task in tasks), tasks
+
+@pytest.mark.parametrize("text", ["노래 틀어줘", "내일 아침 7시에 알람 맞춰줘", "바다 이미지 생성해줘", "유튜브에서 요리 영상 검색해줘"])
+def test_remote_only_labels_fall_back(text):
+    assert LocalDMM(text, threshold=0.0) is None
+
+def test_threshold_controls_fallback(monkeypatch):
+    remote_calls = []
+    monkeypatch.setattr(Model, "RemoteDMM", lambda prompt: remote_calls.append(prompt) or [f"general {prompt}"])
+
+    monkeypatch.setattr(Model, "LocalThreshold", 0.0)
+    assert Model.FirstLayerDMM("오늘 주요 뉴스 알려줘") == ["realtime 오늘 주요 뉴스 알려줘"]
+    assert remote_calls == []
+
+    monkeypatch.setattr(Model, "LocalThreshold", 1.0)
+    assert Model.FirstLayerDMM("오늘 주요 뉴스 알려줘") == ["general 오늘 주요 뉴스 알려줘"]
+    assert remote_calls == ["오늘 주요 뉴스 알려줘"]
+
+    monkeypatch.setattr(Model, "LocalThreshold", 0.0)
+    assert Model.FirstLayerDMM("노래 틀어줘") == ["general 노래 틀어줘"]
+    assert remote_calls[-1] == "노래 틀어줘"
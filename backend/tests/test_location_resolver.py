@@ -0,0 +1,97 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : test_location_resolver.py
+# 설명        : Ai/LocationResolver.py 내장 행정구역 목록 조회 테스트
+# -----------------------------------------------------------------------------------
+
+import os
+
+import pytest
+
+from Ai.LocationResolver import get_gazetteer, location_tokens, normalize_location, resolve_location
+
+@pytest.mark.parametrize("text, name", [
+    ("강남", "서울특별시 강남구"),
+    ("강남구 근처", "서울특별시 강남구"),
+    ("강남 쪽에서", "서울특별시 강남구"),
+    ("서울 강남구", "서울특별시 강남구"),
+    ("서울강남구", "서울특별시 강남구"),
+    ("서울 중구", "서울특별시 중구"),
+    ("부산 중구", "부산광역시 중구"),
+    ("강서구", "서울특별시 강서구"),
+    ("수원시 근처", "경기도 수원시"),
+])
+def test_gazetteer_hit(text, name):
+    assert resolve_location(text).name == name
+
+@pytest.mark.parametrize("text", ["서울 망원동", "서울 연남동 근처", "서울역", "서울 을지로", "서울대입구", "동구릉"])
+def test_partial_match_falls_through(text):
+    # 목록에 없는 동·역 이름이 섞이면 도시 전체로 뭉개지 않고 지오코더로 넘김 (API 키가 없으면 None)
+    assert get_gazetteer().lookup(location_tokens(text)) is None
+    assert resolve_location(text) is None
+
+def test_city_radius_only_for_city_alone():
+    assert resolve_location("서울").radius > resolve_location("서울 강남구").radius
+
+def test_tokens_and_normalization():
+    assert location_tokens("강남역 근처, 맛집") == ["강남역", "맛집"]
+    assert location_tokens("근처") == []
+    assert normalize_location("강남 근처") == normalize_location("강남")
+
+@pytest.fixture
+def geocoder(monkeypatch, tmp_path):
+    """가짜 지오코더: 응답 목록을 순서대로 돌려주고(예외면 raise) 호출된 입력을 기록"""
+    from Ai import LocationResolver as lr
+    calls, replies = [], []
+    def fake(text):
+        calls.append(text)
+        reply = replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+    monkeypatch.setattr(lr, "geocode", fake)
+    monkeypatch.setattr(lr, "GOOGLE_MAPS_API_KEY", "test-key")
+    monkeypatch.setattr(lr, "_resolved", lr.OrderedDict())
+    monkeypatch.setattr(lr, "_geocode_cache", lr.GeocodeCache(str(tmp_path / "geocode.sqlite3")))
+    return lr, calls, replies
+
+def test_transient_failure_is_not_remembered(geocoder):
+    lr, calls, replies = geocoder
+    found = lr.ResolvedLocation("서울특별시 마포구 망원동", 37.55, 126.9, 1500, "geocoder")
+    replies.extend([RuntimeError("Geocoding API OVER_QUERY_LIMIT"), found])
+    assert resolve_location("서울 망원동") is None
+    assert resolve_location("서울 망원동") == found
+    # 표기만 다른 입력은 기억된 결과를 그대로 사용
+    assert resolve_location("서울망원동 근처") == found
+    assert calls == ["서울 망원동", "서울 망원동"]
+
+def test_not_found_uses_negative_ttl(geocoder, monkeypatch):
+    lr, calls, replies = geocoder
+    replies.append(None)
+    assert resolve_location("없는동네") is None
+    assert resolve_location("없는동네") is None  # SQLite의 '찾지 못함' 캐시 사용
+    assert len(calls) == 1
+    monkeypatch.setattr(lr, "GEOCODE_NEGATIVE_TTL", -1)
+    replies.append(None)
+    assert resolve_location("없는동네") is None
+    assert len(calls) == 2
+
+def test_missing_key_is_not_cached(geocoder, monkeypatch):
+    lr, calls, replies = geocoder
+    monkeypatch.setattr(lr, "GOOGLE_MAPS_API_KEY", "")
+    assert resolve_location("서울 연남동") is None and calls == []
+    monkeypatch.setattr(lr, "GOOGLE_MAPS_API_KEY", "test-key")
+    replies.append(lr.ResolvedLocation("서울특별시 마포구 연남동", 37.56, 126.92, 1500, "geocoder"))
+    assert resolve_location("서울 연남동").source == "geocoder"
+
+def test_cache_open_failure_still_geocodes(geocoder, monkeypatch):
+    lr, calls, replies = geocoder
+    def broken():
+        raise lr.sqlite3.OperationalError("unable to open database file")
+    monkeypatch.setattr(lr, "get_geocode_cache", broken)
+    replies.append(lr.ResolvedLocation("서울특별시 용산구 서울역", 37.55, 126.97, 1000, "geocoder"))
+    assert resolve_location("서울역").name == "서울특별시 용산구 서울역"
+
+def test_cache_path_is_relative_to_backend():
+    from Ai import LocationResolver as lr
+    assert os.path.isabs(lr.GEOCODE_CACHE_PATH)
+    assert os.path.dirname(lr.GAZETTEER_PATH) == os.path.join(lr.BACKEND_DIR, "Data")
@@ -0,0 +1,35 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : test_logic.py
+# 설명        : Ai/Logic.py 요청 의도 판별·지연 로딩 테스트
+# -----------------------------------------------------------------------------------
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from Ai.Logic import is_another_place
+
+@pytest.mark.parametrize("text", ["다른 식당 알려줘", "다른 곳은?", "다른곳", "다른 가게", "다른 맛집 없어?", "다른 데 없어?", "다른 데는?", "다른 데"])
+def test_another_place(text):
+    assert is_another_place(text)
+
+@pytest.mark.parametrize("text", ["기분이 좀 다른데", "평소랑 다른데 우울해", "다른데", "다른 데서 스트레스 받았어", "오늘은 다른 날이랑 다른데요"])
+def test_emotional_messages_are_not_place_requests(text):
+    assert not is_another_place(text)
+
+# import만으로는 외부 API 클라이언트를 만들거나 무거운 모듈을 불러오지 않아야 함 (첫 사용 시 로드)
+LAZY_MODULES = ["openai", "groq", "cohere", "rich", "googlesearch", "Ai.Model", "Ai.Chatbot", "Ai.RealtimeSearchEngine", "Ai.AppControl"]
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.mark.parametrize("module", ["Ai.Logic", "app"])
+def test_import_does_not_create_clients_or_load_heavy_modules(module):
+    code = (f"import sys, json, {module}\n"
+            "from Ai import Clients\n"
+            f"print(json.dumps({{'clients': sorted(Clients._clients), 'loaded': [m for m in {LAZY_MODULES!r} if m in sys.modules]}}))")
+    env = {**os.environ, "DATABASE_URL": "sqlite://"}
+    proc = subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, env=env, capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    assert json.loads(proc.stdout.splitlines()[-1]) == {"clients": [], "loaded": []}
@@ -0,0 +1,14 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : test_metrics.py
+# 설명        : /api/metrics 접근 제한 테스트 (로그인한 관리자만 조회)
+# -----------------------------------------------------------------------------------
+
+import app as server
+
+def test_metrics_requires_admin(client, monkeypatch):
+    assert client.get("/api/metrics").status_code == 403
+    monkeypatch.setattr(server, "ADMIN_EMAILS", {"user@test.com"})
+    response = client.get("/api/metrics")
+    assert response.status_code == 200 and "recommend_prefetch" in response.json()
+    client.cookies.clear()
+    assert client.get("/api/metrics").status_code == 401
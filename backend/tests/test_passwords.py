@@ -0,0 +1,51 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : test_passwords.py
+# 설명        : passwords.py 비밀번호 해시 테스트 (BCRYPT_ROUNDS=4, conftest에서 지정)
+#               - 해시·확인, 작업 비용이 바뀐 해시 판별
+#               - 대기열이 가득 차면 로그인·회원가입이 503
+#               - 작업 프로세스가 죽어 풀이 깨져도 다음 로그인부터 정상 처리
+# -----------------------------------------------------------------------------------
+
+import asyncio
+import time
+
+import bcrypt
+import pytest
+
+import passwords
+
+def test_hash_and_verify():
+    hashed = asyncio.run(passwords.hash_password("비밀번호"))
+    assert hashed.startswith("$2b$04$")
+    assert asyncio.run(passwords.verify_password("비밀번호", hashed))
+    assert not asyncio.run(passwords.verify_password("틀린 비밀번호", hashed))
+
+def test_needs_rehash():
+    assert not passwords.needs_rehash(bcrypt.hashpw(b"pw", bcrypt.gensalt(4)).decode())
+    assert passwords.needs_rehash(bcrypt.hashpw(b"pw", bcrypt.gensalt(5)).decode())
+    assert passwords.needs_rehash("평문")
+
+def test_busy_queue_returns_503(client, monkeypatch):
+    monkeypatch.setattr(passwords, "PASSWORD_QUEUE_LIMIT", 0)
+    for path, body in (("/api/login", {"email": "user@test.com", "password": "pw"}),
+                       ("/api/signup", {"name": "새 사용자", "email": "new@test.com", "password": "pw"})):
+        response = client.post(path, json=body)
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+    assert passwords.stats()["pending"] == 0
+
+def test_login_recovers_after_worker_crash(client):
+    assert client.post("/api/login", json={"email": "user@test.com", "password": "pw"}).status_code == 200
+    pool = passwords._get_pool()
+    for process in list(pool._processes.values()):  # 작업 프로세스가 비정상 종료된 상황
+        process.kill()
+    deadline = time.monotonic() + 10
+    while not pool._broken and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert pool._broken
+
+    restarts = passwords.stats()["restarts"]
+    for _ in range(2):
+        assert client.post("/api/login", json={"email": "user@test.com", "password": "pw"}).status_code == 200
+    assert passwords.stats()["restarts"] == restarts + 1
+    assert passwords._get_pool() is not pool
@@ -0,0 +1,210 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : test_rate_limit.py
+# 설명        : rate_limit.py 토큰 버킷(GCRA)과 FairScheduler 테스트
+#               (redis 버킷은 tests/redis_stand_in.py에서 Lua 스크립트를 실제로 실행, lupa가 없으면 건너뜀)
+# -----------------------------------------------------------------------------------
+
+import asyncio
+
+import pytest
+
+import rate_limit
+from cache import RedisBackend, SQLiteBackend
+from rate_limit import FairScheduler, InboundLimiter, Limit, LocalBuckets, RateLimited, RedisBuckets, SQLiteBuckets
+from tests.redis_stand_in import StandInRedis
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rate_limit.time, "monotonic", clock)
+    monkeypatch.setattr(rate_limit.time, "time", clock)
+    return clock
+
+@pytest.fixture
+def redis_server():
+    pytest.importorskip("lupa")
+    with StandInRedis() as server:
+        yield server
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def buckets(request, tmp_path):
+    if request.param == "memory":
+        return LocalBuckets()
+    if request.param == "sqlite":
+        return SQLiteBuckets(SQLiteBackend(str(tmp_path / "cache.sqlite3")))
+    return RedisBuckets(RedisBackend(request.getfixturevalue("redis_server").url))
+
+# ────────────────────────────────────────────────
+# 1) 토큰 버킷
+# ────────────────────────────────────────────────
+def test_burst_then_refill(buckets, clock):
+    limit = Limit(3, 60)  # 3번까지 바로, 이후 20초마다 1번
+    assert [buckets.take("k", limit) for _ in range(3)] == [0, 0, 0]
+    assert buckets.take("k", limit) == pytest.approx(20)
+    clock.now += 20
+    assert buckets.take("k", limit) == 0
+    assert buckets.take("k", limit) == pytest.approx(20)
+    assert buckets.take("other", limit) == 0  # 키마다 따로 계산
+
+def test_cost_and_rejected_take_is_free(buckets, clock):
+    limit = Limit(4, 40)
+    assert buckets.take("k", limit, cost=3) == 0
+    assert buckets.take("k", limit, cost=2) == pytest.approx(10)
+    assert buckets.take("k", limit, cost=1) == 0  # 거절된 요청은 토큰을 쓰지 않음
+
+def test_redis_script_runs_on_server_and_expires_full_buckets(redis_server, clock):
+    buckets = RedisBuckets(RedisBackend(redis_server.url))
+    limit = Limit(2, 60)
+    assert buckets.take("k", limit) == 0
+    assert redis_server.commands[-1] == "EVAL" and "GET" not in redis_server.commands  # 읽고 고치기를 서버에서 한 번에
+    assert float(redis_server.data[b"k"][0]) == pytest.approx(clock.now + 30)
+    assert redis_server.data[b"k"][1] == pytest.approx(clock.now + 30)  # 버킷이 다시 가득 차면 키가 사라짐
+    assert buckets.take("k", limit) == 0
+    assert buckets.take("k", limit) == pytest.approx(30)
+    clock.now += 61
+    assert redis_server.alive(b"k") is None
+
+def test_inbound_limiter_checks_user_then_ip(clock):
+    limiter = InboundLimiter({"llm": Limit(1, 60), "cheap": Limit(5, 60)}, {"llm": Limit(2, 60), "cheap": Limit(5, 60)})
+    limiter.check(1, "1.1.1.1", "llm")
+    with pytest.raises(RateLimited):
+        limiter.check(1, "1.1.1.1", "llm")
+    limiter.check(2, "1.1.1.1", "llm")
+    with pytest.raises(RateLimited):
+        asyncio.run(limiter.check_async(3, "1.1.1.1", "llm"))
+    limiter.check(1, "1.1.1.1", "cheap")  # 종류마다 다른 버킷
+    assert limiter.limited == {"user:llm": 1, "ip:llm": 1}
+
+def test_inbound_limiter_falls_back_on_store_error(clock):
+    class Broken:
+        name = "broken"
+        blocking = True
+
+        def take(self, key, limit, cost=1):
+            raise OSError("down")
+
+    limiter = InboundLimiter({"llm": Limit(1, 60), "cheap": Limit(1, 60)}, {"llm": Limit(9, 60), "cheap": Limit(9, 60)}, Broken())
+    asyncio.run(limiter.check_async(1, None, "llm"))
+    with pytest.raises(RateLimited):
+        limiter.check(1, None, "llm")
+    assert limiter.errors == 2
+
+def test_inbound_limiter_falls_back_when_store_cannot_be_created(clock, monkeypatch):
+    def broken():
+        raise OSError("disk I/O error")
+    monkeypatch.setattr(rate_limit, "create_buckets", broken)
+    limiter = InboundLimiter({"llm": Limit(1, 60), "cheap": Limit(1, 60)}, {"llm": Limit(9, 60), "cheap": Limit(9, 60)})
+    asyncio.run(limiter.check_async(1, None, "llm"))
+    with pytest.raises(RateLimited):
+        asyncio.run(limiter.check_async(1, None, "llm"))
+    assert limiter.stats()["backend"] == "memory" and limiter.errors == 1  # CREATE_RETRY초 동안은 다시 만들지 않음
+
+    monkeypatch.setattr(rate_limit, "create_buckets", LocalBuckets)
+    clock.now += InboundLimiter.CREATE_RETRY
+    limiter.check(2, None, "llm")
+    assert limiter._buckets is not None and limiter.errors == 1
+
+def test_get_response_returns_429_with_retry_after(client, monkeypatch):
+    import app as server
+    monkeypatch.setattr(server, "inbound_limiter", InboundLimiter({"llm": Limit(1, 60), "cheap": Limit(2, 60)}, buckets=LocalBuckets()))
+    session_id = client.post("/api/sessions", json={"title": "t"}).json()["id"]
+    for _ in range(2):
+        assert client.post("/get_response", data={"message": "안녕", "session_id": session_id}).status_code == 200
+    response = client.post("/get_response", data={"message": "안녕", "session_id": session_id})
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "30"
+    assert server.inbound_limiter.limited == {"user:cheap": 1}
+
+# ────────────────────────────────────────────────
+# 2) FairScheduler
+# ────────────────────────────────────────────────
+async def _run_jobs(scheduler, jobs, order):
+    async def job(key, name):
+        async with scheduler.slot(key):
+            order.append(name)
+            await asyncio.sleep(0)
+    tasks = [asyncio.create_task(job(key, name)) for key, name in jobs]
+    await asyncio.gather(*tasks)
+
+def test_round_robin_between_users():
+    async def main():
+        scheduler = FairScheduler(capacity=1, max_queued=3)
+        order = []
+        await scheduler.acquire("holder")
+        runner = asyncio.create_task(_run_jobs(scheduler, [("a", "a1"), ("a", "a2"), ("a", "a3"), ("b", "b1"), ("b", "b2")], order))
+        while scheduler.stats()["waiting"] < 5:
+            await asyncio.sleep(0)
+        scheduler.release()
+        await runner
+        assert order == ["a1", "b1", "a2", "b2", "a3"]
+        assert scheduler.active == 0 and scheduler.stats()["waiting"] == 0
+    asyncio.run(main())
+
+def test_max_queued_per_user():
+    async def main():
+        scheduler = FairScheduler(capacity=1, max_queued=1)
+        await scheduler.acquire("holder")
+        waiting = asyncio.create_task(scheduler.acquire("a"))
+        await asyncio.sleep(0)
+        with pytest.raises(RateLimited):
+            await scheduler.acquire("a")
+        await scheduler_release_and_wait(scheduler, waiting)
+        assert scheduler.rejected == 1
+    asyncio.run(main())
+
+async def scheduler_release_and_wait(scheduler, task):
+    scheduler.release()
+    await task
+    scheduler.release()
+    assert scheduler.active == 0
+
+def test_cancel_while_waiting():
+    async def main():
+        scheduler = FairScheduler(capacity=1, max_queued=2)
+        await scheduler.acquire("holder")
+        cancelled = asyncio.create_task(scheduler.acquire("a"))
+        other = asyncio.create_task(scheduler.acquire("b"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        assert cancelled.cancelled()
+        assert list(scheduler._queues) == ["b"]
+        await scheduler_release_and_wait(scheduler, other)
+    asyncio.run(main())
+
+def test_cancel_after_release_popped_future():
+    async def main():
+        # 취소된 future를 release()가 먼저 꺼내도 acquire가 ValueError 없이 취소로 끝나야 함
+        scheduler = FairScheduler(capacity=1, max_queued=2)
+        await scheduler.acquire("holder")
+        cancelled = asyncio.create_task(scheduler.acquire("a"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        scheduler.release()
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+        assert scheduler.active == 0 and not scheduler._queues
+    asyncio.run(main())
+
+def test_cancel_after_turn_granted_passes_turn_on():
+    async def main():
+        scheduler = FairScheduler(capacity=1, max_queued=2)
+        await scheduler.acquire("holder")
+        granted = asyncio.create_task(scheduler.acquire("a"))
+        other = asyncio.create_task(scheduler.acquire("b"))
+        await asyncio.sleep(0)
+        scheduler.release()  # a의 차례
+        granted.cancel()     # 차례를 받았지만 실행 전에 취소
+        with pytest.raises(asyncio.CancelledError):
+            await granted
+        await other  # 취소된 a 대신 b가 차례를 받음
+        scheduler.release()
+        assert scheduler.active == 0
+    asyncio.run(main())
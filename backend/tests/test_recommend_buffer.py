@@ -0,0 +1,43 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : test_recommend_buffer.py
+# 설명        : Ai/RecommendBuffer.py 추천 선계산 버퍼 테스트 (부분 실패, 세션 삭제·회원 탈퇴 API에서 제거)
+# -----------------------------------------------------------------------------------
+
+from Ai.RecommendBuffer import RecommendBuffer, recommend_buffer
+
+def test_prefetch_keeps_successful_foods():
+    buffer = RecommendBuffer(depth=3)
+
+    def find(food, location):
+        if food == "파스타":
+            raise RuntimeError("Places 오류")
+        return {"name": f"{food} 식당"}
+
+    buffer.prefetch("s", "강남", ["김밥", "파스타", "치킨"], find)
+    popped = {buffer.pop("s", "강남")[0], buffer.pop("s", "강남")[0]}
+    assert popped == {"김밥", "치킨"}
+    assert buffer.pop("s", "강남") is None
+    assert buffer.stats()["prefetched"] == 2
+
+    buffer.prefetch("s", "강남", ["김밥"], find)  # 실패 후에도 다시 prefetch할 수 있음
+    assert buffer.pop("s", "강남")[0] == "김밥"
+
+def test_pop_skips_other_location_and_suggested():
+    buffer = RecommendBuffer(depth=2)
+    buffer.prefetch("s", "강남", ["김밥", "치킨"], lambda food, location: {"name": food})
+    buffer.mark_suggested("s", "김밥")
+    assert buffer.pop("s", "홍대") is None
+    buffer.prefetch("s", "강남", ["김밥", "치킨"], lambda food, location: {"name": food})
+    assert buffer.pop("s", "강남")[0] == "치킨"
+
+def test_delete_session_and_account_drop_buffer(client):
+    first, second, third = (client.post("/api/sessions", json={"title": "t"}).json()["id"] for _ in range(3))
+    for session_id in (first, second, third):
+        recommend_buffer.mark_suggested(session_id, "김밥")
+    sessions = recommend_buffer.stats()["sessions"]
+
+    assert client.delete(f"/api/sessions/{first}").status_code == 200
+    assert recommend_buffer.stats()["sessions"] == sessions - 1
+    assert client.delete("/api/delete-account").status_code == 200
+    assert recommend_buffer.stats()["sessions"] == sessions - 3
+    assert recommend_buffer.last_suggested(second) is None
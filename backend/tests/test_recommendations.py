@@ -0,0 +1,132 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : test_recommendations.py
+# 설명        : /api/recommendations 일괄 추천 API와 SearchContent.find_restaurants_many 테스트
+#               (GPT·Places 대신 호출을 기록하는 가짜 사용)
+#               - 같은 검색은 Places를 한 번만 호출, 같은 감정 묶음은 GPT를 한 번만 호출
+#               - 검색 하나가 실패해도 나머지는 반환, 결과는 입력 순서대로
+#               - 입력 제한(422)과 요청 수 제한 비용(감정 수 + 서로 다른 검색 수)
+# -----------------------------------------------------------------------------------
+
+import threading
+
+import pytest
+
+import app as server
+import models, rate_limit
+from Ai import SearchContent
+
+class Upstream:
+    """Places 검색·GPT 추천 대신 호출을 기록하고 고정 결과를 돌려줌 (failing 음식은 검색 실패)"""
+    def __init__(self, failing=()):
+        self.places, self.gpt = [], []
+        self.failing = set(failing)
+        self.lock = threading.Lock()
+
+    def searched(self):
+        """Places 검색한 (음식, 위치 이름) 목록 (정렬)"""
+        return sorted((food, location) for food, location, _ in self.places)
+
+    def search(self, food, location, resolved, origin, key):
+        with self.lock:
+            self.places.append(key)
+        if food in self.failing:
+            raise RuntimeError("Places 오류")
+        restaurants = [SearchContent.Restaurant(name=f"{food} {i}호점", address=key[1], latitude=37.5, longitude=127.0,
+                                                rating=4.0, reviews=100, place_id=f"{food}-{key[1]}-{i}") for i in range(3)]
+        SearchContent._search_cache.set(key, restaurants)
+        return restaurants
+
+    def gpt_reply(self, text, recent_foods=None, chat_history=None, use_cache=True):
+        with self.lock:
+            self.gpt.append(text)
+        return "우울함", "김치찌개", "따뜻한 국물이 기분을 풀어 줄 거예요."
+
+class RecordingLimiter(rate_limit.InboundLimiter):
+    """제한 없이 통과시키고 check 비용만 기록"""
+    def __init__(self, burst=10 ** 6):
+        limit = rate_limit.Limit(burst, 60)
+        super().__init__({"llm": limit, "cheap": limit}, {"llm": limit, "cheap": limit}, rate_limit.LocalBuckets())
+        self.costs = []
+
+    def check(self, user_id, ip, kind, cost=1):
+        self.costs.append((kind, cost))
+        super().check(user_id, ip, kind, cost)
+
+@pytest.fixture
+def upstream(monkeypatch):
+    fake = Upstream()
+    SearchContent._search_cache.clear()
+    monkeypatch.setattr(SearchContent, "_search_places", fake.search)
+    monkeypatch.setattr(server, "classify_emotion_and_reply_with_gpt", fake.gpt_reply)
+    monkeypatch.setattr(server, "fetch_details", lambda restaurants: restaurants)
+    monkeypatch.setattr(server, "inbound_limiter", RecordingLimiter())
+    yield fake
+    SearchContent._search_cache.clear()
+
+def recommend(client, **body):
+    return client.post("/api/recommendations", json=body)
+
+def test_find_restaurants_many_dedups_and_keeps_failures_per_query(upstream):
+    upstream.failing.add("피자")
+    found = SearchContent.find_restaurants_many([("국밥", "강남구  역삼동"), ("국밥", "강남구 역삼동"), ("피자", "강남구"), ("국밥", "강남구 역삼동")], limit=2)
+    assert upstream.searched() == [("국밥", "강남구 역삼동"), ("피자", "서울특별시 강남구")]
+    assert [r.name for r in found[("국밥", "강남구  역삼동")]] == ["국밥 0호점", "국밥 1호점"]
+    assert found[("국밥", "강남구 역삼동")] == found[("국밥", "강남구  역삼동")]
+    assert found[("피자", "강남구")] is None
+
+    # 두 번째 조회는 캐시에서 (실패한 검색만 다시 시도)
+    SearchContent.find_restaurants_many([("국밥", "강남구 역삼동"), ("피자", "강남구")])
+    assert len(upstream.places) == 3
+
+def test_recommendations_dedup_searches_and_emotions(client, upstream, db):
+    response = recommend(client, location="강남구", foods=["국밥", "국밥", "피자"], items=[
+        {"food": "국밥", "location": "강남구 "},
+        {"emotion": "우울해"},
+        {"emotion": "너무 우울해"},
+        {"emotion": "우울해", "location": "서초구"},
+    ])
+    assert response.status_code == 200
+    assert len(upstream.gpt) == 1  # 같은 감정 키워드 묶음
+    assert upstream.searched() == [("국밥", "서울특별시 강남구"), ("김치찌개", "서울특별시 강남구"),
+                                   ("김치찌개", "서울특별시 서초구"), ("피자", "서울특별시 강남구")]
+    # 로그를 남기지 않음
+    assert db.query(models.ChatLog).count() == 0
+
+def test_recommendations_keep_input_order_and_report_errors(client, upstream):
+    upstream.failing.add("피자")
+    response = recommend(client, location="강남구", limit=2, foods=["피자", "국밥"], items=[{"emotion": "우울해", "location": "서초구"}, {"food": "냉면"}])
+    results = response.json()["results"]
+    assert [(r["food"], r["location"]) for r in results] == [("피자", "강남구"), ("국밥", "강남구"), ("김치찌개", "서초구"), ("냉면", "강남구")]
+    assert results[0]["restaurants"] == [] and results[0]["error"] == "식당을 검색하지 못했어요."
+    assert [r["name"] for r in results[1]["restaurants"]] == ["국밥 0호점", "국밥 1호점"]
+    assert results[2]["emotion"] == "우울해" and results[2]["reason"] and "error" not in results[2]
+    assert "error" not in results[3]
+
+def test_recommendations_report_emotion_without_food(client, upstream, monkeypatch):
+    monkeypatch.setattr(server, "classify_emotion_and_reply_with_gpt", lambda text, **kwargs: ("모름", None, None))
+    results = recommend(client, items=[{"emotion": "음..."}, {"food": "국밥"}]).json()["results"]
+    assert results[0]["food"] is None and results[0]["error"] == "추천할 음식을 정하지 못했어요."
+    assert results[1]["restaurants"]
+
+@pytest.mark.parametrize("body", [
+    {},
+    {"foods": ["  "]},
+    {"items": [{"location": "강남구"}]},
+    {"foods": [f"음식{i}" for i in range(server.RECOMMEND_BATCH_MAX + 1)]},
+    {"items": [{"emotion": emotion} for emotion in ["우울해", "행복해", "화나", "피곤해", "설레", "심심해"][:server.RECOMMEND_MAX_EMOTIONS + 1]]},
+])
+def test_recommendations_reject_invalid_batches(client, upstream, body):
+    assert recommend(client, **body).status_code == 422
+    assert not upstream.places and not upstream.gpt and not server.inbound_limiter.costs
+
+def test_recommendations_cost_counts_emotions_and_distinct_searches(client, upstream):
+    recommend(client, location="강남구", foods=["국밥", "국밥", "피자", "냉면"], items=[{"food": "국밥", "location": " 강남구"}, {"emotion": "우울해"}, {"emotion": "우울해"}])
+    # 감정 묶음 1 + 검색 (국밥·피자·냉면·감정 음식) 4
+    assert server.inbound_limiter.costs == [("llm", 5)]
+
+def test_recommendations_reject_batches_over_the_rate_budget(client, upstream, monkeypatch):
+    monkeypatch.setattr(server, "inbound_limiter", RecordingLimiter(burst=3))
+    assert recommend(client, foods=["국밥", "피자", "냉면"]).status_code == 200
+    response = recommend(client, foods=["국밥", "피자", "냉면", "라멘"])
+    assert response.status_code == 422
+    assert server.inbound_limiter.costs == [("llm", 3)]
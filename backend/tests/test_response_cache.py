@@ -0,0 +1,97 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : test_response_cache.py
+# 설명        : Ai/ResponseCache.py 감정 응답 캐시 테스트
+#               + classify_emotion_and_reply_with_gpt가 캐시를 쓰는 조건 (이전 대화, 최근 추천 음식)
+# -----------------------------------------------------------------------------------
+
+from types import SimpleNamespace
+
+import pytest
+
+from Ai import Logic
+from Ai.Clients import set_client
+from Ai.ResponseCache import ResponseCache, make_key
+from cache import MemoryBackend
+
+def response_cache(**kwargs):
+    return ResponseCache(backend=MemoryBackend(), **kwargs)
+
+class FakeOpenAI:
+    """chat.completions.create 호출 수를 세고 정해진 형식으로 답함"""
+    def __init__(self, food="김치찌개"):
+        self.food = food
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=self)
+
+    def create(self, **kwargs):
+        self.calls += 1
+        content = f"기분 요약: 우울\n추천 음식: {self.food}\n추천 이유: 따뜻한 국물"
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+@pytest.fixture
+def gpt(monkeypatch):
+    fake = FakeOpenAI()
+    set_client("openai", fake)
+    monkeypatch.setattr(Logic, "response_cache", response_cache(min_variants=1))
+    yield fake
+    set_client("openai", None)
+
+def log(role, message):
+    return SimpleNamespace(role=role, message=message)
+
+def test_make_key_ignores_keyword_order():
+    assert make_key(["피곤", "우울"], "저녁") == make_key(["우울", "피곤"], "저녁")
+    assert make_key([], "저녁") is None
+
+def test_hits_after_min_replies_even_if_food_repeats():
+    cache = response_cache(min_variants=3)
+    key = make_key(["우울"], "저녁")
+    for _ in range(2):
+        cache.put(key, ("우울함", "김치찌개", "따뜻한 국물"))
+        assert cache.get(key) is None
+    cache.put(key, ("우울함", "김치찌개", "따뜻한 국물"))
+    assert cache.get(key) == ("우울함", "김치찌개", "따뜻한 국물")
+    assert cache.get(key, exclude={"김치찌개"}) is None
+
+def test_rotates_between_foods():
+    cache = response_cache(min_variants=3)
+    key = make_key(["우울"], "저녁")
+    for food in ("김치찌개", "떡볶이", "김치찌개"):
+        cache.put(key, ("우울함", food, "이유"))
+    assert [cache.get(key)[1] for _ in range(4)] == ["김치찌개", "떡볶이", "김치찌개", "떡볶이"]
+    assert cache.get(key, exclude={"김치찌개"})[1] == "떡볶이"
+
+def test_reply_is_cached_only_without_earlier_conversation(gpt):
+    text = "오늘 너무 우울해"
+    assert Logic.classify_emotion_and_reply_with_gpt(text)[1] == "김치찌개"
+    assert Logic.classify_emotion_and_reply_with_gpt(text, chat_history=[log("user", text)])[1] == "김치찌개"
+    assert gpt.calls == 1  # 방금 저장한 이 메시지뿐인 대화는 새 대화와 같음
+
+    # 다른 대화의 답을 재사용하지 않고, 대화에 따른 답을 캐시에 넣지도 않음
+    gpt.food = "떡볶이"
+    history = [log("user", "매운 거 좋아해"), log("assistant", "매운 음식을 기억할게요"), log("user", text)]
+    assert Logic.classify_emotion_and_reply_with_gpt(text, chat_history=history)[1] == "떡볶이"
+    assert gpt.calls == 2
+    assert Logic.classify_emotion_and_reply_with_gpt(text)[1] == "김치찌개"
+    assert gpt.calls == 2
+
+def test_recent_foods_skip_cached_reply(gpt):
+    text = "오늘 너무 우울해"
+    Logic.classify_emotion_and_reply_with_gpt(text)
+    gpt.food = "떡볶이"
+    assert Logic.classify_emotion_and_reply_with_gpt(text, recent_foods=["김치찌개"])[1] == "떡볶이"
+    assert gpt.calls == 2
+
+def test_get_response_passes_recent_foods(client, monkeypatch):
+    import app as server
+    seen = []
+    def reply(text, recent_foods=None, chat_history=None, use_cache=True):
+        seen.append(list(recent_foods))
+        return "우울", ["김치찌개", "떡볶이"][len(seen) - 1], "이유"
+    monkeypatch.setattr(server, "classify_emotion_and_reply_with_gpt", reply)
+    monkeypatch.setattr(server, "find_restaurants_nearby", lambda food, location: [])
+    monkeypatch.setattr(server.recommend_buffer, "prefetch", lambda *args, **kwargs: None)
+    session_id = client.post("/api/sessions", json={"title": "t"}).json()["id"]
+    for _ in range(2):
+        assert client.post("/get_response", data={"message": "오늘 너무 우울해", "session_id": session_id}).status_code == 200
+    assert seen == [[], ["김치찌개"]]
@@ -0,0 +1,52 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : test_rows_response.py
+# 설명        : rows_response(세션·로그·즐겨찾기 목록 응답) 형식 테스트
+#               - 필드 구성과 시각 형식이 jsonable_encoder 응답과 같음
+#               - 응답을 만들 때 경고(사용 중단 등)가 나지 않음
+# -----------------------------------------------------------------------------------
+
+import collections
+import datetime
+import json
+import warnings
+
+from fastapi.encoders import jsonable_encoder
+
+import app as server
+import crud
+from database import SessionLocal
+
+Row = collections.namedtuple("Row", "id created_at")
+
+def test_rows_response_keeps_jsonable_encoder_datetime_format():
+    kst = datetime.timezone(datetime.timedelta(hours=9))
+    rows = [Row(1, datetime.datetime(2026, 1, 2, 3, 4, 5, 6)),
+            Row(2, datetime.datetime(2026, 1, 2, 3, 4, 5, tzinfo=kst)),
+            Row(3, datetime.datetime(2026, 1, 2, 3, 4, 5, 123000, tzinfo=datetime.timezone.utc))]
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        response = server.rows_response(rows, extra=None)
+    assert response.media_type == "application/json"
+    assert json.loads(response.body) == jsonable_encoder([{**row._asdict(), "extra": None} for row in rows])
+    assert [row["created_at"] for row in json.loads(response.body)] == [
+        "2026-01-02T03:04:05.000006", "2026-01-02T03:04:05+09:00", "2026-01-02T03:04:05.123000+00:00"]
+
+def test_list_endpoints_keep_response_shape(client):
+    session_id = client.post("/api/sessions", json={"title": "대화"}).json()["id"]
+    client.post("/api/add_bookmark", json={"name": "국밥집", "url": "https://example.com"})
+    with SessionLocal() as db:
+        user_id = crud.get_user_by_email(db, "user@test.com").id
+        crud.save_chat(db, session_id, user_id, "안녕", None, None, "user")
+        expected = {
+            "/api/sessions": jsonable_encoder([{**row._asdict(), "last_message": None, "last_date": None}
+                                               for row in crud.get_session_rows(db, user_id)]),
+            f"/api/sessions/{session_id}/logs": jsonable_encoder([row._asdict() for row in crud.get_recent_logs(db, session_id)]),
+            "/api/bookmarks": jsonable_encoder([row._asdict() for row in crud.get_bookmark_rows(db, user_id)]),
+        }
+    for url, rows in expected.items():
+        response = client.get(url)
+        assert response.headers["content-type"] == "application/json"
+        assert response.json() == rows and len(rows) == 1
+    assert set(expected["/api/sessions"][0]) >= {"id", "title", "created_at", "last_message", "last_date"}
+    assert set(expected[f"/api/sessions/{session_id}/logs"][0]) >= {"id", "message", "role", "created_at"}
+    assert set(expected["/api/bookmarks"][0]) >= {"id", "name", "url", "created_at"}
@@ -0,0 +1,31 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : test_schema.py
+# 설명        : 기존 DB의 외래 키를 모델(ON DELETE CASCADE)에 맞추는 서버 시작 작업 테스트
+# -----------------------------------------------------------------------------------
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import AddConstraint
+
+import models
+
+def test_detects_foreign_keys_without_cascade(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        # ON DELETE CASCADE를 추가하기 전 create_all이 만든 스키마 (bookmark만 이미 바뀐 상태)
+        conn.execute(text("CREATE TABLE users (id INTEGER PRIMARY KEY, name VARCHAR, email VARCHAR, hashed_password VARCHAR)"))
+        conn.execute(text("CREATE TABLE chat_sessions (id VARCHAR PRIMARY KEY, user_id INTEGER NOT NULL, title VARCHAR, "
+                          "created_at DATETIME, FOREIGN KEY(user_id) REFERENCES users (id))"))
+        conn.execute(text("CREATE TABLE bookmark (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, name VARCHAR, url VARCHAR, "
+                          "created_at DATETIME, FOREIGN KEY(user_id) REFERENCES users (id) ON DELETE CASCADE)"))
+
+    stale = models.stale_foreign_keys(engine)
+    assert [(table.name, constraint.column_keys) for table, _, constraint in stale] == [("chat_sessions", ["user_id"])]
+    assert models.sync_foreign_keys(engine) == 0  # SQLite는 ALTER TABLE로 바꿀 수 없어 건너뜀
+
+    ddl = str(AddConstraint(stale[0][2]).compile(dialect=postgresql.dialect()))
+    assert ddl.startswith("ALTER TABLE chat_sessions ADD FOREIGN KEY(user_id) REFERENCES users (id) ON DELETE CASCADE")
+
+def test_current_schema_is_in_sync(db):
+    from database import engine
+    assert models.stale_foreign_keys(engine) == []
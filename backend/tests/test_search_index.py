@@ -0,0 +1,63 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : test_search_index.py
+# 설명        : search_index.py 검색 테스트 (긴 단어·짧은 단어·사용자 범위)
+# -----------------------------------------------------------------------------------
+
+from sqlalchemy import text
+
+import models
+import search_index
+
+def add_user(db, user_id, messages, bookmarks=()):
+    db.add(models.User(id=user_id, name="u", email=f"{user_id}@test.com", hashed_password="x"))
+    db.add(models.ChatSession(id=f"s{user_id}", user_id=user_id, title="t"))
+    db.flush()
+    for message in messages:
+        db.add(models.ChatLog(session_id=f"s{user_id}", user_id=user_id, role="user", message=message))
+    for name in bookmarks:
+        db.add(models.Bookmark(user_id=user_id, name=name, url="https://example.com"))
+    db.commit()
+
+def found(db, user_id, query):
+    return sorted(r["message"] for r in search_index.search(db, user_id, query))
+
+def test_search(db):
+    add_user(db, 1, ["오늘 국밥 먹음", "김치찌개 국물 좋아", "라멘 맛집", "김치찌개 먹음", "100% 만족"], ["국밥집"])
+    add_user(db, 2, ["국밥 최고", "김치찌개 먹음"])
+    assert found(db, 1, "김치찌개") == ["김치찌개 국물 좋아", "김치찌개 먹음"]
+    assert found(db, 1, "김치찌개 국물") == ["김치찌개 국물 좋아"]
+    assert found(db, 1, "김치찌개 국") == ["김치찌개 국물 좋아"]  # 긴 단어는 인덱스로, 짧은 단어는 찾은 행 안에서
+    assert found(db, 1, "국밥") == ["국밥집", "오늘 국밥 먹음"]  # 짧은 단어만: 최근 행 LIKE
+    assert found(db, 1, "100%") == ["100% 만족"]
+    assert found(db, 1, "  ") == []
+
+def test_short_query_only_scans_recent_rows(db, monkeypatch):
+    add_user(db, 1, ["국밥 옛날이야기"] + ["다른 이야기"] * 5)
+    monkeypatch.setattr(search_index, "SHORT_QUERY_RECENT_ROWS", 3)
+    db.execute(text("UPDATE chat_logs SET created_at = '2000-01-01 00:00:00' WHERE message = '국밥 옛날이야기'"))
+    db.commit()
+    assert found(db, 1, "국밥") == []
+    assert search_index.is_partial(db, 1, "국밥")
+    assert found(db, 1, "국밥 옛날이야기") == ["국밥 옛날이야기"]  # 긴 단어가 있으면 전체에서 찾음
+    assert not search_index.is_partial(db, 1, "국밥 옛날이야기")
+
+def test_short_query_is_complete_within_recent_rows(db, monkeypatch):
+    add_user(db, 1, ["국밥"] * 3, ["국밥집"])
+    monkeypatch.setattr(search_index, "SHORT_QUERY_RECENT_ROWS", 3)
+    assert not search_index.is_partial(db, 1, "국밥")
+    add_user(db, 2, [], ["국밥집"] * 4)
+    assert search_index.is_partial(db, 2, "국밥")  # 즐겨찾기가 많아도 마찬가지
+
+def test_search_api_reports_partial_results(client, monkeypatch):
+    monkeypatch.setattr(search_index, "SHORT_QUERY_RECENT_ROWS", 1)
+    for name in ("국밥집", "국밥 맛집"):
+        client.post("/api/add_bookmark", json={"name": name, "url": "https://example.com"})
+    body = client.get("/api/search", params={"q": "국밥"}).json()
+    assert body["partial"] is True and len(body["results"]) == 1
+    body = client.get("/api/search", params={"q": "국밥집"}).json()
+    assert body["partial"] is False and [r["name"] for r in body["results"]] == ["국밥집"]
+
+def test_short_query_uses_user_index(db):
+    statement = "EXPLAIN QUERY PLAN SELECT id FROM chat_logs WHERE user_id = 1 ORDER BY created_at DESC LIMIT 10"
+    plan = " ".join(row[-1] for row in db.execute(text(statement)))
+    assert "ix_chat_logs_user_created" in plan
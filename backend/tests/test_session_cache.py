@@ -0,0 +1,96 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : test_session_cache.py
+# 설명        : session_cache.py SessionLogCache와 crud.get_recent_logs의 버전 기반 무효화 테스트
+# -----------------------------------------------------------------------------------
+
+import datetime
+
+from sqlalchemy import select
+
+import crud
+import models
+from session_cache import LogRow, SessionLogCache, row_size, session_log_cache
+
+def row(i, message="안녕"):
+    return LogRow(i, "s", 1, "user", message, None, None, datetime.datetime(2024, 1, 1, 0, 0, i))
+
+def filled(cache, rows, version, complete=True):
+    cache.fill("s", cache.begin_fill("s"), rows, complete, version)
+    return cache
+
+# ────────────────────────────────────────────────
+# 1) SessionLogCache
+# ────────────────────────────────────────────────
+def test_hit_only_with_same_version():
+    cache = filled(SessionLogCache(), [row(1), row(2)], version=3)
+    assert cache.get("s", 3) == [row(1), row(2)]
+    assert cache.get("s", 4) is None  # 다른 워커가 쓰거나 지움 → 버리고 다시 채워야 함
+    assert cache.get("s", 3) is None
+    assert cache.stats()["sessions"] == 0
+
+def test_append_follows_version():
+    cache = filled(SessionLogCache(), [row(1)], version=1)
+    cache.append("s", row(2), version=2)
+    assert cache.get("s", 2) == [row(1), row(2)]
+    cache.append("s", row(4), version=4)  # 버전 3(다른 워커의 저장)을 놓침 → 세션을 버림
+    assert cache.get("s", 4) is None
+
+def test_fill_discarded_after_concurrent_write():
+    cache = SessionLogCache()
+    token = cache.begin_fill("s")
+    cache.invalidate("s")  # 조회하는 사이 삭제
+    cache.fill("s", token, [row(1)], True, 1)
+    assert cache.get("s", 1) is None
+
+def test_window_and_limit():
+    cache = filled(SessionLogCache(max_messages=3), [row(i) for i in range(1, 6)], version=1, complete=False)
+    assert cache.get("s", 1, limit=2) == [row(4), row(5)]
+    assert cache.get("s", 1, limit=4) is None  # 창보다 많이 요청하면 DB에서 읽어야 함
+    assert cache.get("s", 1) is None
+
+def test_evicts_least_recently_used():
+    cache = SessionLogCache(max_bytes=3 * row_size(row(1)))  # 한 건짜리 세션 세 개
+    for session_id in ("a", "b", "c"):
+        cache.fill(session_id, cache.begin_fill(session_id), [row(1)], True, 1)
+    cache.get("a", 1)
+    cache.fill("d", cache.begin_fill("d"), [row(1)], True, 1)
+    assert [s for s in "abcd" if cache.get(s, 1)] == ["a", "c", "d"]
+    assert cache.stats()["evictions"] == 1
+
+# ────────────────────────────────────────────────
+# 2) crud와 함께 사용
+# ────────────────────────────────────────────────
+def test_recent_logs_see_other_worker_writes(db):
+    db.add(models.User(id=1, name="u", email="u@test.com", hashed_password="x"))
+    db.commit()
+    session_id = crud.create_session(db, 1, "t").id
+    crud.save_chat(db, session_id, 1, "첫 메시지", None, None, "user")
+    assert [r.message for r in crud.get_recent_logs(db, session_id)] == ["첫 메시지"]
+    hits = session_log_cache.hits
+    assert [r.message for r in crud.get_recent_logs(db, session_id)] == ["첫 메시지"]
+    assert session_log_cache.hits == hits + 1
+
+    # 다른 워커 프로세스의 저장: 이 프로세스의 캐시에는 덧붙지 않고 DB 버전만 올라감
+    db.add(models.ChatLog(session_id=session_id, user_id=1, role="assistant", message="다른 워커"))
+    crud.bump_version(db, crud.logs_scope(session_id))
+    db.commit()
+    assert [r.message for r in crud.get_recent_logs(db, session_id)] == ["첫 메시지", "다른 워커"]
+
+    crud.save_chat(db, session_id, 1, "세 번째", None, None, "user")
+    assert [r.message for r in crud.get_recent_logs(db, session_id, limit=2)] == ["다른 워커", "세 번째"]
+    crud.delete_session(db, session_id)
+    assert session_log_cache.get(session_id, crud.get_version(db, crud.logs_scope(session_id))) is None
+
+def test_delete_user_removes_log_versions(db):
+    V = models.VersionStamp
+    for user_id in (1, 2):
+        db.add(models.User(id=user_id, name="u", email=f"{user_id}@test.com", hashed_password="x"))
+    db.commit()
+    deleted = [crud.create_session(db, 1, "t").id for _ in range(2)]
+    kept = crud.create_session(db, 2, "t").id
+    for session_id in deleted + [kept]:
+        crud.save_chat(db, session_id, 1, "안녕", None, None, "user")
+    crud.delete_user(db, 1)
+    scopes = set(db.execute(select(V.scope)).scalars())
+    assert not {crud.logs_scope(s) for s in deleted} & scopes
+    assert {crud.logs_scope(kept), crud.sessions_scope(1), crud.sessions_scope(2)} <= scopes
@@ -0,0 +1,66 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : test_task_executor.py
+# 설명        : Ai/TaskExecutor.py 동시 실행·순서 유지·태스크별 제한 시간 테스트
+# -----------------------------------------------------------------------------------
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from Ai import TaskExecutor
+from Ai.TaskExecutor import run_tasks
+
+def sleeper(task):
+    """'이름 초' 형식의 태스크: 지정한 시간만큼 기다린 뒤 이름을 반환"""
+    name, seconds = task.split()
+    time.sleep(float(seconds))
+    return name
+
+@pytest.fixture
+def pool(monkeypatch):
+    def use(workers):
+        executor = ThreadPoolExecutor(max_workers=workers)
+        monkeypatch.setattr(TaskExecutor, "_pool", executor)
+        return executor
+    return use
+
+def test_tasks_run_concurrently():
+    start = time.monotonic()
+    assert run_tasks([f"t{i} 0.2" for i in range(4)], sleeper, timeout=5) == ["t0", "t1", "t2", "t3"]
+    assert time.monotonic() - start < 0.6
+
+def test_results_keep_input_order():
+    assert run_tasks(["a 0.3", "b 0.1", "c 0.0", "d 0.2"], sleeper, timeout=5) == ["a", "b", "c", "d"]
+
+def test_timeout_returns_partial_results():
+    start = time.monotonic()
+    results = run_tasks(["slow 2", "fast 0.05"], sleeper, timeout=0.2)
+    assert results == ["'slow 2' 작업이 제한 시간 안에 끝나지 않았습니다.", "fast"]
+    assert time.monotonic() - start < 1
+
+def test_errors_become_messages():
+    def handler(task):
+        if task == "bad":
+            raise RuntimeError("boom")
+        return task
+    assert run_tasks(["ok", "bad"], handler, timeout=1) == ["ok", "'bad' 작업을 처리하지 못했습니다."]
+
+def test_timeout_is_per_task(pool):
+    # 작업자 2개: b는 a가 끝난 뒤(0.15초) 시작하므로 공용 마감(0.25초)이었다면 시간 초과
+    pool(2)
+    start = time.monotonic()
+    results = run_tasks(["slow 1", "a 0.15", "b 0.15"], sleeper, timeout=0.25)
+    assert results[1:] == ["a", "b"] and results[0].endswith("끝나지 않았습니다.")
+    assert time.monotonic() - start < 0.6
+
+def test_timed_out_queued_task_is_cancelled(pool):
+    executor = pool(1)
+    ran = []
+    def handler(task):
+        ran.append(task)
+        return sleeper(task)
+    results = run_tasks(["slow 0.4", "queued 0"], handler, timeout=0.1)
+    assert all(r.endswith("끝나지 않았습니다.") for r in results)
+    executor.shutdown(wait=True)
+    assert ran == ["slow 0.4"]
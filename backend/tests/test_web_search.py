@@ -0,0 +1,96 @@
+# -----------------------------------------------------------------------------------
+# 파일 이름   : test_web_search.py
+# 설명        : Ai/WebSearch.py 검색 캐시·중복 요청 제거·토큰 예산 테스트 (FixtureSearchProvider 사용)
+#               + IntegratedAI의 여러 realtime 태스크 검색이 동시에 실행되는지
+# -----------------------------------------------------------------------------------
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from Ai import Model, WebSearch
+from Ai.Clients import set_client
+from Ai.WebSearch import FixtureSearchProvider
+
+FIXTURES = {
+    "오늘 뉴스": [{"title": f"뉴스 {i}", "description": "설명 " * 50, "url": f"https://news/{i}"} for i in range(8)],
+    "아이유 노래": [{"title": "좋은 날", "description": "아이유의 노래", "url": "https://youtube/1"}],
+    "환율": [{"title": "환율", "description": "달러 1,300원", "url": "https://fx"}],
+}
+
+class SlowProvider(FixtureSearchProvider):
+    """검색마다 delay초 기다리는 fixture 제공자 (동시에 실행 중인 검색 수의 최댓값 기록)"""
+    def __init__(self, delay):
+        super().__init__(FIXTURES)
+        self.delay, self.running, self.peak = delay, 0, 0
+        self.lock = threading.Lock()
+
+    def search(self, query, num_results=5):
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(self.delay)
+        with self.lock:
+            self.running -= 1
+        return super().search(query, num_results)
+
+@pytest.fixture(autouse=True)
+def restore_provider():
+    original = WebSearch._provider
+    yield
+    WebSearch.set_provider(original)
+
+@pytest.fixture
+def provider():
+    provider = FixtureSearchProvider(FIXTURES)
+    WebSearch.set_provider(provider)
+    return provider
+
+def test_results_are_cached_per_normalized_query(provider):
+    first = WebSearch.search("오늘 뉴스", num_results=3)
+    assert [r.title for r in first] == ["뉴스 0", "뉴스 1", "뉴스 2"]
+    assert WebSearch.search("  오늘   뉴스!! ", num_results=3) == first
+    assert provider.calls == 1
+
+def test_num_results_is_part_of_the_key(provider):
+    assert len(WebSearch.search("오늘 뉴스", num_results=2)) == 2
+    assert len(WebSearch.search("오늘 뉴스", num_results=5)) == 5
+    assert len(WebSearch.search("오늘 뉴스", num_results=2)) == 2
+    assert provider.calls == 2
+
+def test_ttl_policy():
+    assert WebSearch.ttl_for("오늘 뉴스") == WebSearch.NEWS_TTL
+    assert WebSearch.ttl_for("아이유 노래") == WebSearch.MUSIC_TTL
+    assert WebSearch.ttl_for("파이썬 문법") == WebSearch.DEFAULT_TTL
+
+def test_concurrent_identical_queries_search_once():
+    provider = SlowProvider(0.2)
+    WebSearch.set_provider(provider)
+    threads = [threading.Thread(target=WebSearch.search, args=("환율",)) for _ in range(5)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    assert provider.calls == 1
+
+def test_format_results_respects_token_budget(provider):
+    results = WebSearch.search("오늘 뉴스", num_results=8)
+    text = WebSearch.format_results("오늘 뉴스", results, token_budget=100)
+    assert len(text) <= 100 * WebSearch.CHARS_PER_TOKEN
+    assert text.startswith("'오늘 뉴스'에 대한 구글 검색 결과:") and text.endswith("[end]")
+
+def test_realtime_tasks_search_concurrently(monkeypatch):
+    from Ai.Logic import IntegratedAI
+
+    provider = SlowProvider(0.3)
+    WebSearch.set_provider(provider)
+    answer = lambda messages: SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content="답변"))])
+    set_client("groq", SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=lambda messages, **k: iter([answer(messages)])))))
+    monkeypatch.setattr(Model, "FirstLayerDMM", lambda query: ["realtime 오늘 날씨", "realtime 환율", "realtime 코스피"])
+    try:
+        start = time.monotonic()
+        assert IntegratedAI("날씨랑 환율이랑 코스피 알려줘") == "답변\n답변\n답변"
+        assert time.monotonic() - start < 0.3 * 2
+        assert provider.calls == 3 and provider.peak == 3
+    finally:
+        set_client("groq", None)
@@ -5,6 +5,7 @@
  * 1) bookmarks 상태: 현재 저장된 북마크 목록
  * 2) addBookmark 액션: 새로운 북마크를 목록에 추가
  * 3) deleteBookmark 액션: 특정 ID의 북마크를 목록에서 제거
+ *    (추가·수정·삭제 시 서버가 돌려준 결과로 목록을 바로 갱신하여 전체 목록을 다시 조회하지 않음)
  * ----------------------------------------------------------------------------------- */
 import { create } from "zustand";
 import { axiosInstance } from "../lib/axios";
@@ -23,7 +24,7 @@ export const useBookmarkStore = create((set, get) => ({
     try {
       console.log(bookmark);
       const { data } = await axiosInstance.post(`/add_bookmark`, bookmark);
-      get().readBookmarks();
+      set({ bookmarks: [...get().bookmarks, data.bookmark] });
       toast.success("즐겨찾기를 추가했습니다.");
     } catch (err) {
       toast.error(err.response?.data?.message || err.message);
@@ -37,7 +38,7 @@ export const useBookmarkStore = create((set, get) => ({
     id // 특정 ID의 북마크 삭제 액션
   ) => {
     const { data } = await axiosInstance.post(`/delete_bookmark`, { bookmark_id: id });
-    get().readBookmarks();
+    set({ bookmarks: get().bookmarks.filter((b) => b.id !== data.bookmark_id) });
     toast.success("즐겨찾기를 삭제했습니다.");
   },
   updateBookmark: async (
@@ -46,7 +47,7 @@ export const useBookmarkStore = create((set, get) => ({
     try {
       console.log(bookmark);
       const { data } = await axiosInstance.post(`/update_bookmark`, bookmark);
-      get().readBookmarks();
+      set({ bookmarks: get().bookmarks.map((b) => (b.id === data.bookmark?.id ? data.bookmark : b)) });
       toast.success("즐겨찾기를 수정했습니다.");
     } catch (err) {
       console.log(err);